@@ -10,6 +10,7 @@
         'web_editor',
         'website_sale',
         'mail',  
+        'bus',
     ],
     'images': ['static/description/icon.png'],
     'author': 'David Amsellem',
@@ -25,16 +26,30 @@
      
         # Vistas
         'views/university_views.xml',  #comentado
+        'views/term_views.xml',
         'views/department_views.xml', #comentado
         'views/professor_views.xml', #comentado
         'views/subject_views.xml', #comentado
         'views/student_views.xml', #comentado
         'views/enrollment_views.xml',  #comentado
         'views/grade_views.xml', #comentado
+        'views/grade_history_views.xml',
+        'views/recompute_job_views.xml',
+        'views/consistency_check_views.xml',
+        'views/rollover_views.xml',
+        'views/degree_program_views.xml',
+        'views/degree_audit_views.xml',
+        'views/grade_ranking_views.xml',
+        'views/risk_views.xml',
+        'views/grade_policy_views.xml',
+        'views/attendance_views.xml',
         
         # Datos
         'data/mail_template_student_report.xml',
         'data/mail_template_professor.xml',
+        'data/ir_cron_data.xml',
+        'data/risk_rule_data.xml',
+        'data/grade_policy_data.xml',
         
         # Website Templates
         'views/templates/website/layout/website_menu.xml', 
@@ -48,6 +63,7 @@
         # Wizard
         'wizard/mail_compose_message_view.xml', #comentado
         'wizard/professor_welcome_wizard_view.xml',
+        'wizard/cohort_enrollment_wizard_view.xml',
        
         
         # Reportes
@@ -63,11 +79,16 @@
             'Universidad/static/scss/subject_styles.scss',
             'Universidad/static/scss/student_styles.scss',
             'Universidad/static/scss/department_styles.scss',
+            'Universidad/static/src/views/relation_pane/*',
+            'Universidad/static/src/views/grade_grid/*',
         ],
         'web.assets_frontend': [
             # SCSS
             'Universidad/static/src/scss/homepage.scss',
             'Universidad/static/src/scss/universities.scss',
+            # JS
+            'Universidad/static/src/js/portal_grades.js',
+            'Universidad/static/src/js/website_autocomplete.js',
         ],
     },
     'installable': True,
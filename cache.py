@@ -0,0 +1,254 @@
+"""
+Process caches of the University module, invalidated across workers.
+
+A cache is declared once, at import time, with the models it is computed
+from::
+
+    homepage_stats = cache.register('homepage_stats', ['university.student', ...])
+    stats = homepage_stats.get(env, key, compute)
+
+Entries are kept per database, at most ``max_size`` per cache, the least
+recently used ones being evicted first.
+
+Every table a registered cache is computed from has a statement trigger
+sending its name on the ``universidad_cache`` channel (see
+``university.cache.channel``); the other tables, like the grades, do not
+notify, since NOTIFY serializes the commits of the transactions sending it. NOTIFY is
+delivered at commit, so each worker listening on the channel drops the entries
+computed from a table as soon as a transaction writing it commits, whether
+the write went through the ORM or through SQL. A cache is not used until the
+worker listens on its database, and is cleared when the listening connection
+is lost.
+
+A request reads the database through a snapshot taken when its transaction
+started, possibly before a commit whose notification is received later. The
+listener stamps every invalidation with the database clock, and a value is
+only stored if no invalidation of its cache was received since the
+transaction computing it started.
+
+Entries computed on a read-only replica may be behind the primary: they
+expire after ``universidad_replica_max_lag`` seconds (default 5).
+"""
+
+import logging
+import os
+import select
+import threading
+import time
+from collections import OrderedDict
+
+from odoo.sql_db import db_connect
+from odoo.tools import config
+
+_logger = logging.getLogger(__name__)
+
+CHANNEL = 'universidad_cache'
+
+# Seconds between two checks of the listening connection
+LISTEN_TIMEOUT = 50
+
+_caches = {}            # name -> NamedCache
+_listeners = {}         # dbname -> threading.Event, set while listening
+_listeners_lock = threading.Lock()
+
+
+class NamedCache:
+    """
+    Bounded LRU cache of values computed from some tables.
+
+    Attributes:
+        name (str): Cache name
+        tables (frozenset): Tables whose changes invalidate the cache
+        max_size (int): Maximum number of entries per database
+    """
+
+    def __init__(self, name, tables, max_size):
+        self.name = name
+        self.tables = frozenset(tables)
+        self.max_size = max_size
+        self._entries = {}  # dbname -> OrderedDict(key -> (expires, value))
+        self._generations = {}  # dbname -> number of invalidations
+        self._invalidated_at = {}  # dbname -> database time of the last invalidation received
+        self._lock = threading.Lock()
+
+    def get(self, env, key, compute):
+        """
+        Get a cached value, computing and storing it when missing.
+
+        Args:
+            env (Environment): Environment of the request
+            key (hashable): Entry key within the database
+            compute (callable): Called without arguments to compute the value
+
+        Returns:
+            Value of the entry
+        """
+        dbname = env.cr.dbname
+        # Test transactions are rolled back: nothing would invalidate their values
+        if env.registry.in_test_mode() or not _ensure_listener(dbname):
+            return compute()
+        now = time.monotonic()
+        with self._lock:
+            generation = self._generations.get(dbname, 0)
+            entries = self._entries.get(dbname)
+            entry = entries.get(key) if entries else None
+            if entry and (entry[0] is None or entry[0] > now):
+                entries.move_to_end(key)
+                return entry[1]
+        # Una invalidación recibida después del inicio de la transacción puede ser
+        # de un commit que su snapshot no ve
+        env.cr.execute("SELECT transaction_timestamp()")
+        started = env.cr.fetchone()[0]
+        value = compute()
+        expires = None
+        if getattr(env.cr, 'readonly', False) and (config.get('db_replica_host') or config.get('db_replica_port')):
+            expires = now + float(config.get('universidad_replica_max_lag') or 5.0)
+        with self._lock:
+            # Invalidated while computing, or since the snapshot: the value may be outdated already
+            invalidated_at = self._invalidated_at.get(dbname)
+            if self._generations.get(dbname, 0) != generation or (invalidated_at and invalidated_at >= started):
+                return value
+            entries = self._entries.setdefault(dbname, OrderedDict())
+            entries[key] = (expires, value)
+            entries.move_to_end(key)
+            while len(entries) > self.max_size:
+                entries.popitem(last=False)
+        return value
+
+    def clear(self, dbname=None, at=None):
+        """
+        Drop the entries of a database, or of all of them.
+
+        Args:
+            dbname (str): Database name, None for all of them
+            at (datetime): Database time the invalidation was received
+        """
+        with self._lock:
+            for name in (list(self._entries) if dbname is None else [dbname]):
+                self._entries.pop(name, None)
+                self._generations[name] = self._generations.get(name, 0) + 1
+                if at is not None:
+                    self._invalidated_at[name] = max(at, self._invalidated_at.get(name, at))
+
+
+def register(name, models, max_size=128):
+    """
+    Declare a cache.
+
+    Args:
+        name (str): Unique cache name
+        models (list): Names of the models the values are computed from
+        max_size (int): Maximum number of entries per database
+
+    Returns:
+        NamedCache: The cache
+    """
+    assert name not in _caches, "Cache %s registered twice" % name
+    _caches[name] = NamedCache(name, [model.replace('.', '_') for model in models], max_size)
+    return _caches[name]
+
+
+def tables():
+    """
+    Get the tables the registered caches are computed from.
+
+    Returns:
+        set: Table names
+    """
+    return set().union(*(named_cache.tables for named_cache in _caches.values()))
+
+
+def invalidate(dbname, tables=None, at=None):
+    """
+    Drop the entries of a database computed from some tables.
+
+    Args:
+        dbname (str): Database name
+        tables (iterable): Changed tables, None for every cache
+        at (datetime): Database time the invalidation was received
+    """
+    tables = set(tables) if tables is not None else None
+    for named_cache in list(_caches.values()):
+        if tables is None or named_cache.tables & tables:
+            named_cache.clear(dbname, at)
+
+
+def _reset():
+    """Forget the entries and listeners inherited from the parent process."""
+    global _listeners_lock
+    _listeners.clear()
+    _listeners_lock = threading.Lock()
+    for named_cache in _caches.values():
+        named_cache._entries.clear()
+        named_cache._generations.clear()
+        named_cache._invalidated_at.clear()
+        named_cache._lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset)
+
+
+def _ensure_listener(dbname):
+    """
+    Start listening on a database if needed.
+
+    Returns:
+        bool: True if the worker listens on the database, so the caches may be used
+    """
+    listening = _listeners.get(dbname)
+    if listening is None:
+        with _listeners_lock:
+            listening = _listeners.get(dbname)
+            if listening is None:
+                listening = _listeners[dbname] = threading.Event()
+                threading.Thread(target=_listen, args=(dbname, listening), daemon=True,
+                                 name='universidad.cache.%s' % dbname).start()
+    return listening.is_set()
+
+
+def _listen(dbname, listening):
+    """
+    Listen on the invalidation channel of a database, reconnecting on errors.
+    """
+    delay = 1
+    while True:
+        try:
+            with db_connect(dbname).cursor() as cr:
+                connection = cr._cnx
+                cr.execute('LISTEN "%s"' % CHANNEL)
+                cr.commit()
+                # Changes committed while not listening were missed
+                invalidate(dbname, at=_database_now(cr))
+                listening.set()
+                delay = 1
+                while True:
+                    if select.select([connection], [], [], LISTEN_TIMEOUT) == ([], [], []):
+                        cr.execute('SELECT 1')
+                        cr.commit()
+                        continue
+                    connection.poll()
+                    tables = set()
+                    while connection.notifies:
+                        tables.add(connection.notifies.pop().payload)
+                    if tables:
+                        invalidate(dbname, tables, _database_now(cr))
+        except Exception:
+            listening.clear()
+            invalidate(dbname)
+            _logger.warning("Cache invalidation channel of %s lost, retrying in %ss", dbname, delay, exc_info=True)
+            time.sleep(delay)
+            delay = min(delay * 2, 60)
+
+
+def _database_now(cr):
+    """
+    Read the database clock, outside of any transaction afterwards so the
+    notifications keep being delivered.
+
+    Returns:
+        datetime: Current database time
+    """
+    cr.execute("SELECT clock_timestamp()")
+    now = cr.fetchone()[0]
+    cr.commit()
+    return now
@@ -1,3 +1,5 @@
 from . import website
 from . import portal
+from . import export
+from . import monitoring
 
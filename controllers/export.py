@@ -0,0 +1,244 @@
+"""
+Streaming export of the grade analytics.
+
+The standard list export reads every record before writing the file. This
+controller streams the rows of a named (server-side) PostgreSQL cursor in
+chunks, so the worker memory stays flat whatever the number of grades.
+"""
+
+import csv
+import io
+import tempfile
+from contextlib import closing
+from decimal import Decimal
+
+from odoo import http, _
+from odoo.exceptions import AccessError
+from odoo.http import request, content_disposition, Response
+
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
+# Rows fetched from the server-side cursor at a time
+CHUNK_SIZE = 2000
+
+# Rows of an XLSX worksheet, header included; xlsxwriter drops the rows beyond
+XLSX_MAX_ROWS = 1048576
+
+# Group-by dimensions, same as the pivot of report.university.grade:
+# key -> (id column, name column, header)
+DIMENSIONS = {
+    'university': ('e.university_id', 'u.name', 'University'),
+    'professor': ('e.professor_id', 'p.name', 'Professor'),
+    'department': ('p.department_id', 'd.name', 'Department'),
+    'student': ('g.student_id', 's.name', 'Student'),
+    'subject': ('e.subject_id', 'sub.name', 'Subject'),
+    'term': ('g.term_id', 't.name', 'Term'),
+}
+
+FROM_CLAUSE = """
+    FROM university_grade g
+    JOIN university_enrollment e ON g.enrollment_id = e.id
+    LEFT JOIN university_professor p ON e.professor_id = p.id
+    LEFT JOIN university_department d ON p.department_id = d.id
+    LEFT JOIN university_university u ON e.university_id = u.id
+    LEFT JOIN university_student s ON g.student_id = s.id
+    LEFT JOIN university_subject sub ON e.subject_id = sub.id
+    LEFT JOIN university_term t ON g.term_id = t.id
+"""
+
+
+class UniversityGradeExport(http.Controller):
+    """Controller for the streamed grade exports"""
+
+    @http.route('/university/grades/export', type='http', auth='user')
+    def export_grades(self, fmt='csv', groupby='', university_id=None, term_id=None, **kw):
+        """Stream the grades, raw or grouped, as CSV or XLSX.
+
+        Args:
+            fmt (str): Output format, 'csv' or 'xlsx'.
+            groupby (str): Comma separated dimensions (university, professor,
+                department, student, subject, term). Empty to export one row per grade.
+            university_id (str): Optional university to restrict the export to.
+            term_id (str): Optional term to restrict the export to.
+
+        Returns:
+            Response: Streamed file.
+
+        Raises:
+            AccessError: If the user is not a university administrator.
+        """
+        user = request.env.user
+        if not (user.has_group('base.group_system') or user.has_group('Universidad.group_university_manager')):
+            raise AccessError(_("Only university administrators can export the grades."))
+        if fmt not in ('csv', 'xlsx'):
+            return request.not_found()
+        if fmt == 'xlsx' and not xlsxwriter:
+            return request.not_found()
+
+        dimensions = [key.strip() for key in groupby.split(',') if key.strip()]
+        if any(key not in DIMENSIONS for key in dimensions):
+            return request.not_found()
+        try:
+            university_id = int(university_id) if university_id else 0
+        except ValueError:
+            university_id = 0
+        try:
+            term_id = int(term_id) if term_id else 0
+        except ValueError:
+            term_id = 0
+
+        query, params, headers = self._build_query(dimensions, university_id, term_id)
+        rows = self._stream_rows(request.env.registry, query, params)
+        filename = 'grades.%s' % fmt
+        if fmt == 'csv':
+            body = self._write_csv(headers, rows)
+            mimetype = 'text/csv;charset=utf-8'
+        else:
+            body = self._write_xlsx(headers, rows)
+            mimetype = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+        return Response(body, headers=[
+            ('Content-Type', mimetype),
+            ('Content-Disposition', content_disposition(filename)),
+            ('Cache-Control', 'no-store'),
+        ], direct_passthrough=True)
+
+    def _build_query(self, dimensions, university_id, term_id=0):
+        """Build the export query from whitelisted dimensions.
+
+        Args:
+            dimensions (list): Group-by dimension keys, empty for raw grades.
+            university_id (int): University to filter on, 0 for all.
+            term_id (int): Term to filter on, 0 for all.
+
+        Returns:
+            tuple: (query, params, column headers)
+        """
+        conditions, params = [], []
+        if university_id:
+            conditions.append("e.university_id = %s")
+            params.append(university_id)
+        if term_id:
+            conditions.append("g.term_id = %s")
+            params.append(term_id)
+        where = "WHERE " + " AND ".join(conditions) if conditions else ""
+
+        if not dimensions:
+            query = f"""
+                SELECT g.id, g.date, t.name, u.name, d.name, p.name, s.name, sub.name, g.grade,
+                       g.adjusted_grade
+                {FROM_CLAUSE}
+                {where}
+                ORDER BY g.id
+            """
+            headers = ['ID', 'Date', 'Term', 'University', 'Department', 'Professor',
+                       'Student', 'Subject', 'Grade', 'Adjusted Grade']
+            return query, params, headers
+
+        id_columns = [DIMENSIONS[key][0] for key in dimensions]
+        name_columns = [f"MIN({DIMENSIONS[key][1]})" for key in dimensions]
+        query = f"""
+            SELECT {', '.join(name_columns)},
+                   COUNT(g.id),
+                   SUM(g.grade),
+                   ROUND(AVG(g.grade)::numeric, 2),
+                   ROUND(AVG(g.adjusted_grade)::numeric, 2)
+            {FROM_CLAUSE}
+            {where}
+            GROUP BY {', '.join(id_columns)}
+            ORDER BY {', '.join(id_columns)}
+        """
+        headers = [DIMENSIONS[key][2] for key in dimensions] + [
+            'Number of Grades', 'Total Grade', 'Average Grade', 'Adjusted Grade']
+        return query, params, headers
+
+    def _stream_rows(self, registry, query, params):
+        """Yield chunks of rows from a named server-side cursor.
+
+        The request cursor is closed once the route returns, so the rows are
+        read from a dedicated cursor opened when the response is consumed.
+
+        Args:
+            registry (Registry): Registry of the database.
+            query (str): SQL query.
+            params (list): Query parameters.
+
+        Yields:
+            list: Chunks of at most CHUNK_SIZE rows.
+        """
+        with closing(registry.cursor(readonly=True)) as cr:
+            with cr._cnx.cursor(name='university_grade_export') as server_cursor:
+                server_cursor.itersize = CHUNK_SIZE
+                server_cursor.execute(query, params)
+                while True:
+                    chunk = server_cursor.fetchmany(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    yield chunk
+
+    def _write_csv(self, headers, rows):
+        """Encode the rows as CSV, one response chunk per cursor chunk.
+
+        Args:
+            headers (list): Column headers.
+            rows (iterator): Chunks of rows.
+
+        Yields:
+            bytes: CSV data.
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(headers)
+        for chunk in rows:
+            writer.writerows(chunk)
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue().encode('utf-8')
+
+    def _write_xlsx(self, headers, rows):
+        """Write the rows to an XLSX file and stream it.
+
+        An XLSX file is a zip archive that can only be sent once complete, so
+        rows are written in constant memory mode to a temporary file that is
+        then streamed in blocks. A worksheet holds at most XLSX_MAX_ROWS rows:
+        larger exports continue on new worksheets, each with the headers.
+
+        Args:
+            headers (list): Column headers.
+            rows (iterator): Chunks of rows.
+
+        Yields:
+            bytes: XLSX data.
+        """
+        with tempfile.TemporaryFile() as tmp:
+            workbook = xlsxwriter.Workbook(tmp, {'constant_memory': True, 'in_memory': False})
+            date_format = workbook.add_format({'num_format': 'dd/mm/yyyy'})
+            sheet_count = 0
+            row_index = XLSX_MAX_ROWS
+            for chunk in rows:
+                for row in chunk:
+                    if row_index == XLSX_MAX_ROWS:
+                        # Hoja llena: seguir en una nueva
+                        sheet_count += 1
+                        sheet = workbook.add_worksheet('Grades' if sheet_count == 1 else 'Grades %s' % sheet_count)
+                        sheet.write_row(0, 0, headers)
+                        row_index = 1
+                    for col_index, value in enumerate(row):
+                        if hasattr(value, 'strftime'):
+                            sheet.write_datetime(row_index, col_index, value, date_format)
+                        else:
+                            sheet.write(row_index, col_index, float(value) if isinstance(value, Decimal) else value)
+                    row_index += 1
+            if not sheet_count:
+                workbook.add_worksheet('Grades').write_row(0, 0, headers)
+            workbook.close()
+            tmp.seek(0)
+            while True:
+                block = tmp.read(64 * 1024)
+                if not block:
+                    break
+                yield block
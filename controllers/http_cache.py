@@ -0,0 +1,97 @@
+"""
+Conditional GET helpers for the university website and portal controllers.
+
+Each route describes the records it is about to show as a list of
+``(model, domain)`` sources. A validator is computed from the latest
+``write_date`` and the number of records of every source (so deletions are
+detected too), together with the user, the language, the website and the
+query parameters. When the browser or the reverse proxy already holds a page
+with the same validator the route answers ``304 Not Modified`` without
+rendering anything.
+"""
+
+import hashlib
+from collections import namedtuple
+
+from odoo.http import request
+
+# Bump when templates change in a way the data validator cannot see
+CACHE_VERSION = '1'
+
+Validator = namedtuple('Validator', ['etag', 'last_modified'])
+
+
+def compute_validator(sources, extra=None):
+    """Compute the ETag and Last-Modified values for a page.
+
+    Args:
+        sources (list): ``(model_name, domain)`` pairs describing the records
+            rendered by the page.
+        extra (dict): Additional request values the page depends on
+            (search terms, filters...).
+
+    Returns:
+        Validator: Weak ETag and the most recent ``write_date`` found.
+    """
+    parts = [
+        CACHE_VERSION,
+        str(request.env.uid),
+        request.env.lang or '',
+        str(request.website.id) if getattr(request, 'website', None) else '',
+    ]
+    last_modified = None
+    for model_name, domain in sources:
+        [(max_write_date, count)] = request.env[model_name].sudo()._read_group(
+            domain, aggregates=['write_date:max', '__count'],
+        )
+        parts.append(f"{model_name}:{count}:{max_write_date or ''}")
+        if max_write_date and (not last_modified or max_write_date > last_modified):
+            last_modified = max_write_date
+    for key, value in sorted((extra or {}).items()):
+        parts.append(f"{key}={value}")
+    etag = hashlib.sha1('|'.join(parts).encode()).hexdigest()
+    return Validator(etag, last_modified)
+
+
+def not_modified(validator):
+    """Return a ``304 Not Modified`` response when the client copy is fresh.
+
+    Args:
+        validator (Validator): Validator of the page about to be rendered.
+
+    Returns:
+        Response: Empty 304 response, or None if the page must be rendered.
+    """
+    if_none_match = request.httprequest.if_none_match
+    if not if_none_match or not if_none_match.contains_weak(validator.etag):
+        return None
+    response = request.make_response('', status=304)
+    return set_cache_headers(response, validator)
+
+
+def set_cache_headers(response, validator):
+    """Add the validator and the Cache-Control policy to a response.
+
+    Pages seen by the public user may be stored by shared caches, but must
+    always be revalidated. Pages of logged users are private to the browser.
+
+    Args:
+        response (Response): Response returned by the route.
+        validator (Validator): Validator of the rendered page.
+
+    Returns:
+        Response: The same response, for chaining.
+    """
+    response.set_etag(validator.etag, weak=True)
+    if validator.last_modified:
+        response.last_modified = validator.last_modified
+    if request.env.user._is_public():
+        response.cache_control.public = True
+        response.cache_control.max_age = 0
+        response.cache_control.must_revalidate = True
+    else:
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+    response.vary.add('Cookie')
+    response.vary.add('Accept-Language')
+    return response
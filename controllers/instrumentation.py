@@ -0,0 +1,161 @@
+"""
+Per-request instrumentation of the website and portal controllers.
+
+Routes decorated with ``instrumented(route_key)`` measure every request: the
+number of SQL queries, the SQL time, the Python time (the rest of the request)
+and the size of the rendered page. QWeb responses are rendered inside the
+measure, so the queries issued by the templates are counted too.
+
+The behaviour is set in the Odoo configuration file:
+
+* ``universidad_instrumentation_sample_rate``: share of the requests logged
+  with their measures, between 0 and 1 (default 0). The SQL queries of the
+  sampled requests are collected too.
+* ``universidad_instrumentation_slow_ms``: requests slower than this are
+  logged as warnings (default 2000), with their slowest queries when sampled.
+* ``universidad_instrumentation_top_queries``: number of queries listed for a
+  slow request (default 5).
+
+Administrators can add ``profile=1`` to the URL of an instrumented route to
+profile that request: the full profile (SQL and Python stacks) is stored as an
+``ir.profile`` record, linked from the ``X-Universidad-Profile`` header. Every
+response to an administrator carries a ``Server-Timing`` header with the
+measures, shown by the browser developer tools.
+
+The measures of every request are also accumulated per route, see
+``get_route_stats``, and the durations are exported to the operational
+metrics (``Universidad.metrics``).
+"""
+
+import functools
+import logging
+import random
+import threading
+import time
+
+from odoo.http import request, Response
+from odoo.tools import config
+from odoo.tools.profiler import Profiler
+
+from .. import metrics
+
+_logger = logging.getLogger(__name__)
+
+_stats = {}  # route_key -> accumulated measures
+_stats_lock = threading.Lock()
+
+
+def instrumented(route_key):
+    """Measure the requests of a route.
+
+    Apply it below ``http.route`` so that the route dispatches to the
+    measured handler.
+
+    Args:
+        route_key (str): Name of the route in the logs and statistics.
+
+    Returns:
+        callable: Decorator of the controller method.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(controller, *args, **kwargs):
+            profile = kwargs.pop('profile', None) == '1' and request.env.user._is_system()
+            sampled = profile or random.random() < float(config.get('universidad_instrumentation_sample_rate') or 0.0)
+            thread = threading.current_thread()
+            queries_before = getattr(thread, 'query_count', 0)
+            sql_time_before = getattr(thread, 'query_time', 0.0)
+            start = time.perf_counter()
+            profiler = None
+            if sampled:
+                collectors = ['sql', 'traces_async'] if profile else ['sql']
+                with Profiler(collectors=collectors, db=request.db if profile else None,
+                              description='%s %s' % (route_key, request.httprequest.full_path)) as profiler:
+                    response = _render(func(controller, *args, **kwargs))
+            else:
+                response = _render(func(controller, *args, **kwargs))
+            measures = {
+                'queries': getattr(thread, 'query_count', 0) - queries_before,
+                'sql_time': getattr(thread, 'query_time', 0.0) - sql_time_before,
+                'total_time': time.perf_counter() - start,
+                'size': _response_size(response),
+            }
+            measures['python_time'] = max(0.0, measures['total_time'] - measures['sql_time'])
+            _record(route_key, measures)
+            metrics.observe('universidad_route_duration_seconds', measures['total_time'], route=route_key)
+            _log(route_key, measures, profiler, sampled)
+            if isinstance(response, Response) and request.env.user._is_system():
+                response.headers['Server-Timing'] = (
+                    'sql;dur=%.1f;desc="%d queries", python;dur=%.1f'
+                    % (measures['sql_time'] * 1000, measures['queries'], measures['python_time'] * 1000))
+                if profile and getattr(profiler, 'profile_id', None):
+                    response.headers['X-Universidad-Profile'] = '/web/speedscope/%s' % profiler.profile_id
+            return response
+        return wrapper
+    return decorator
+
+
+def _render(response):
+    """Render a lazy QWeb response now, so it is part of the measure.
+
+    Args:
+        response: Value returned by the controller method.
+
+    Returns:
+        The same response, rendered.
+    """
+    if isinstance(response, Response) and response.is_qweb:
+        response.flatten()
+    return response
+
+
+def _response_size(response):
+    """Size of the response body in bytes, 0 when streamed or unknown."""
+    if not isinstance(response, Response) or response.direct_passthrough:
+        return 0
+    return response.calculate_content_length() or 0
+
+
+def _record(route_key, measures):
+    """Add the measures of a request to the statistics of its route."""
+    with _stats_lock:
+        stats = _stats.setdefault(route_key, {
+            'requests': 0, 'queries': 0, 'sql_time': 0.0, 'python_time': 0.0,
+            'total_time': 0.0, 'size': 0, 'max_queries': 0, 'max_time': 0.0,
+        })
+        stats['requests'] += 1
+        for key in ('queries', 'sql_time', 'python_time', 'total_time', 'size'):
+            stats[key] += measures[key]
+        stats['max_queries'] = max(stats['max_queries'], measures['queries'])
+        stats['max_time'] = max(stats['max_time'], measures['total_time'])
+
+
+def _log(route_key, measures, profiler, sampled):
+    """Log sampled and slow requests, with the slowest queries if collected."""
+    slow = measures['total_time'] * 1000 >= float(config.get('universidad_instrumentation_slow_ms') or 2000)
+    if not (sampled or slow):
+        return
+    message = "%s %s: %d queries, sql %.1fms, python %.1fms, %d bytes" % (
+        route_key, request.httprequest.full_path, measures['queries'],
+        measures['sql_time'] * 1000, measures['python_time'] * 1000, measures['size'])
+    if not slow:
+        _logger.info(message)
+        return
+    if profiler:
+        top = int(config.get('universidad_instrumentation_top_queries') or 5)
+        entries = sorted(profiler.collectors[0].entries, key=lambda entry: entry['time'], reverse=True)
+        message += ''.join(
+            "\n  %.1fms %s" % (entry['time'] * 1000, entry['query'])
+            for entry in entries[:top]
+        )
+    _logger.warning("Slow request %s", message)
+
+
+def get_route_stats():
+    """Get the measures accumulated per route since the server started.
+
+    Returns:
+        dict: Copy of the statistics, by route key.
+    """
+    with _stats_lock:
+        return {route_key: dict(stats) for route_key, stats in _stats.items()}
@@ -0,0 +1,53 @@
+"""
+Prometheus scrape endpoint of the University module metrics.
+
+The counters and histograms are recorded by every worker (see
+``Universidad.metrics``) and merged here on each scrape. The mail queue
+backlog is read from the database at scrape time.
+
+The endpoint is disabled until ``universidad_metrics_token`` is set in the
+Odoo configuration file; Prometheus sends it as a bearer token::
+
+    scrape_configs:
+      - job_name: universidad
+        metrics_path: /university/metrics
+        authorization:
+          credentials: <token>
+"""
+
+import hmac
+
+from odoo import http
+from odoo.http import request, Response
+from odoo.tools import config
+
+from .. import metrics
+
+
+class UniversityMetrics(http.Controller):
+    """Controller for the metrics scrape"""
+
+    @http.route('/university/metrics', type='http', auth='public', methods=['GET'],
+                save_session=False, readonly=True)
+    def scrape(self, **kw):
+        """Render the merged metrics in the Prometheus text format.
+
+        Returns:
+            Response: Exposition text, or 404 without a valid token.
+        """
+        token = config.get('universidad_metrics_token')
+        given = request.httprequest.headers.get('Authorization', '')
+        if not token or not hmac.compare_digest(given.encode(), ('Bearer %s' % token).encode()):
+            return request.not_found()
+
+        # Correos del módulo pendientes de envío
+        request.env.cr.execute("""
+            SELECT COUNT(*)
+              FROM mail_mail m
+              JOIN mail_message msg ON msg.id = m.mail_message_id
+             WHERE m.state = 'outgoing' AND msg.model LIKE 'university.%%'
+        """)
+        gauges = [('universidad_mail_queue_backlog', "Outgoing mails of the module records",
+                   request.env.cr.fetchone()[0])]
+        return Response(metrics.render(metrics.collect(), gauges),
+                        content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -1,6 +1,7 @@
 from odoo import http
 from odoo.http import request
 from odoo.exceptions import AccessError
+from .. import http_cache, instrumentation, replica
 
 class UniversityPortalGrades(http.Controller):
     """Controller for grades portal.
@@ -10,7 +11,9 @@ class UniversityPortalGrades(http.Controller):
     and administrators.
     """
 
-    @http.route('/my/grades', type='http', auth='user', website=True)
+    @http.route('/my/grades', type='http', auth='user', website=True,
+                readonly=replica.replica_route('grades'))
+    @instrumentation.instrumented('grades')
     def show_portal_grades(self, **kw: any) -> str:
         """Display grades in user portal.
         
@@ -18,6 +21,8 @@ class UniversityPortalGrades(http.Controller):
             **kw: Keyword arguments containing filtering options.
                 university_id (int): ID of the university to filter grades.
                 grade_filter (str): Type of grade filter ('all', 'passed', 'failed').
+                term_id (int): ID of the term to show, 0 for all terms.
+                    Defaults to the current term.
         
         Returns:
             str: Rendered template with grades information.
@@ -41,32 +46,70 @@ class UniversityPortalGrades(http.Controller):
         except (ValueError, TypeError):
             university_id = 0
             
+        # Por defecto solo el periodo actual, servido por los índices parciales
+        try:
+            term_id = int(kw['term_id']) if 'term_id' in kw else request.env['university.term']._get_current_id()
+        except (ValueError, TypeError):
+            term_id = 0
+
         grade_filter = kw.get('grade_filter', 'all')
-        domain = self._build_grades_domain(university_id, grade_filter)
+        domain = self._build_grades_domain(university_id, grade_filter, term_id)
+
+        # Respuesta 304 si el navegador ya tiene la página actualizada
+        shown_domain = domain if is_admin else domain + [('student_id', '=', student.id)]
+        sources = [
+            ('university.grade', shown_domain),
+            ('university.enrollment', [('grade_ids', 'any', shown_domain)]),
+            ('university.subject', []),
+            ('university.professor', []),
+            ('university.university', []),
+            ('university.term', []),
+        ]
+        if not is_admin:
+            sources.append(('university.grade.ranking', [('student_id', '=', student.id)]))
+        validator = http_cache.compute_validator(sources, extra={
+            'university_id': university_id,
+            'grade_filter': grade_filter,
+            'term_id': term_id,
+        })
+        cached = http_cache.not_modified(validator)
+        if cached:
+            return cached
         
         grades, universities = self._get_filtered_grades(user, is_admin, domain)
+        # Posiciones del estudiante (tabla de rankings precalculada)
+        rankings = request.env['university.grade.ranking'].sudo().browse()
+        if not is_admin:
+            rankings = rankings._get_student_rankings(student)
         
-        return request.render('Universidad.portal_grades', {
+        response = request.render('Universidad.portal_grades', {
             'grades': grades,
             'is_admin': is_admin,
             'universities': universities,
             'current_university': university_id,
-            'current_filter': grade_filter
+            'current_filter': grade_filter,
+            'terms': request.env['university.term'].sudo().search([]),
+            'current_term': term_id,
+            'rankings': rankings,
         })
+        return http_cache.set_cache_headers(response, validator)
 
-    def _build_grades_domain(self, university_id: int, grade_filter: str) -> list:
+    def _build_grades_domain(self, university_id: int, grade_filter: str, term_id: int = 0) -> list:
         """Build search domain for grades filtering.
         
         Args:
             university_id (int): ID of the university to filter.
             grade_filter (str): Type of grade filter ('all', 'passed', 'failed').
+            term_id (int): ID of the term to filter, 0 for all terms.
             
         Returns:
             list: Domain list for grade search.
         """
         domain = []
+        if term_id:
+            domain.append(('term_id', '=', term_id))
         if university_id:
-            domain.append(('enrollment_id.university_id', '=', university_id))
+            domain.append(('university_id', '=', university_id))
         
         if grade_filter == 'passed':
             domain.append(('grade', '>=', 5.0))
@@ -0,0 +1,116 @@
+"""
+Read-replica routing for the read-only public controllers.
+
+Odoo opens the cursor of a route declared with ``readonly`` on the read-only
+replica configured with ``db_replica_host`` / ``db_replica_port``, and retries
+the request on the primary if the handler tries to write. This module decides,
+per route, whether that replica may be used:
+
+* the route key must be listed in ``universidad_replica_routes``
+  (comma separated, e.g. ``universities,professors,students,homepage,grades``);
+* the replica must be less than ``universidad_replica_max_lag`` seconds behind
+  the primary (default 5). The lag is measured at most once every
+  ``universidad_replica_lag_interval`` seconds (default 10) per database.
+
+When no replica is configured, the route is not listed, the replica is too far
+behind or cannot be reached, the request runs on the primary as before.
+"""
+
+import logging
+import threading
+import time
+from contextlib import closing
+
+from odoo.http import request
+from odoo.sql_db import db_connect
+from odoo.tools import config
+
+_logger = logging.getLogger(__name__)
+
+_lag_cache = {}  # dbname -> (checked_at, lag in seconds or None)
+_lag_lock = threading.Lock()
+
+
+def replica_route(route_key):
+    """Build the ``readonly`` argument of an ``http.route`` decorator.
+
+    Args:
+        route_key (str): Name of the route in ``universidad_replica_routes``.
+
+    Returns:
+        callable: Predicate evaluated by Odoo before opening the cursor.
+    """
+    def readonly(controller):
+        return use_replica(route_key)
+    return readonly
+
+
+def use_replica(route_key):
+    """Tell whether the current request may run on the replica.
+
+    Args:
+        route_key (str): Name of the route in ``universidad_replica_routes``.
+
+    Returns:
+        bool: True if the route is enabled and the replica is fresh enough.
+    """
+    if not (config.get('db_replica_host') or config.get('db_replica_port')):
+        return False
+    routes = {
+        key.strip()
+        for key in (config.get('universidad_replica_routes') or '').split(',')
+    }
+    if route_key not in routes:
+        return False
+    max_lag = float(config.get('universidad_replica_max_lag') or 5.0)
+    lag = replica_lag(request.db)
+    return lag is not None and lag <= max_lag
+
+
+def replica_lag(dbname):
+    """Return the replication lag of the replica, in seconds.
+
+    The value is cached per database so that most requests do not pay for
+    the extra connection.
+
+    Args:
+        dbname (str): Database name.
+
+    Returns:
+        float: Lag in seconds, or None if the replica could not be queried
+            or is not streaming from the primary.
+    """
+    interval = float(config.get('universidad_replica_lag_interval') or 10.0)
+    now = time.monotonic()
+    cached = _lag_cache.get(dbname)
+    if cached and now - cached[0] < interval:
+        return cached[1]
+
+    with _lag_lock:
+        cached = _lag_cache.get(dbname)
+        if cached and now - cached[0] < interval:
+            return cached[1]
+        try:
+            with closing(db_connect(dbname, readonly=True).cursor()) as cr:
+                # Without a streaming WAL receiver nothing new arrives: the
+                # replica looks caught up however stale it is, so it is not
+                # used. With one, a replica that replayed everything it
+                # received is up to date even if the primary has been idle.
+                cr.execute("""
+                    SELECT CASE
+                        WHEN NOT pg_is_in_recovery() THEN 0
+                        WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN NULL
+                        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+                    END
+                """)
+                lag = cr.fetchone()[0]
+                if lag is None:
+                    _logger.warning("Replica of %s is not streaming from the primary, using the primary", dbname)
+                else:
+                    lag = float(lag)
+        except Exception:
+            _logger.warning("Could not measure replica lag for %s, using the primary", dbname, exc_info=True)
+            lag = None
+        _lag_cache[dbname] = (now, lag)
+        return lag
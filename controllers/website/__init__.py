@@ -1,4 +1,5 @@
 from . import main
 from . import universities
 from . import professors
-from . import students
\ No newline at end of file
+from . import students
+from . import autocomplete
@@ -0,0 +1,82 @@
+from urllib.parse import quote_plus
+
+from odoo import http
+from odoo.http import request
+from .. import instrumentation, replica
+from ... import cache
+
+# Tipo -> (tabla, filtro adicional, página de resultados)
+SOURCES = {
+    'university': ('university_university', '', '/universities?search=%s'),
+    'professor': ('university_professor', '', '/professors?search=%s'),
+    'student': ('university_student', 'AND active', '/students?term_id=0&search=%s'),
+    'subject': ('university_subject', '', '/professors?search=%s'),
+}
+
+DEFAULT_LIMIT = 8
+MAX_LIMIT = 20
+MIN_PREFIX = 2
+
+# Prefijos consultados recientemente, invalidados al cambiar los nombres
+_suggestions = cache.register('website_autocomplete', [
+    'university.university', 'university.professor', 'university.student', 'university.subject',
+], max_size=1024)
+
+
+class UniversityWebsiteAutocomplete(http.Controller):
+    """Controlador de las sugerencias de los buscadores del sitio web"""
+
+    @http.route('/university/autocomplete', type='http', auth='public', website=True, methods=['GET'],
+                sitemap=False, save_session=False, readonly=replica.replica_route('autocomplete'))
+    @instrumentation.instrumented('autocomplete')
+    def autocomplete(self, term='', types='', limit=DEFAULT_LIMIT, **kw):
+        """Suggest the records whose name starts with a prefix.
+
+        Args:
+            term (str): Prefix typed in the search box, case insensitive.
+            types (str): Comma separated record types (university, professor,
+                student, subject). Empty for all of them.
+            limit (int): Maximum number of suggestions, up to MAX_LIMIT.
+
+        Returns:
+            Response: JSON list of {type, id, name, url}, best matches first.
+        """
+        prefix = ' '.join(term.split()).lower()
+        kinds = tuple(sorted(
+            {kind.strip() for kind in types.split(',') if kind.strip() in SOURCES} or SOURCES))
+        try:
+            limit = max(1, min(int(limit), MAX_LIMIT))
+        except (ValueError, TypeError):
+            limit = DEFAULT_LIMIT
+        if len(prefix) < MIN_PREFIX:
+            return request.make_json_response([])
+
+        suggestions = _suggestions.get(
+            request.env, (kinds, prefix, limit), lambda: self._search_prefix(kinds, prefix, limit))
+        return request.make_json_response(suggestions, headers={'Cache-Control': 'public, max-age=60'})
+
+    def _search_prefix(self, kinds, prefix, limit):
+        """Find the names starting with a prefix, in one query.
+
+        Each branch walks the ``lower(name) text_pattern_ops`` index of its
+        table from the prefix and stops after ``limit`` rows.
+        """
+        pattern = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        branches = [
+            f"""(SELECT '{kind}' AS kind, id, name FROM {SOURCES[kind][0]}
+                  WHERE lower(name) LIKE %(pattern)s {SOURCES[kind][1]}
+               ORDER BY lower(name) LIMIT %(limit)s)"""
+            for kind in kinds
+        ]
+        request.env.cr.execute(f"""
+            SELECT kind, id, name
+              FROM ({' UNION ALL '.join(branches)}) matches
+          ORDER BY length(name), lower(name), kind, id
+             LIMIT %(limit)s
+        """, {'pattern': pattern, 'limit': limit})
+        return [{
+            'type': kind,
+            'id': record_id,
+            'name': name,
+            'url': SOURCES[kind][2] % quote_plus(name),
+        } for kind, record_id, name in request.env.cr.fetchall()]
@@ -1,6 +1,24 @@
 from odoo import http
 from odoo.http import request
 from typing import Dict, Any
+from .. import http_cache, instrumentation, replica
+from ... import cache
+
+# Estadísticas de la portada, invalidadas en todos los procesos al cambiar los datos
+_homepage = cache.register('website_homepage', [
+    'university.university', 'university.professor', 'university.student', 'university.department',
+], max_size=4)
+
+# Ids de las listas de los filtros, compartidas por las páginas del sitio web
+_dropdowns = cache.register('website_dropdowns', [
+    'university.university', 'university.department', 'university.term',
+], max_size=8)
+
+
+def dropdown_records(model: str):
+    """Get every record of a model shown in a filter dropdown, from the cache"""
+    Model = request.env[model].sudo()
+    return Model.browse(_dropdowns.get(request.env, model, lambda: tuple(Model.search([]).ids)))
 
 class UniversityWebsiteMain(http.Controller):
     """Controlador para la página principal y funciones comunes"""
@@ -31,23 +49,38 @@ class UniversityWebsiteMain(http.Controller):
             }
         ]
 
-    @http.route('/', type='http', auth='public', website=True)
+    @http.route('/', type='http', auth='public', website=True,
+                readonly=replica.replica_route('homepage'))
+    @instrumentation.instrumented('homepage')
     def homepage(self, **kw: Any) -> str:
-        return request.render('Universidad.website_homepage', {
+        validator = http_cache.compute_validator([
+            ('university.university', []),
+            ('university.professor', []),
+            ('university.student', []),
+            ('university.department', []),
+        ])
+        cached = http_cache.not_modified(validator)
+        if cached:
+            return cached
+
+        response = request.render('Universidad.website_homepage', {
             'stats': self._get_university_stats(),
             'featured_universities': self._get_featured_universities(),
             'external_news': self._get_external_news()
         })
+        return http_cache.set_cache_headers(response, validator)
 
     def _get_university_stats(self) -> Dict[str, int]:
         """Get statistics for homepage"""
-        return {
+        return _homepage.get(request.env, 'stats', lambda: {
             'university_count': request.env['university.university'].sudo().search_count([]),
             'professor_count': request.env['university.professor'].sudo().search_count([]),
             'student_count': request.env['university.student'].sudo().search_count([]),
             'department_count': request.env['university.department'].sudo().search_count([])
-        }
+        })
 
     def _get_featured_universities(self, limit: int = 3):
         """Get featured universities"""
-        return request.env['university.university'].sudo().search([], limit=limit)
\ No newline at end of file
+        University = request.env['university.university'].sudo()
+        return University.browse(_homepage.get(
+            request.env, ('featured', limit), lambda: tuple(University.search([], limit=limit).ids)))
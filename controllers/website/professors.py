@@ -2,6 +2,8 @@ from odoo import http
 from odoo.http import request
 from typing import Dict, Any
 from .universities import UniversityWebsiteUniversities
+from .main import dropdown_records
+from .. import http_cache, instrumentation, replica
 
 class UniversityWebsiteProfessors(http.Controller):
     """Controlador para las páginas de profesores"""
@@ -10,11 +12,12 @@ class UniversityWebsiteProfessors(http.Controller):
         super().__init__()
         self._university_controller = UniversityWebsiteUniversities()
 
-    @http.route('/professors', type='http', auth='public', website=True)
+    @http.route('/professors', type='http', auth='public', website=True,
+                readonly=replica.replica_route('professors'))
+    @instrumentation.instrumented('professors')
     def list_all_professors(self, **kw: Any) -> str:
         """Mostrar todos los profesores con opciones de búsqueda y filtrado"""
-        Professor = request.env['university.professor'].sudo()
-        University = request.env['university.university'].sudo()
+        Professor = request.env['university.professor.card'].sudo()
         
         # Obtener y validar parámetros de búsqueda
         search = kw.get('search', '')
@@ -32,39 +35,59 @@ class UniversityWebsiteProfessors(http.Controller):
             department_id = 0
         
         # Construir dominio de búsqueda
-        domain = []
+        scope_domain = []
+        if university_id:
+            scope_domain.append(('university_id', '=', university_id))
+        if department_id:
+            scope_domain.append(('department_id', '=', department_id))
+
+        domain = list(scope_domain)
         if search:
             domain = [
                 '|', '|',
                 ('name', 'ilike', search),
-                ('department_id.name', 'ilike', search),
-                ('subject_ids.name', 'ilike', search)
-            ]
-        
-        if university_id:
-            domain.append(('university_id', '=', university_id))
-        if department_id:
-            domain.append(('department_id', '=', department_id))
+                ('department_name', 'ilike', search),
+                ('subject_names', 'ilike', search)
+            ] + domain
+
+        # Respuesta 304 si el navegador ya tiene la página actualizada
+        validator = http_cache.compute_validator([
+            ('university.professor', scope_domain),
+            ('university.subject', []),
+            ('university.university', []),
+            ('university.department', []),
+        ], extra={
+            'search': search,
+            'university_id': university_id,
+            'department_id': department_id,
+        })
+        cached = http_cache.not_modified(validator)
+        if cached:
+            return cached
             
-        # Obtener profesores filtrados
+        # Tarjetas de profesores desde la vista SQL (una sola consulta)
         professors = Professor.search(domain)
         
         # Obtener datos para los filtros
-        universities = University.search([])
-        departments = request.env['university.department'].sudo().search([])
+        universities = dropdown_records('university.university')
+        departments = dropdown_records('university.department')
         
-        # Agrupar profesores por universidad
+        # Agrupar profesores por universidad en una sola pasada
+        grouped = {}
+        for professor in professors:
+            grouped.setdefault(professor.university_id.id, []).append(professor.id)
+
         professors_by_university = {}
         for university in universities:
-            uni_professors = professors.filtered(lambda p: p.university_id.id == university.id)
-            if uni_professors:
+            if university.id in grouped:
+                uni_professors = Professor.browse(grouped[university.id])
                 professors_by_university[university.id] = {
                     'university': university,
                     'professors': uni_professors,
                     'theme_colors': self._university_controller._get_theme_color(university.id)
                 }
         
-        return request.render('Universidad.website_all_professors', {
+        response = request.render('Universidad.website_all_professors', {
             'universities': professors_by_university,
             'all_universities': universities,
             'all_departments': departments,
@@ -72,20 +95,46 @@ class UniversityWebsiteProfessors(http.Controller):
             'selected_university': university_id,
             'selected_department': department_id
         })
+        return http_cache.set_cache_headers(response, validator)
 
     @http.route('/professors/<int:university_id>', type='http', auth='public', website=True)
+    @instrumentation.instrumented('university_professors')
     def list_university_professors(self, university_id: int, **kw: Any) -> str:
         """Mostrar profesores de una universidad específica"""
         university = request.env['university.university'].sudo().browse(university_id)
         if not university.exists():
             return request.redirect('/professors')
+
+        validator = http_cache.compute_validator([
+            ('university.university', [('id', '=', university_id)]),
+            ('university.professor', [('university_id', '=', university_id)]),
+            ('university.subject', [('university_id', '=', university_id)]),
+        ])
+        cached = http_cache.not_modified(validator)
+        if cached:
+            return cached
             
-        professors = request.env['university.professor'].sudo().search([
+        professors = request.env['university.professor.card'].sudo().search([
             ('university_id', '=', university_id)
         ])
         
-        return request.render('Universidad.website_professors', {
+        response = request.render('Universidad.website_professors', {
             'university': university,
             'professors': professors,
             'theme_colors': self._university_controller._get_theme_color(university_id)
-        })
\ No newline at end of file
+        })
+        return http_cache.set_cache_headers(response, validator)
+
+    @http.route('/professors/<int:professor_id>/image', type='http', auth='public', website=True,
+                readonly=True)
+    @instrumentation.instrumented('professor_image')
+    def professor_image(self, professor_id: int, **kw: Any):
+        """Servir la foto de un profesor sin cargarla en el listado"""
+        professor = request.env['university.professor'].sudo().browse(professor_id).exists()
+        if not professor:
+            return request.not_found()
+        stream = request.env['ir.binary']._get_image_stream_from(
+            professor, 'image_1920', width=512, height=512,
+            placeholder='Universidad/static/src/img/default_professor.png',
+        )
+        return stream.get_response()
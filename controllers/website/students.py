@@ -1,11 +1,15 @@
 from odoo import http
 from odoo.http import request
 from odoo.osv import expression
+from .main import dropdown_records
+from .. import http_cache, instrumentation, replica
 
 class UniversityWebsiteStudents(http.Controller):
     """Controlador para las páginas de estudiantes"""
 
-    @http.route('/students', type='http', auth='public', website=True)
+    @http.route('/students', type='http', auth='public', website=True,
+                readonly=replica.replica_route('students'))
+    @instrumentation.instrumented('students')
     def list_students(self, **kw):
         """Display list of all students with search and university filter"""
         domain = []
@@ -13,6 +17,16 @@ class UniversityWebsiteStudents(http.Controller):
         # Filtrar por universidad si se selecciona una
         if kw.get('university_id'):
             domain.append(('university_id', '=', int(kw.get('university_id'))))
+        scope_domain = list(domain)
+
+        # Por defecto solo los estudiantes matriculados en el periodo actual
+        try:
+            term_id = int(kw['term_id']) if 'term_id' in kw else request.env['university.term']._get_current_id()
+        except (ValueError, TypeError):
+            term_id = 0
+        if term_id:
+            term_enrollments = request.env['university.enrollment'].sudo()._search([('term_id', '=', term_id)])
+            domain.append(('id', 'in', term_enrollments.subselect('student_id')))
         
         # Filtrar por término de búsqueda
         search_term = kw.get('search', '').strip()
@@ -20,16 +34,50 @@ class UniversityWebsiteStudents(http.Controller):
             domain = expression.AND([domain, [
                 '|', '|',
                 ('name', 'ilike', search_term),
-                ('tutor_id.name', 'ilike', search_term),
-                ('enrollment_ids.subject_id.name', 'ilike', search_term)
+                ('tutor_name', 'ilike', search_term),
+                ('subject_names', 'ilike', search_term)
             ]])
         
-        # Obtener estudiantes y universidades
-        students = request.env['university.student'].sudo().search(domain)
-        universities = request.env['university.university'].sudo().search([])
+        # Respuesta 304 si el navegador ya tiene la página actualizada
+        validator = http_cache.compute_validator([
+            ('university.student', scope_domain),
+            ('university.enrollment', scope_domain),
+            ('university.subject', []),
+            ('university.professor', []),
+            ('university.university', []),
+            ('university.term', []),
+        ], extra={
+            'search': search_term,
+            'university_id': kw.get('university_id', ''),
+            'term_id': term_id,
+        })
+        cached = http_cache.not_modified(validator)
+        if cached:
+            return cached
+
+        # Tarjetas de estudiantes desde la vista SQL (una sola consulta)
+        students = request.env['university.student.card'].sudo().search(domain)
+        universities = dropdown_records('university.university')
         
-        return request.render('Universidad.website_students', {
+        response = request.render('Universidad.website_students', {
             'students': students,
             'universities': universities,
             'search': search_term,
-        })
\ No newline at end of file
+            'terms': dropdown_records('university.term'),
+            'current_term': term_id,
+        })
+        return http_cache.set_cache_headers(response, validator)
+
+    @http.route('/students/<int:student_id>/image', type='http', auth='public', website=True,
+                readonly=True)
+    @instrumentation.instrumented('student_image')
+    def student_image(self, student_id, **kw):
+        """Serve a student card picture without loading it into the listing"""
+        student = request.env['university.student'].sudo().browse(student_id).exists()
+        if not student or not student.active:
+            return request.not_found()
+        stream = request.env['ir.binary']._get_image_stream_from(
+            student, 'image_1920', width=512, height=512,
+            placeholder='Universidad/static/src/img/default_student.png',
+        )
+        return stream.get_response()
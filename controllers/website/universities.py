@@ -1,6 +1,7 @@
 from odoo import http
 from odoo.http import request
 from typing import Dict, Any
+from .. import http_cache, instrumentation, replica
 
 class UniversityWebsiteUniversities(http.Controller):
     """Controlador para las páginas de universidades"""
@@ -29,7 +30,9 @@ class UniversityWebsiteUniversities(http.Controller):
         }
         return THEME_COLORS[university_id % 6]
 
-    @http.route('/universities', type='http', auth='public', website=True)
+    @http.route('/universities', type='http', auth='public', website=True,
+                readonly=replica.replica_route('universities'))
+    @instrumentation.instrumented('universities')
     def list_universities(self, **kw: Any) -> str:
         """
         Muestra la lista de todas las universidades en el sitio web.
@@ -45,9 +48,18 @@ class UniversityWebsiteUniversities(http.Controller):
                 ('city', 'ilike', search_term)
             ]
         
+        # Respuesta 304 si el navegador ya tiene la página actualizada
+        validator = http_cache.compute_validator([
+            ('university.university', domain),
+        ], extra={'search': search_term})
+        cached = http_cache.not_modified(validator)
+        if cached:
+            return cached
+
         universities = request.env['university.university'].sudo().search(domain)
         
-        return request.render('Universidad.website_universities', {
+        response = request.render('Universidad.website_universities', {
             'universities': universities,
             'search': search_term,
-        })
\ No newline at end of file
+        })
+        return http_cache.set_cache_headers(response, validator)
\ No newline at end of file
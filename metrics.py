@@ -0,0 +1,311 @@
+"""
+Operational metrics of the University module.
+
+Counters and histograms are recorded in memory by every thread of every
+worker, without locks: each thread updates its own store. The stores of a
+worker are merged and written to a file of the metrics directory every few
+seconds; the scrape endpoint (``/university/metrics``) merges the files of all
+the workers and renders them in the Prometheus text format.
+
+The files of stopped workers are folded into an archive file, so the
+counters never go back when workers are recycled.
+
+The behaviour is set in the Odoo configuration file:
+
+* ``universidad_metrics_token``: bearer token expected by the scrape endpoint.
+  The endpoint is disabled while it is not set.
+* ``universidad_metrics_dir``: directory of the worker files, shared by the
+  workers of the server (default ``<tmp>/universidad-metrics``).
+* ``universidad_metrics_dump_interval``: seconds between two writes of the
+  file of a worker (default 5).
+"""
+
+import bisect
+import fcntl
+import json
+import os
+import tempfile
+import threading
+import time
+
+from odoo.tools import config
+
+# Upper bounds of the latency buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# name -> (type, help); histograms use LATENCY_BUCKETS
+METRICS = {
+    'universidad_enrollments_created_total': (
+        'counter', "Enrollments created and committed"),
+    'universidad_grade_writes_total': (
+        'counter', "Grades created, or whose value changed, and committed, by operation"),
+    'universidad_report_render_seconds': (
+        'histogram', "Rendering time of the module reports, by report and format"),
+    'universidad_mail_sent_total': (
+        'counter', "Mails of the module records handed to the mail server, by state"),
+    'universidad_route_duration_seconds': (
+        'histogram', "Duration of the website and portal requests, by route"),
+}
+
+ARCHIVE = 'archive.json'
+
+_local = threading.local()
+_stores = {}        # thread ident -> (thread, store) of the current worker
+_retired = {}       # measures of the finished threads of the current worker
+_dump_lock = threading.Lock()
+_next_dump = 0.0
+
+
+def _reset():
+    """Forget the measures inherited from the parent process."""
+    global _local, _next_dump
+    _local = threading.local()
+    _stores.clear()
+    _retired.clear()
+    _next_dump = 0.0
+
+
+os.register_at_fork(after_in_child=_reset)
+
+
+def _store():
+    """Get the measures of the current thread, created on first use."""
+    store = getattr(_local, 'store', None)
+    if store is None:
+        store = _local.store = {}
+        thread = threading.current_thread()
+        _stores[thread.ident] = (thread, store)
+    return store
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def inc(name, amount=1, **labels):
+    """
+    Increment a counter.
+
+    Args:
+        name (str): Metric name, declared in METRICS
+        amount (int): Increment
+        **labels: Label values of the series
+    """
+    store = _store()
+    key = _key(name, labels)
+    store[key] = store.get(key, 0) + amount
+    _maybe_dump()
+
+
+def observe(name, value, **labels):
+    """
+    Record a value in a histogram.
+
+    Args:
+        name (str): Metric name, declared in METRICS
+        value (float): Observed value, in seconds for the latencies
+        **labels: Label values of the series
+    """
+    store = _store()
+    key = _key(name, labels)
+    data = store.get(key)
+    if data is None:
+        # One count per bucket, the +Inf bucket, then the sum
+        data = store[key] = [0] * (len(LATENCY_BUCKETS) + 1) + [0.0]
+    data[bisect.bisect_left(LATENCY_BUCKETS, value)] += 1
+    data[-1] += value
+    _maybe_dump()
+
+
+def inc_on_commit(cr, name, amount=1, **labels):
+    """
+    Increment a counter when the transaction commits.
+
+    The increments of a transaction are accumulated and applied by a single
+    post-commit callback; they are dropped on rollback.
+
+    Args:
+        cr (Cursor): Cursor of the transaction
+        name (str): Metric name, declared in METRICS
+        amount (int): Increment
+        **labels: Label values of the series
+    """
+    if not amount:
+        return
+    pending = cr.postcommit.data.setdefault('universidad.metrics', {})
+    if not pending:
+        cr.postcommit.add(lambda: _apply_pending(pending))
+    key = _key(name, labels)
+    pending[key] = pending.get(key, 0) + amount
+
+
+def _apply_pending(pending):
+    store = _store()
+    for key, amount in pending.items():
+        store[key] = store.get(key, 0) + amount
+    pending.clear()
+    _maybe_dump()
+
+
+def _merge(target, key, value):
+    """Add a counter value or a histogram to the merged measures."""
+    if isinstance(value, list):
+        current = target.setdefault(key, [0] * len(value))
+        for index, item in enumerate(value):
+            current[index] += item
+    else:
+        target[key] = target.get(key, 0) + value
+
+
+def _snapshot():
+    """
+    Merge the measures of the threads of the worker.
+
+    The stores of the finished threads are moved to the retired measures.
+    The stores of the running threads are copied, not locked: a concurrent
+    update is counted in the next snapshot.
+    """
+    merged = {}
+    for ident, (thread, store) in list(_stores.items()):
+        finished = not thread.is_alive()
+        for key, value in store.copy().items():
+            _merge(_retired if finished else merged, key, list(value) if isinstance(value, list) else value)
+        if finished:
+            del _stores[ident]
+    for key, value in _retired.items():
+        _merge(merged, key, value)
+    return merged
+
+
+def _directory():
+    path = config.get('universidad_metrics_dir') or os.path.join(tempfile.gettempdir(), 'universidad-metrics')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _write(path, measures):
+    """Write measures to a file atomically."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    with os.fdopen(fd, 'w') as file:
+        json.dump([[name, labels, value] for (name, labels), value in measures.items()], file)
+    os.replace(tmp_path, path)
+
+
+def _read(path):
+    """Read the measures of a file, {} if it is missing or being replaced."""
+    try:
+        with open(path) as file:
+            return {(name, tuple(map(tuple, labels))): value for name, labels, value in json.load(file)}
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def dump(force=False):
+    """
+    Write the measures of the worker to its file.
+
+    Without force, the file is written at most once per dump interval and
+    never waits for another thread writing it.
+    """
+    global _next_dump
+    if not _dump_lock.acquire(blocking=force):
+        return
+    try:
+        now = time.monotonic()
+        if not force and now < _next_dump:
+            return
+        _next_dump = now + float(config.get('universidad_metrics_dump_interval') or 5.0)
+        _write(os.path.join(_directory(), '%d.json' % os.getpid()), _snapshot())
+    finally:
+        _dump_lock.release()
+
+
+def _maybe_dump():
+    if time.monotonic() >= _next_dump:
+        dump()
+
+
+def _is_running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def collect():
+    """
+    Merge the measures of all the workers.
+
+    The files of the stopped workers are added to the archive and removed.
+
+    Returns:
+        dict: Measures by (name, labels)
+    """
+    dump(force=True)
+    directory = _directory()
+    with open(os.path.join(directory, '.lock'), 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        archive_path = os.path.join(directory, ARCHIVE)
+        archive = _read(archive_path)
+        merged = {}
+        stopped = []
+        for filename in os.listdir(directory):
+            pid = filename[:-len('.json')]
+            if not (filename.endswith('.json') and pid.isdigit()):
+                continue
+            path = os.path.join(directory, filename)
+            target = merged if _is_running(int(pid)) else archive
+            for key, value in _read(path).items():
+                _merge(target, key, value)
+            if target is archive:
+                stopped.append(path)
+        if stopped:
+            _write(archive_path, archive)
+            for path in stopped:
+                os.remove(path)
+    for key, value in archive.items():
+        _merge(merged, key, value)
+    return merged
+
+
+def _format_labels(labels, extra=()):
+    labels = tuple(labels) + tuple(extra)
+    if not labels:
+        return ''
+    return '{%s}' % ','.join(
+        '%s="%s"' % (name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in labels
+    )
+
+
+def render(measures, gauges=None):
+    """
+    Render measures in the Prometheus text format.
+
+    Args:
+        measures (dict): Measures returned by collect()
+        gauges (list): (name, help, value) of the gauges read at scrape time
+
+    Returns:
+        str: Exposition text
+    """
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        lines += ['# HELP %s %s' % (name, help_text), '# TYPE %s %s' % (name, kind)]
+        series = sorted((labels, value) for (metric, labels), value in measures.items() if metric == name)
+        for labels, value in series:
+            if kind != 'histogram':
+                lines.append('%s%s %s' % (name, _format_labels(labels), value))
+                continue
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + ('+Inf',), value[:-1]):
+                cumulative += count
+                lines.append('%s_bucket%s %d' % (name, _format_labels(labels, [('le', bound)]), cumulative))
+            lines.append('%s_sum%s %s' % (name, _format_labels(labels), value[-1]))
+            lines.append('%s_count%s %d' % (name, _format_labels(labels), cumulative))
+    for name, help_text, value in gauges or []:
+        lines += ['# HELP %s %s' % (name, help_text), '# TYPE %s gauge' % name, '%s %s' % (name, value)]
+    return '\n'.join(lines) + '\n'
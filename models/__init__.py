@@ -1,11 +1,30 @@
 from . import university
+from . import term
 from . import department
 from . import professor
 from . import student
 from . import subject
+from . import subject_prerequisite
 from . import enrollment
 from . import grade
 from . import report_grade
+from . import student_card
+from . import professor_card
+from . import grade_history
+from . import recompute_job
+from . import consistency_check
+from . import rollover
+from . import degree_program
+from . import degree_audit
+from . import grade_ranking
+from . import risk_rule
+from . import student_risk
+from . import grade_policy
+from . import ir_actions_report
+from . import mail_mail
+from . import attendance
+from . import refresh_queue
+from . import cache_channel
 
 
 
@@ -0,0 +1,385 @@
+"""
+Module for the class attendance.
+
+This module implements the UniversitySession model, the class sessions of a
+subject in a term, and the UniversityAttendance model, which stores the
+attendance of an enrollment to all the sessions of its subject in one row.
+
+Each session has a position within its subject and term. The row of an
+enrollment keeps two bitmaps (``bit varying`` columns) indexed by that
+position: the sessions where attendance was taken for the enrollment, and the
+sessions where the student was present. A whole session is marked with one
+statement, and the present and session counters of the rows are updated
+with it, so the attendance rates are sums over one row per enrollment.
+"""
+
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+
+class UniversitySession(models.Model):
+    """
+    University Session Model.
+
+    This class represents one class of a subject. Saving its absent students,
+    or marking everybody present, records the attendance of every enrollment
+    of the subject in the term.
+
+    Attributes:
+        subject_id (Many2one): Subject taught
+        term_id (Many2one): Term of the session
+        date (Date): Day of the class
+        position (Integer): Bit of the session in the attendance bitmaps
+        is_marked (Boolean): Attendance has been taken
+        enrolled_count (Integer): Enrollments of the subject in the term (computed)
+        present_count (Integer): Enrollments present (computed)
+        attendance_rate (Float): Percentage of enrollments present (computed)
+        absent_enrollment_ids (Many2many): Enrollments absent (computed, editable)
+    """
+    _name = 'university.session'
+    _description = 'University Class Session'
+    _order = 'date desc, id desc'
+
+    subject_id = fields.Many2one(
+        'university.subject',
+        string='Subject',
+        required=True,
+        ondelete='cascade',
+        help="Subject taught in the session"
+    )
+
+    term_id = fields.Many2one(
+        'university.term',
+        string='Term',
+        required=True,
+        ondelete='restrict',
+        default=lambda self: self.env['university.term']._get_current_id() or False,
+        help="Term of the enrollments attending the session"
+    )
+
+    date = fields.Date(
+        string='Date',
+        required=True,
+        default=fields.Date.context_today,
+        help="Day of the class"
+    )
+
+    position = fields.Integer(
+        string='Position',
+        readonly=True,
+        copy=False,
+        help="Index of the session in the attendance bitmaps of its subject and term"
+    )
+
+    is_marked = fields.Boolean(
+        string='Attendance Taken',
+        readonly=True,
+        copy=False
+    )
+
+    enrolled_count = fields.Integer(string='Enrolled', compute='_compute_attendance')
+    present_count = fields.Integer(string='Present', compute='_compute_attendance')
+    attendance_rate = fields.Float(string='Attendance (%)', compute='_compute_attendance')
+
+    absent_enrollment_ids = fields.Many2many(
+        'university.enrollment',
+        string='Absent',
+        compute='_compute_attendance',
+        inverse='_inverse_absent_enrollments',
+        help="Students missing the class; saving the list takes the attendance"
+    )
+
+    _sql_constraints = [
+        ('position_uniq', 'UNIQUE(subject_id, term_id, position)',
+         'Two sessions of a subject cannot share the same position in a term.'),
+    ]
+
+    def _compute_display_name(self):
+        for session in self:
+            session.display_name = '%s - %s' % (
+                session.subject_id.name or '', fields.Date.to_string(session.date) or '')
+
+    def _compute_attendance(self):
+        """
+        Read the attendance of the sessions from the bitmaps, in one query.
+        """
+        stats = {}
+        if self._origin.ids:
+            self.env.flush_all()
+            self.env.cr.execute("""
+                SELECT s.id,
+                       COUNT(e.id),
+                       COALESCE(SUM(universidad_bits_get(a.present_bits, s.position)), 0),
+                       ARRAY_AGG(e.id) FILTER (
+                           WHERE universidad_bits_get(a.marked_bits, s.position) = 1
+                             AND universidad_bits_get(a.present_bits, s.position) = 0)
+                  FROM university_session s
+                  JOIN university_enrollment e ON e.subject_id = s.subject_id AND e.term_id = s.term_id
+                  LEFT JOIN university_attendance a ON a.enrollment_id = e.id
+                 WHERE s.id = ANY(%s)
+              GROUP BY s.id
+            """, [self._origin.ids])
+            stats = {row[0]: row[1:] for row in self.env.cr.fetchall()}
+        for session in self:
+            enrolled, present, absent_ids = stats.get(session._origin.id, (0, 0, None))
+            session.enrolled_count = enrolled
+            session.present_count = present
+            session.attendance_rate = 100.0 * present / enrolled if session.is_marked and enrolled else 0.0
+            session.absent_enrollment_ids = [(6, 0, absent_ids or [])]
+
+    def _inverse_absent_enrollments(self):
+        for session in self:
+            session._mark_attendance(session.absent_enrollment_ids.ids)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """
+        Give each new session the next position of its subject and term.
+
+        The subjects are locked while positions are assigned, so concurrent
+        sessions of a subject get different positions.
+        """
+        subject_ids = sorted({vals['subject_id'] for vals in vals_list if vals.get('subject_id')})
+        next_positions = {}
+        if subject_ids:
+            self.env.cr.execute("""
+                SELECT id FROM university_subject WHERE id = ANY(%s) ORDER BY id FOR NO KEY UPDATE
+            """, [subject_ids])
+            self.env.cr.execute("""
+                SELECT subject_id, term_id, MAX(position) + 1
+                  FROM university_session
+                 WHERE subject_id = ANY(%s)
+              GROUP BY subject_id, term_id
+            """, [subject_ids])
+            next_positions = {(subject_id, term_id): position
+                              for subject_id, term_id, position in self.env.cr.fetchall()}
+        default_term_id = self.default_get(['term_id']).get('term_id')
+        for vals in vals_list:
+            key = (vals.get('subject_id'), vals.get('term_id', default_term_id))
+            vals['position'] = next_positions.get(key, 0)
+            next_positions[key] = vals['position'] + 1
+        return super().create(vals_list)
+
+    def write(self, vals):
+        """
+        The position of a session is only valid within its subject and term.
+        """
+        if any(session.subject_id.id != vals.get('subject_id', session.subject_id.id)
+               or session.term_id.id != vals.get('term_id', session.term_id.id) for session in self):
+            raise UserError(_('The subject and the term of a session cannot be changed.'))
+        return super().write(vals)
+
+    def unlink(self):
+        """
+        Clear the bits of the marked sessions from the attendance bitmaps.
+        """
+        self.env.flush_all()
+        # Una sentencia por sesión: un UPDATE ... FROM solo aplica una fila por asistencia
+        for session in self.filtered('is_marked'):
+            self.env.cr.execute("""
+                UPDATE university_attendance
+                   SET present_count = present_count - universidad_bits_get(present_bits, %(position)s),
+                       session_count = session_count - 1,
+                       present_bits = universidad_bits_set(present_bits, %(position)s, 0),
+                       marked_bits = universidad_bits_set(marked_bits, %(position)s, 0)
+                 WHERE subject_id = %(subject_id)s AND term_id = %(term_id)s
+                   AND universidad_bits_get(marked_bits, %(position)s) = 1
+            """, {'subject_id': session.subject_id.id, 'term_id': session.term_id.id,
+                  'position': session.position})
+        self.env['university.attendance'].invalidate_model()
+        return super().unlink()
+
+    def _mark_attendance(self, absent_ids=()):
+        """
+        Take the attendance of the session in a single statement.
+
+        Every enrollment of the subject in the term gets the bit of the
+        session set in its marked bitmap, and in its present bitmap unless it
+        is absent. Marking a session again replaces its previous attendance.
+
+        Args:
+            absent_ids (list): Ids of the enrollments absent from the session
+        """
+        self.ensure_one()
+        self.check_access('write')
+        if not self.is_marked:
+            self.is_marked = True
+        self.env.flush_all()
+        self.env.cr.execute("""
+            INSERT INTO university_attendance AS a
+                (enrollment_id, student_id, subject_id, term_id,
+                 present_bits, marked_bits, present_count, session_count)
+            SELECT e.id, e.student_id, e.subject_id, e.term_id,
+                   universidad_bits_set(B'', %(position)s, (e.id <> ALL(%(absent_ids)s))::int),
+                   universidad_bits_set(B'', %(position)s, 1),
+                   (e.id <> ALL(%(absent_ids)s))::int,
+                   1
+              FROM university_enrollment e
+             WHERE e.subject_id = %(subject_id)s AND e.term_id = %(term_id)s
+            ON CONFLICT (enrollment_id) DO UPDATE SET
+                present_bits = universidad_bits_set(a.present_bits, %(position)s, EXCLUDED.present_count),
+                marked_bits = universidad_bits_set(a.marked_bits, %(position)s, 1),
+                present_count = a.present_count
+                    - universidad_bits_get(a.present_bits, %(position)s) + EXCLUDED.present_count,
+                session_count = a.session_count
+                    - universidad_bits_get(a.marked_bits, %(position)s) + 1
+        """, {
+            'subject_id': self.subject_id.id,
+            'term_id': self.term_id.id,
+            'position': self.position,
+            'absent_ids': list(absent_ids),
+        })
+        self.env['university.attendance'].invalidate_model()
+        self.invalidate_recordset(['enrolled_count', 'present_count', 'attendance_rate', 'absent_enrollment_ids'])
+
+    def action_mark_all_present(self):
+        """
+        Mark every enrollment of the sessions present.
+        """
+        for session in self:
+            session._mark_attendance()
+
+
+class UniversityAttendance(models.Model):
+    """
+    University Attendance Model.
+
+    This class represents the attendance of one enrollment to the sessions of
+    its subject in its term. The bitmaps are not ORM fields: they are written
+    in SQL by ``university.session`` only, together with the counters.
+
+    Attributes:
+        enrollment_id (Many2one): Enrollment attending the sessions
+        student_id (Many2one): Student of the enrollment
+        subject_id (Many2one): Subject of the enrollment
+        term_id (Many2one): Term of the enrollment
+        session_count (Integer): Sessions where attendance was taken
+        present_count (Integer): Sessions attended
+        attendance_rate (Float): Percentage of sessions attended (computed)
+    """
+    _name = 'university.attendance'
+    _description = 'University Attendance'
+    _order = 'term_id desc, subject_id, student_id'
+    _log_access = False  # Derived table, written in SQL
+
+    enrollment_id = fields.Many2one(
+        'university.enrollment',
+        string='Enrollment',
+        required=True,
+        ondelete='cascade',
+        readonly=True
+    )
+    student_id = fields.Many2one(
+        'university.student',
+        string='Student',
+        related='enrollment_id.student_id',
+        store=True,
+        index=True
+    )
+    subject_id = fields.Many2one(
+        'university.subject',
+        string='Subject',
+        related='enrollment_id.subject_id',
+        store=True
+    )
+    term_id = fields.Many2one(
+        'university.term',
+        string='Term',
+        related='enrollment_id.term_id',
+        store=True
+    )
+    session_count = fields.Integer(string='Sessions', readonly=True)
+    present_count = fields.Integer(string='Attended', readonly=True)
+    attendance_rate = fields.Float(string='Attendance (%)', compute='_compute_attendance_rate', aggregator=False)
+
+    _sql_constraints = [
+        ('enrollment_uniq', 'UNIQUE(enrollment_id)', 'An enrollment has a single attendance row.'),
+    ]
+
+    def init(self):
+        """
+        Create the bitmap columns, their SQL helpers and the subject index.
+
+        Bit n of a bitmap is the session at position n; bitmaps only grow up
+        to the last position set, missing bits read as 0.
+        """
+        cr = self.env.cr
+        cr.execute(f"""
+            ALTER TABLE {self._table}
+                ADD COLUMN IF NOT EXISTS present_bits bit varying DEFAULT B'',
+                ADD COLUMN IF NOT EXISTS marked_bits bit varying DEFAULT B''
+        """)
+        cr.execute("""
+            CREATE OR REPLACE FUNCTION universidad_bits_get(bits bit varying, pos integer)
+            RETURNS integer LANGUAGE sql IMMUTABLE AS $$
+                SELECT CASE WHEN length(COALESCE(bits, B'')) > pos THEN get_bit(bits, pos) ELSE 0 END
+            $$
+        """)
+        cr.execute("""
+            CREATE OR REPLACE FUNCTION universidad_bits_set(bits bit varying, pos integer, value integer)
+            RETURNS bit varying LANGUAGE sql IMMUTABLE AS $$
+                SELECT set_bit(
+                    CASE WHEN length(COALESCE(bits, B'')) > pos THEN bits
+                         ELSE COALESCE(bits, B'') || repeat('0', pos + 1 - length(COALESCE(bits, B'')))::bit varying
+                    END, pos, value)
+            $$
+        """)
+        cr.execute(f"""
+            CREATE INDEX IF NOT EXISTS university_attendance_subject_term_idx
+                ON {self._table} (subject_id, term_id)
+        """)
+
+    @api.model
+    def _reset(self, enrollment_ids):
+        """
+        Empty the attendance of enrollments moved to another subject or term.
+
+        The bits are positions of the sessions of the previous subject and
+        term, meaningless against the new ones: the rows follow the enrollment
+        and start over. Called after the enrollments are written, by the ORM
+        or in SQL.
+
+        Args:
+            enrollment_ids (list): Ids of the moved enrollments
+        """
+        if not enrollment_ids:
+            return
+        self.env.flush_all()
+        self.env.cr.execute("""
+            UPDATE university_attendance a
+               SET student_id = e.student_id,
+                   subject_id = e.subject_id,
+                   term_id = e.term_id,
+                   present_bits = B'',
+                   marked_bits = B'',
+                   present_count = 0,
+                   session_count = 0
+              FROM university_enrollment e
+             WHERE e.id = a.enrollment_id
+               AND a.enrollment_id = ANY(%s)
+        """, [list(enrollment_ids)])
+        self.invalidate_model()
+
+    @api.depends('session_count', 'present_count')
+    def _compute_attendance_rate(self):
+        for attendance in self:
+            attendance.attendance_rate = (
+                100.0 * attendance.present_count / attendance.session_count if attendance.session_count else 0.0)
+
+    @api.model
+    def _get_rates(self, groupby, domain):
+        """
+        Aggregate attendance rates, weighting every session equally.
+
+        Args:
+            groupby (str): Field to group by, e.g. student_id or subject_id
+            domain (list): Rows to aggregate
+
+        Returns:
+            dict: Rate in percent by group value (a record for relations)
+        """
+        groups = self._read_group(domain, [groupby], ['present_count:sum', 'session_count:sum'])
+        return {
+            group: 100.0 * present / sessions
+            for group, present, sessions in groups
+            if sessions
+        }
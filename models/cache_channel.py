@@ -0,0 +1,60 @@
+"""
+Module for the invalidation channel of the University module caches.
+
+This module installs a statement trigger on the tables the caches are
+computed from, which notifies the workers of the changed table when the
+transaction commits, see Universidad.cache.
+"""
+
+from odoo import models
+
+from .. import cache
+
+class UniversityCacheChannel(models.AbstractModel):
+    """
+    University Cache Invalidation Channel.
+
+    Loaded after the other models of the module, so that its init() sees
+    every university table. The caches are registered when the module is
+    imported, before any init() runs.
+    """
+    _name = 'university.cache.channel'
+    _description = 'University Cache Invalidation Channel'
+
+    def init(self):
+        """
+        Create the notification trigger on the tables of the caches, and
+        drop it from the other university tables.
+
+        NOTIFY takes a global lock at commit, so the tables no cache reads
+        must not send it. Its payloads are deduplicated per transaction, so a
+        transaction writing a table many times sends its name once.
+        """
+        self.env.cr.execute(f"""
+            CREATE OR REPLACE FUNCTION universidad_cache_notify() RETURNS trigger AS $$
+            BEGIN
+                PERFORM pg_notify('{cache.CHANNEL}', TG_TABLE_NAME);
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+        self.env.cr.execute("""
+            SELECT t.table_name,
+                   EXISTS (SELECT 1 FROM pg_trigger tg
+                            WHERE tg.tgrelid = t.table_name::text::regclass
+                              AND tg.tgname = 'universidad_cache_notify')
+              FROM information_schema.tables t
+             WHERE t.table_schema = current_schema()
+               AND t.table_type = 'BASE TABLE'
+               AND t.table_name LIKE 'university\\_%'
+        """)
+        cached = cache.tables()
+        for table, has_trigger in self.env.cr.fetchall():
+            if table in cached and not has_trigger:
+                self.env.cr.execute(f"""
+                    CREATE TRIGGER universidad_cache_notify
+                    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON "{table}"
+                    FOR EACH STATEMENT EXECUTE FUNCTION universidad_cache_notify()
+                """)
+            elif table not in cached and has_trigger:
+                self.env.cr.execute(f'DROP TRIGGER universidad_cache_notify ON "{table}"')
@@ -0,0 +1,331 @@
+"""
+Module for the cross-model consistency checker.
+
+This module implements the UniversityConsistencyCheck model, which verifies
+the invariants of the university data over the whole database with one
+set-based SQL query per rule, and can repair the ones that are derived data.
+The Python constraints only run when a record is written; data loaded through
+SQL or old imports is only caught by this checker.
+"""
+
+from odoo import models, fields, api, _
+from odoo.tools import str2bool
+
+# Rule key -> (label, model, query selecting the violating ids, repair query or None)
+RULES = {
+    'enrollment_university_mismatch': (
+        "Enrollment student and subject belong to different universities",
+        'university.enrollment',
+        """
+            SELECT e.id
+              FROM university_enrollment e
+              JOIN university_student st ON st.id = e.student_id
+              JOIN university_subject sub ON sub.id = e.subject_id
+             WHERE st.university_id IS DISTINCT FROM sub.university_id
+        """,
+        None,
+    ),
+    'enrollment_university_stale': (
+        "Enrollment university differs from the student's university",
+        'university.enrollment',
+        """
+            SELECT e.id
+              FROM university_enrollment e
+              JOIN university_student st ON st.id = e.student_id
+             WHERE e.university_id IS DISTINCT FROM st.university_id
+        """,
+        """
+            UPDATE university_enrollment e
+               SET university_id = st.university_id
+              FROM university_student st
+             WHERE st.id = e.student_id
+               AND e.university_id IS DISTINCT FROM st.university_id
+        """,
+    ),
+    'enrollment_department_stale': (
+        "Enrollment department differs from the subject's department",
+        'university.enrollment',
+        """
+            SELECT e.id
+              FROM university_enrollment e
+              JOIN university_subject sub ON sub.id = e.subject_id
+             WHERE e.department_id IS DISTINCT FROM sub.department_id
+        """,
+        """
+            UPDATE university_enrollment e
+               SET department_id = sub.department_id
+              FROM university_subject sub
+             WHERE sub.id = e.subject_id
+               AND e.department_id IS DISTINCT FROM sub.department_id
+        """,
+    ),
+    'enrollment_professor_stale': (
+        "Enrollment professor is not the first professor of the subject",
+        'university.enrollment',
+        """
+            SELECT e.id
+              FROM university_enrollment e
+              LEFT JOIN (
+                    SELECT {subject_col} AS subject_id, MIN({professor_col}) AS professor_id
+                      FROM {relation}
+                  GROUP BY {subject_col}
+              ) fp ON fp.subject_id = e.subject_id
+             WHERE e.professor_id IS DISTINCT FROM fp.professor_id
+        """,
+        """
+            UPDATE university_enrollment e
+               SET professor_id = (
+                    SELECT MIN({professor_col}) FROM {relation} WHERE {subject_col} = e.subject_id
+               )
+             WHERE e.professor_id IS DISTINCT FROM (
+                    SELECT MIN({professor_col}) FROM {relation} WHERE {subject_col} = e.subject_id
+               )
+        """,
+    ),
+    'grade_student_mismatch': (
+        "Grade student does not own the grade's enrollment",
+        'university.grade',
+        """
+            SELECT g.id
+              FROM university_grade g
+              JOIN university_enrollment e ON e.id = g.enrollment_id
+             WHERE g.student_id IS DISTINCT FROM e.student_id
+        """,
+        """
+            UPDATE university_grade g
+               SET student_id = e.student_id
+              FROM university_enrollment e
+             WHERE e.id = g.enrollment_id
+               AND g.student_id IS DISTINCT FROM e.student_id
+        """,
+    ),
+    'grade_university_stale': (
+        "Grade university differs from the enrollment's university",
+        'university.grade',
+        """
+            SELECT g.id
+              FROM university_grade g
+              JOIN university_enrollment e ON e.id = g.enrollment_id
+             WHERE g.university_id IS DISTINCT FROM e.university_id
+        """,
+        """
+            UPDATE university_grade g
+               SET university_id = e.university_id
+              FROM university_enrollment e
+             WHERE e.id = g.enrollment_id
+               AND g.university_id IS DISTINCT FROM e.university_id
+        """,
+    ),
+    'grade_subject_stale': (
+        "Grade subject differs from the enrollment's subject",
+        'university.grade',
+        """
+            SELECT g.id
+              FROM university_grade g
+              JOIN university_enrollment e ON e.id = g.enrollment_id
+             WHERE g.subject_id IS DISTINCT FROM e.subject_id
+        """,
+        """
+            UPDATE university_grade g
+               SET subject_id = e.subject_id
+              FROM university_enrollment e
+             WHERE e.id = g.enrollment_id
+               AND g.subject_id IS DISTINCT FROM e.subject_id
+        """,
+    ),
+    'grade_term_stale': (
+        "Grade term differs from the enrollment's term",
+        'university.grade',
+        """
+            SELECT g.id
+              FROM university_grade g
+              JOIN university_enrollment e ON e.id = g.enrollment_id
+             WHERE g.term_id IS DISTINCT FROM e.term_id
+        """,
+        """
+            UPDATE university_grade g
+               SET term_id = e.term_id
+              FROM university_enrollment e
+             WHERE e.id = g.enrollment_id
+               AND g.term_id IS DISTINCT FROM e.term_id
+        """,
+    ),
+}
+
+# Number of violating ids kept on each report line
+SAMPLE_SIZE = 100
+
+class UniversityConsistencyCheck(models.Model):
+    """
+    University Consistency Check Model.
+
+    This class represents one run of the consistency checker, with one line
+    per rule holding the number of violations and a sample of the records.
+
+    Attributes:
+        name (Char): Run reference
+        date (Datetime): When the check was run
+        repair (Boolean): Whether repairable violations were fixed
+        recompute_pending (Boolean): Deferred recomputes were still queued
+        violation_count (Integer): Total number of violations found
+        line_ids (One2many): Results per rule
+    """
+    _name = 'university.consistency.check'
+    _description = 'University Consistency Check'
+    _order = 'date desc, id desc'
+
+    name = fields.Char(string='Reference', required=True, readonly=True, default='/')
+    date = fields.Datetime(string='Date', default=fields.Datetime.now, readonly=True)
+    repair = fields.Boolean(
+        string='Repair',
+        help="Fix the violations of derived fields after reporting them"
+    )
+    recompute_pending = fields.Boolean(
+        string='Recomputes Pending',
+        readonly=True,
+        help="Deferred recompute jobs were still queued: some stale values may be expected"
+    )
+    violation_count = fields.Integer(
+        string='Violations',
+        compute='_compute_violation_count',
+        store=True
+    )
+    line_ids = fields.One2many(
+        'university.consistency.check.line',
+        'check_id',
+        string='Results',
+        readonly=True
+    )
+
+    @api.depends('line_ids.violation_count')
+    def _compute_violation_count(self):
+        for check in self:
+            check.violation_count = sum(check.line_ids.mapped('violation_count'))
+
+    @api.model
+    def _format_rule_query(self, query):
+        """
+        Fill the relation table of the subject professors into a rule query.
+
+        Args:
+            query (str): Rule query with placeholders
+
+        Returns:
+            str: Executable query
+        """
+        field = self.env['university.subject']._fields['professor_ids']
+        return query.format(
+            relation=field.relation,
+            subject_col=field.column1,
+            professor_col=field.column2,
+        )
+
+    def action_run(self):
+        """
+        Evaluate every rule and, if requested, repair the derived fields.
+
+        Returns:
+            bool: True
+        """
+        self.env.flush_all()
+        cr = self.env.cr
+        for check in self:
+            check.line_ids.unlink()
+            lines = []
+            for rule, (label, model_name, query, repair_query) in RULES.items():
+                cr.execute(f"""
+                    SELECT COUNT(*), (ARRAY_AGG(v.id ORDER BY v.id))[1:{SAMPLE_SIZE}]
+                      FROM ({self._format_rule_query(query)}) v
+                """)
+                count, sample = cr.fetchone()
+                repaired = 0
+                if count and check.repair and repair_query:
+                    cr.execute(self._format_rule_query(repair_query))
+                    repaired = cr.rowcount
+                lines.append({
+                    'check_id': check.id,
+                    'rule': rule,
+                    'model_name': model_name,
+                    'violation_count': count,
+                    'repaired_count': repaired,
+                    'sample_ids': ', '.join(map(str, sample or [])),
+                })
+            self.env['university.consistency.check.line'].create(lines)
+            check.write({
+                'name': _('Check %s', fields.Datetime.to_string(check.date)),
+                'recompute_pending': not self.env['university.recompute.job']._is_consistent(),
+            })
+        # Repairs are done in SQL, the cached values are outdated
+        self.env.invalidate_all()
+        return True
+
+    @api.model
+    def _cron_run_check(self):
+        """
+        Nightly run of the checker.
+
+        Repairs are applied when the system parameter
+        ``Universidad.consistency_auto_repair`` is true (``True``, ``1``...).
+        """
+        repair = str2bool(self.env['ir.config_parameter'].sudo().get_param(
+            'Universidad.consistency_auto_repair', 'False'), default=False)
+        self.create({'repair': repair}).action_run()
+
+
+class UniversityConsistencyCheckLine(models.Model):
+    """
+    University Consistency Check Line Model.
+
+    This class represents the result of one rule in a consistency check.
+    """
+    _name = 'university.consistency.check.line'
+    _description = 'University Consistency Check Result'
+    _order = 'violation_count desc, id'
+
+    check_id = fields.Many2one(
+        'university.consistency.check',
+        string='Check',
+        required=True,
+        ondelete='cascade'
+    )
+    rule = fields.Selection(
+        [(key, values[0]) for key, values in RULES.items()],
+        string='Rule',
+        required=True,
+        readonly=True
+    )
+    model_name = fields.Char(string='Model', readonly=True)
+    violation_count = fields.Integer(string='Violations', readonly=True)
+    repaired_count = fields.Integer(string='Repaired', readonly=True)
+    sample_ids = fields.Char(
+        string='Sample IDs',
+        readonly=True,
+        help="First violating record ids"
+    )
+    repairable = fields.Boolean(
+        string='Repairable',
+        compute='_compute_repairable'
+    )
+
+    @api.depends('rule')
+    def _compute_repairable(self):
+        for line in self:
+            line.repairable = bool(line.rule and RULES[line.rule][3])
+
+    def action_view_records(self):
+        """
+        Display the sampled violating records.
+
+        Returns:
+            dict: Window action on the violating records
+        """
+        self.ensure_one()
+        ids = [int(res_id) for res_id in (self.sample_ids or '').split(',') if res_id.strip()]
+        return {
+            'type': 'ir.actions.act_window',
+            'name': dict(self._fields['rule'].selection)[self.rule],
+            'res_model': self.model_name,
+            'view_mode': 'list,form',
+            'domain': [('id', 'in', ids)],
+            'target': 'current',
+        }
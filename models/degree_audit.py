@@ -0,0 +1,226 @@
+"""
+Module for the degree requirement audit.
+
+This module implements the UniversityDegreeAudit model, the stored progress of
+each student towards their degree, with one UniversityDegreeAuditLine per
+requirement. Progress is evaluated for any set of students (a university, a
+program, the students of changed grades) in a single set-based statement over
+the passed grades, instead of walking the grades of every student.
+"""
+
+from odoo import models, fields, api
+
+# Grades from this value on are passed
+PASS_GRADE = 5.0
+
+class UniversityDegreeAudit(models.Model):
+    """
+    University Degree Audit Model.
+
+    Attributes:
+        student_id (Many2one): Audited student
+        program_id (Many2one): Degree program of the student
+        university_id (Many2one): University of the student
+        earned_credits (Float): Credits of the passed subjects
+        required_credits (Float): Credits needed by the program
+        requirement_count (Integer): Number of requirements
+        requirement_done_count (Integer): Number of requirements met
+        completed (Boolean): Every requirement and the total credits are met
+        progress (Float): Percentage of the required credits earned (computed)
+        audit_date (Datetime): When the progress was last evaluated
+        line_ids (One2many): Progress per requirement
+    """
+    _name = 'university.degree.audit'
+    _description = 'University Degree Audit'
+    _order = 'university_id, program_id, student_id'
+    _log_access = False  # Derived table, refreshed in SQL
+
+    student_id = fields.Many2one(
+        'university.student',
+        string='Student',
+        required=True,
+        ondelete='cascade',
+        readonly=True
+    )
+    program_id = fields.Many2one(
+        'university.degree.program',
+        string='Degree Program',
+        ondelete='cascade',
+        index=True,
+        readonly=True
+    )
+    university_id = fields.Many2one(
+        'university.university',
+        string='University',
+        index=True,
+        readonly=True
+    )
+    earned_credits = fields.Float(string='Earned Credits', readonly=True)
+    required_credits = fields.Float(string='Required Credits', readonly=True)
+    requirement_count = fields.Integer(string='Requirements', readonly=True)
+    requirement_done_count = fields.Integer(string='Requirements Met', readonly=True)
+    completed = fields.Boolean(string='Completed', readonly=True, index=True)
+    progress = fields.Float(
+        string='Progress',
+        compute='_compute_progress',
+        help="Percentage of the required credits already earned"
+    )
+    audit_date = fields.Datetime(string='Audit Date', readonly=True)
+    line_ids = fields.One2many(
+        'university.degree.audit.line',
+        'audit_id',
+        string='Requirements',
+        readonly=True
+    )
+
+    _sql_constraints = [
+        ('student_uniq', 'UNIQUE(student_id)', 'A student has a single degree audit.'),
+    ]
+
+    @api.depends('earned_credits', 'required_credits')
+    def _compute_progress(self):
+        for audit in self:
+            if audit.required_credits:
+                audit.progress = min(100.0, 100.0 * audit.earned_credits / audit.required_credits)
+            else:
+                audit.progress = 100.0 if audit.completed else 0.0
+
+    @api.model
+    def _refresh_queued(self, student_ids):
+        self._refresh(students=self.env['university.student'].browse(student_ids).exists())
+
+    @api.model
+    def _refresh(self, students=None, programs=None, universities=None):
+        """
+        Evaluate the degree requirements of a set of students.
+
+        The passed subjects of the students are read once; each subject
+        lineage counts once, whatever the number of offerings passed. The new
+        audit rows and their lines are inserted in a single statement.
+
+        Args:
+            students (recordset): Students to evaluate
+            programs (recordset): Evaluate the students of these programs
+            universities (recordset): Evaluate the students of these universities
+
+        If no argument is given, every student is evaluated.
+        """
+        given = [records for records in (students, programs, universities) if records is not None]
+        if given and not any(given):
+            return
+        self.env.flush_all()
+        cr = self.env.cr
+        params = {
+            'all': students is None and programs is None and universities is None,
+            'student_ids': students.ids if students else [],
+            'program_ids': programs.ids if programs else [],
+            'university_ids': universities.ids if universities else [],
+            'pass_grade': PASS_GRADE,
+        }
+        scope = """
+            SELECT st.id AS student_id, st.degree_program_id AS program_id, st.university_id
+              FROM university_student st
+             WHERE %(all)s
+                OR st.id = ANY(%(student_ids)s)
+                OR st.degree_program_id = ANY(%(program_ids)s)
+                OR st.university_id = ANY(%(university_ids)s)
+        """
+        # Students leaving a program lose their audit
+        cr.execute(f"""
+            DELETE FROM university_degree_audit
+             WHERE student_id IN (SELECT student_id FROM ({scope}) s)
+        """, params)
+        cr.execute(f"""
+            WITH scope AS ({scope}),
+            passed AS (
+                SELECT DISTINCT ON (g.student_id, sub.lineage_id)
+                       g.student_id, sub.lineage_id, sub.department_id, sub.credits
+                  FROM university_grade g
+                  JOIN scope s ON s.student_id = g.student_id AND s.program_id IS NOT NULL
+                  JOIN university_subject sub ON sub.id = g.subject_id
+                 WHERE g.grade >= %(pass_grade)s
+              ORDER BY g.student_id, sub.lineage_id, sub.id DESC
+            ),
+            totals AS (
+                SELECT student_id, SUM(credits) AS credits
+                  FROM passed
+              GROUP BY student_id
+            ),
+            lines AS (
+                SELECT s.student_id, r.id AS requirement_id, r.requirement_type,
+                       COALESCE(SUM(p.credits), 0) AS earned_credits,
+                       CASE WHEN r.requirement_type = 'mandatory_subject'
+                            THEN COALESCE(rs.credits, 0) ELSE COALESCE(r.credits, 0)
+                       END AS required_credits,
+                       COUNT(p.lineage_id) > 0 AS has_passed
+                  FROM scope s
+                  JOIN university_degree_requirement r ON r.program_id = s.program_id
+                  LEFT JOIN university_subject rs ON rs.id = r.subject_id
+                  LEFT JOIN passed p ON p.student_id = s.student_id AND (
+                        (r.requirement_type = 'department_credits' AND p.department_id = r.department_id)
+                     OR (r.requirement_type = 'mandatory_subject' AND p.lineage_id = rs.lineage_id)
+                  )
+              GROUP BY s.student_id, r.id, r.requirement_type, r.credits, rs.credits
+            ),
+            checked AS (
+                SELECT l.*,
+                       CASE WHEN l.requirement_type = 'mandatory_subject' THEN l.has_passed
+                            ELSE l.earned_credits >= l.required_credits
+                       END AS completed
+                  FROM lines l
+            ),
+            audits AS (
+                INSERT INTO university_degree_audit
+                    (student_id, program_id, university_id, earned_credits, required_credits,
+                     requirement_count, requirement_done_count, completed, audit_date)
+                SELECT s.student_id, s.program_id, s.university_id,
+                       COALESCE(t.credits, 0), pr.total_credits,
+                       COUNT(c.requirement_id), COUNT(c.requirement_id) FILTER (WHERE c.completed),
+                       COALESCE(t.credits, 0) >= COALESCE(pr.total_credits, 0)
+                           AND COALESCE(BOOL_AND(c.completed), TRUE),
+                       NOW() AT TIME ZONE 'UTC'
+                  FROM scope s
+                  JOIN university_degree_program pr ON pr.id = s.program_id
+                  LEFT JOIN totals t ON t.student_id = s.student_id
+                  LEFT JOIN checked c ON c.student_id = s.student_id
+              GROUP BY s.student_id, s.program_id, s.university_id, t.credits, pr.total_credits
+             RETURNING id, student_id
+            )
+            INSERT INTO university_degree_audit_line
+                (audit_id, requirement_id, earned_credits, required_credits, completed)
+            SELECT a.id, c.requirement_id, c.earned_credits, c.required_credits, c.completed
+              FROM checked c
+              JOIN audits a ON a.student_id = c.student_id
+        """, params)
+        # Rows were replaced in SQL
+        self.env.invalidate_all()
+
+
+class UniversityDegreeAuditLine(models.Model):
+    """
+    University Degree Audit Line Model.
+
+    This class represents the progress of a student on one requirement.
+    """
+    _name = 'university.degree.audit.line'
+    _description = 'University Degree Audit Line'
+    _order = 'audit_id, requirement_id'
+    _log_access = False  # Derived table, refreshed in SQL
+
+    audit_id = fields.Many2one(
+        'university.degree.audit',
+        string='Audit',
+        required=True,
+        ondelete='cascade',
+        index=True,
+        readonly=True
+    )
+    requirement_id = fields.Many2one(
+        'university.degree.requirement',
+        string='Requirement',
+        ondelete='cascade',
+        readonly=True
+    )
+    earned_credits = fields.Float(string='Earned Credits', readonly=True)
+    required_credits = fields.Float(string='Required Credits', readonly=True)
+    completed = fields.Boolean(string='Completed', readonly=True)
@@ -0,0 +1,191 @@
+"""
+Module for managing degree programs and their requirements.
+
+This module implements the UniversityDegreeProgram model, the degree a
+student is working towards, and the UniversityDegreeRequirement model, the
+conditions a student must meet to complete it: a number of credits in a
+department or a mandatory subject.
+"""
+
+from odoo import models, fields, api, _
+from odoo.exceptions import ValidationError
+
+class UniversityDegreeProgram(models.Model):
+    """
+    University Degree Program Model.
+
+    Attributes:
+        name (Char): Program name
+        university_id (Many2one): University offering the program
+        total_credits (Float): Credits needed to complete the degree
+        requirement_ids (One2many): Requirements of the program
+        student_ids (One2many): Students following the program
+        student_count (Integer): Number of students (computed)
+    """
+    _name = 'university.degree.program'
+    _description = 'University Degree Program'
+    _order = 'university_id, name'
+
+    name = fields.Char(
+        string='Name',
+        required=True,
+        help="Name of the degree"
+    )
+
+    university_id = fields.Many2one(
+        'university.university',
+        string='University',
+        required=True,
+        help="University offering the degree"
+    )
+
+    total_credits = fields.Float(
+        string='Total Credits',
+        default=240.0,
+        help="Credits a student must earn in passed subjects to complete the degree"
+    )
+
+    requirement_ids = fields.One2many(
+        'university.degree.requirement',
+        'program_id',
+        string='Requirements',
+        copy=True,
+        help="Conditions to meet besides the total credits"
+    )
+
+    student_ids = fields.One2many(
+        'university.student',
+        'degree_program_id',
+        string='Students',
+        help="Students following this degree"
+    )
+
+    student_count = fields.Integer(
+        string='Student Count',
+        compute='_compute_student_count'
+    )
+
+    def _compute_student_count(self):
+        counts = dict(self.env['university.student']._read_group(
+            [('degree_program_id', 'in', self.ids)], ['degree_program_id'], ['__count']))
+        for program in self:
+            program.student_count = counts.get(program, 0)
+
+    def action_run_audit(self):
+        """
+        Evaluate the requirements of every student of the programs.
+
+        Returns:
+            dict: Window action on the audit results
+        """
+        self.env['university.degree.audit'].sudo()._refresh(programs=self)
+        return self.action_view_audits()
+
+    def action_view_audits(self):
+        """
+        Display the audit results of the students of the programs.
+
+        Returns:
+            dict: Window action on the audit results
+        """
+        return {
+            'type': 'ir.actions.act_window',
+            'name': _('Degree Audit'),
+            'res_model': 'university.degree.audit',
+            'view_mode': 'list,form',
+            'domain': [('program_id', 'in', self.ids)],
+            'target': 'current',
+        }
+
+
+class UniversityDegreeRequirement(models.Model):
+    """
+    University Degree Requirement Model.
+
+    Attributes:
+        program_id (Many2one): Degree program
+        name (Char): Requirement description
+        requirement_type (Selection): Department credits or mandatory subject
+        department_id (Many2one): Department in which credits must be earned
+        credits (Float): Credits to earn in the department
+        subject_id (Many2one): Subject that must be passed
+    """
+    _name = 'university.degree.requirement'
+    _description = 'University Degree Requirement'
+    _order = 'program_id, sequence, id'
+
+    program_id = fields.Many2one(
+        'university.degree.program',
+        string='Program',
+        required=True,
+        ondelete='cascade',
+        index=True
+    )
+    sequence = fields.Integer(string='Sequence', default=10)
+    name = fields.Char(
+        string='Description',
+        compute='_compute_name',
+        store=True,
+        readonly=False
+    )
+    requirement_type = fields.Selection([
+        ('department_credits', 'Credits in Department'),
+        ('mandatory_subject', 'Mandatory Subject'),
+    ], string='Type', required=True, default='department_credits')
+
+    department_id = fields.Many2one(
+        'university.department',
+        string='Department',
+        help="Department whose passed subjects count for this requirement"
+    )
+    credits = fields.Float(
+        string='Credits',
+        help="Credits to earn in the department"
+    )
+    subject_id = fields.Many2one(
+        'university.subject',
+        string='Subject',
+        help="Subject to pass. Any offering of the subject (any academic year) is accepted"
+    )
+
+    @api.depends('requirement_type', 'department_id', 'credits', 'subject_id')
+    def _compute_name(self):
+        for requirement in self:
+            if requirement.requirement_type == 'mandatory_subject':
+                requirement.name = requirement.subject_id.name or ''
+            else:
+                requirement.name = _('%(credits)s credits in %(department)s',
+                                     credits=requirement.credits,
+                                     department=requirement.department_id.name or '')
+
+    @api.constrains('requirement_type', 'department_id', 'subject_id')
+    def _check_target(self):
+        """
+        Validates that the requirement targets a department or a subject.
+
+        Raises:
+            ValidationError: If the department or subject is missing.
+        """
+        for requirement in self:
+            if requirement.requirement_type == 'department_credits' and not requirement.department_id:
+                raise ValidationError(_('A credits requirement needs a department.'))
+            if requirement.requirement_type == 'mandatory_subject' and not requirement.subject_id:
+                raise ValidationError(_('A mandatory subject requirement needs a subject.'))
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        requirements = super().create(vals_list)
+        self.env['university.degree.audit'].sudo()._refresh(programs=requirements.program_id)
+        return requirements
+
+    def write(self, vals):
+        programs = self.program_id
+        result = super().write(vals)
+        self.env['university.degree.audit'].sudo()._refresh(programs=programs | self.program_id)
+        return result
+
+    def unlink(self):
+        programs = self.program_id
+        result = super().unlink()
+        self.env['university.degree.audit'].sudo()._refresh(programs=programs)
+        return result
@@ -62,5 +62,7 @@ class UniversityDepartment(models.Model):
         Compute method to count the total number of professors in the department.
         Automatically triggered when the professor_ids field changes.
         """
+        counts = dict(self.env['university.professor']._read_group(
+            [('department_id', 'in', self._origin.ids)], ['department_id'], ['__count']))
         for record in self:
-            record.professor_count = len(record.professor_ids)  
+            record.professor_count = counts.get(record._origin, 0)  
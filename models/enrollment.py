@@ -1,6 +1,9 @@
-from odoo import models, fields, api
+from odoo import models, fields, api, _
 from datetime import datetime
 from odoo.exceptions import ValidationError
+from odoo.tools import sql
+from .subject_prerequisite import missing_prerequisites_query
+from .. import metrics
 
 # Definition of the UniversityEnrollment model
 class UniversityEnrollment(models.Model):
@@ -69,6 +72,16 @@ class UniversityEnrollment(models.Model):
         help="Date when the enrollment was created"  # Tooltip help text
     )
 
+    term_id = fields.Many2one(
+        'university.term',  # relacion con el periodo academico
+        string='Term',  # Label shown in the UI
+        compute='_compute_term',  # Term containing the enrollment date
+        store=True,  # Store in database
+        index=True,  # Term-scoped queries
+        ondelete='set null',
+        help="Academic term of the enrollment"  # Tooltip help text
+    )
+
     grade_ids = fields.One2many(
         'university.grade',  # Related model: grade
         'enrollment_id',  # Una matricula puede tener varias notas
@@ -93,6 +106,18 @@ class UniversityEnrollment(models.Model):
         for record in self:
             record.professor_id = record.subject_id.professor_ids[0] if record.subject_id.professor_ids else False  # Set first professor or False
 
+    @api.depends('date')  # Trigger when the enrollment date changes
+    def _compute_term(self):
+        """
+        Computes the academic term containing the enrollment date.
+        """
+        terms = self.env['university.term'].sudo().search([])  # Few rows, read once for the batch
+        for record in self:
+            record.term_id = next((
+                term for term in terms
+                if record.date and term.date_start <= record.date <= term.date_end
+            ), False)
+
     @api.depends('student_id', 'student_id.university_id')  # Trigger when student or their university changes
     def _compute_university(self):
         """
@@ -124,6 +149,29 @@ class UniversityEnrollment(models.Model):
                 if record.student_id.university_id != record.subject_id.university_id:
                     raise ValidationError(_('Student and subject must belong to the same university.'))  # Raise error if mismatch
 
+    @api.constrains('student_id', 'subject_id')  # Constraint on student and subject fields
+    def _check_prerequisites(self):
+        """
+        Validates that the student passed every prerequisite of the subject.
+
+        The transitive prerequisites come from the closure table, so the check
+        is one query for all the enrollments being validated.
+
+        Raises:
+            ValidationError: If a prerequisite has not been passed.
+        """
+        missing = self.env['university.subject.prerequisite']._get_missing_prerequisites("""
+            SELECT student_id, subject_id FROM university_enrollment WHERE id = ANY(%(ids)s)
+        """, {'ids': self.ids})
+        if missing:
+            (student_id, subject_id), prerequisite_ids = next(iter(missing.items()))
+            raise ValidationError(_(
+                '%(student)s cannot enroll in %(subject)s without passing: %(prerequisites)s',
+                student=self.env['university.student'].browse(student_id).name,
+                subject=self.env['university.subject'].browse(subject_id).name,
+                prerequisites=', '.join(self.env['university.subject'].browse(prerequisite_ids).mapped('name')),
+            ))
+
     @api.model  # Indicates this method is a model method
     def create(self, vals):
         """
@@ -152,4 +200,121 @@ class UniversityEnrollment(models.Model):
             seq = str(count).zfill(4)  # Pad sequence number with zeros
             vals['name'] = f"{prefix}/{year}/{seq}"  # Build enrollment number
 
-        return super(UniversityEnrollment, self).create(vals)  # Call original create method
\ No newline at end of file
+        enrollment = super(UniversityEnrollment, self).create(vals)  # Call original create method
+        metrics.inc_on_commit(self.env.cr, 'universidad_enrollments_created_total')  # Counted once committed
+        return enrollment
+
+    def write(self, vals):
+        """
+        Override of write method to reset the attendance of the enrollments
+        moved to another subject or term.
+
+        Args:
+            vals (dict): Values to write
+
+        Returns:
+            bool: True
+        """
+        if not {'date', 'subject_id', 'term_id'} & set(vals):
+            return super(UniversityEnrollment, self).write(vals)
+        previous = {record.id: (record.subject_id, record.term_id) for record in self}  # Antes de recalcular el periodo
+        result = super(UniversityEnrollment, self).write(vals)
+        self.flush_recordset(['subject_id', 'term_id'])  # Recompute the term of the new dates
+        moved = [record.id for record in self if previous[record.id] != (record.subject_id, record.term_id)]
+        self.env['university.attendance']._reset(moved)
+        return result
+
+    def init(self):
+        """
+        Create the index used to find existing (student, subject, year) enrollments.
+        """
+        sql.create_index(
+            self.env.cr, 'university_enrollment_student_subject_date_idx',
+            self._table, ['student_id', 'subject_id', 'date'],
+        )
+
+    @api.model
+    def _insert_enrollment_pairs(self, pairs_query, params, date, check_prerequisites=True):
+        """
+        Create enrollments for many (student, subject) pairs in one statement.
+
+        This is the set-based equivalent of create(): enrollment numbers,
+        university, department and professor are computed in SQL. Pairs whose
+        student and subject belong to different universities, and pairs already
+        enrolled in the same year, are skipped through an index-backed anti-join.
+        Pairs whose student has not passed every prerequisite of the subject
+        are skipped as well, in the same statement.
+
+        Args:
+            pairs_query (str): SQL query returning (student_id, subject_id) rows
+            params (dict): Parameters of pairs_query
+            date (date): Enrollment date
+            check_prerequisites (bool): Skip the students missing prerequisites
+
+        Returns:
+            list: Ids of the created enrollments
+        """
+        self.env.flush_all()
+        date = fields.Date.to_date(date)
+        professors = self.env['university.subject']._fields['professor_ids']
+        self.env.cr.execute(f"""
+            WITH pairs AS ({pairs_query}),
+            candidates AS (
+                SELECT DISTINCT p.student_id, p.subject_id
+                  FROM pairs p
+                  JOIN university_student st ON st.id = p.student_id
+                  JOIN university_subject sub ON sub.id = p.subject_id
+                 WHERE st.university_id = sub.university_id
+                   AND NOT EXISTS (
+                        SELECT 1 FROM university_enrollment e
+                         WHERE e.student_id = p.student_id
+                           AND e.subject_id = p.subject_id
+                           AND e.date BETWEEN %(year_start)s AND %(year_end)s
+                   )
+                   AND (NOT %(check_prerequisites)s OR NOT EXISTS (
+                        {missing_prerequisites_query('p.student_id', 'p.subject_id')}
+                   ))
+            ),
+            numbered AS (
+                SELECT c.student_id, c.subject_id,
+                       ROW_NUMBER() OVER (PARTITION BY c.subject_id ORDER BY c.student_id) AS rn
+                  FROM candidates c
+            ),
+            existing AS (
+                SELECT e.subject_id, COUNT(*) AS total
+                  FROM university_enrollment e
+                 WHERE e.subject_id IN (SELECT subject_id FROM candidates)
+                   AND e.date BETWEEN %(year_start)s AND %(year_end)s
+              GROUP BY e.subject_id
+            )
+            INSERT INTO university_enrollment
+                (name, student_id, subject_id, university_id, department_id, professor_id,
+                 date, term_id, create_uid, create_date, write_uid, write_date)
+            SELECT UPPER(LEFT(sub.name, 3)) || '/' || %(year)s || '/'
+                       || LPAD(seq.num, GREATEST(4, LENGTH(seq.num)), '0'),
+                   n.student_id, n.subject_id, st.university_id, sub.department_id,
+                   (SELECT MIN(rel."{professors.column2}") FROM "{professors.relation}" rel
+                     WHERE rel."{professors.column1}" = n.subject_id),
+                   %(date)s, %(term_id)s, %(uid)s, NOW() AT TIME ZONE 'UTC', %(uid)s, NOW() AT TIME ZONE 'UTC'
+              FROM numbered n
+              JOIN university_student st ON st.id = n.student_id
+              JOIN university_subject sub ON sub.id = n.subject_id
+              LEFT JOIN existing ex ON ex.subject_id = n.subject_id
+             CROSS JOIN LATERAL (SELECT (COALESCE(ex.total, 0) + n.rn)::text AS num) seq
+            RETURNING id
+        """, {
+            **params,
+            'date': date,
+            'term_id': self.env['university.term']._find_term(date).id or None,
+            'check_prerequisites': check_prerequisites,
+            'year': str(date.year),
+            'year_start': date.replace(month=1, day=1),
+            'year_end': date.replace(month=12, day=31),
+            'uid': self.env.uid,
+        })
+        enrollment_ids = [row[0] for row in self.env.cr.fetchall()]
+        metrics.inc_on_commit(self.env.cr, 'universidad_enrollments_created_total', len(enrollment_ids))
+        # Rows were inserted in SQL: related caches are outdated
+        self.env.invalidate_all()
+        return enrollment_ids
+
@@ -7,6 +7,12 @@ operations in the university management system.
 
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
+from odoo.tools import sql
+
+from .. import metrics
+
+# Fields shown in the portal, pushed to the students when they change
+PUBLISHED_FIELDS = {'grade', 'date', 'enrollment_id', 'student_id'}
 
 # Definition of the UniversityGrade model
 class UniversityGrade(models.Model):
@@ -49,16 +55,40 @@ class UniversityGrade(models.Model):
         string='Subject',      # Etiqueta en la UI
         related='enrollment_id.subject_id',  # Relacionado con la asignatura del enrollment
         store=True,           # Almacenar en base de datos
+        index=True,           # Rankings and policies rebuilt per subject
         readonly=True,        # Solo lectura ya que viene del enrollment
         help="Subject associated with this grade"  # Texto de ayuda
     )
 
+    term_id = fields.Many2one(
+        'university.term',  # Related model: term
+        string='Term',  # Label shown in the UI
+        related='enrollment_id.term_id',  # Fetched from enrollment
+        store=True,  # Store in database
+        index=True,  # Term-scoped queries
+        help="Academic term of the graded enrollment"  # Tooltip help text
+    )
+
+    in_current_term = fields.Boolean(
+        string='In Current Term',
+        compute='_compute_in_current_term',
+        search='_search_in_current_term',
+        help="Belongs to the current term; searched on its literal id, served by the partial indexes"
+    )
+
     grade = fields.Float(
         string='Grade',  # Label shown in the UI
         required=True,  # Field is mandatory
         help="Numerical value of the grade (0-10)"  # Tooltip help text
     )
 
+    adjusted_grade = fields.Float(
+        string='Adjusted Grade',  # Label shown in the UI
+        readonly=True,  # Written by the grade adjustment policies
+        aggregator='avg',  # Averaged when grouped
+        help="Grade after the adjustment policy of the subject"  # Tooltip help text
+    )
+
     date = fields.Date(
         string='Date',  # Label shown in the UI
         default=fields.Date.today,  # Default to today's date
@@ -68,6 +98,27 @@ class UniversityGrade(models.Model):
 
     display_name = fields.Char(compute='_compute_display_name', store=True)
 
+    def init(self):
+        """
+        Create the index on passed grades used by the prerequisite checks.
+        """
+        sql.create_index(
+            self.env.cr, 'university_grade_passed_student_subject_idx',
+            self._table, ['student_id', 'subject_id'], where='grade >= 5.0',
+        )
+
+    @api.depends('term_id')
+    def _compute_in_current_term(self):
+        current_id = self.env['university.term']._get_current_id()
+        for record in self:
+            record.in_current_term = bool(current_id) and record.term_id.id == current_id
+
+    def _search_in_current_term(self, operator, value):
+        if operator not in ('=', '!='):
+            raise NotImplementedError(_('Operation not supported'))
+        current_id = self.env['university.term']._get_current_id()
+        return [('term_id', '=' if (operator == '=') == bool(value) else '!=', current_id or False)]
+
     @api.onchange('student_id')  # Triggered when the student field changes
     def _onchange_student(self):
         """
@@ -102,6 +153,177 @@ class UniversityGrade(models.Model):
                     'You can only assign grades to enrollments of the selected student.'  # Error message shown to user
                 ))
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        """
+        Create grades and log their initial value in the grade history.
+
+        Args:
+            vals_list (list): Values for creating the grade records
+
+        Returns:
+            recordset: Newly created grade records
+        """
+        grades = super().create(vals_list)
+        self.env['university.grade.history'].sudo()._log_changes([
+            (grade.id, grade.student_id.id, grade.subject_id.id, None, grade.grade)
+            for grade in grades
+        ])
+        grades._queue_grade_changes()
+        metrics.inc_on_commit(self.env.cr, 'universidad_grade_writes_total', len(grades), operation='create')
+        return grades
+
+    def write(self, vals):
+        """
+        Update grades and log the changed values in the grade history.
+
+        The previous values are collected before the update and all the
+        changes are appended to the history in a single insert.
+
+        Args:
+            vals (dict): Values to update
+
+        Returns:
+            bool: Result of the write operation
+        """
+        if 'student_id' in vals:
+            self._queue_grade_removal()
+        if PUBLISHED_FIELDS.intersection(vals):
+            self._queue_grade_changes()
+        if 'grade' not in vals:
+            return super().write(vals)
+
+        old_values = {grade.id: grade.grade for grade in self}
+        result = super().write(vals)
+        changes = [
+            (grade.id, grade.student_id.id, grade.subject_id.id, old_values[grade.id], grade.grade)
+            for grade in self
+            if grade.grade != old_values[grade.id]
+        ]
+        self.env['university.grade.history'].sudo()._log_changes(changes)
+        metrics.inc_on_commit(self.env.cr, 'universidad_grade_writes_total', len(changes), operation='write')
+        return result
+
+    def unlink(self):
+        """
+        Delete grades and tell the owning students to remove them.
+
+        Returns:
+            bool: Result of the unlink operation
+        """
+        self._queue_grade_removal()
+        return super().unlink()
+
+    def _queue_grade_changes(self):
+        """
+        Remember the grades changed in the current transaction.
+
+        Changes are accumulated until the transaction is about to commit, so
+        that publishing the grades of a whole subject sends one notification
+        per student instead of one per write.
+        """
+        if not self:
+            return
+        self.env.cr.precommit.data.setdefault('universidad.grade.changed', set()).update(self.ids)
+        # Asignaturas antes del cambio: sus rankings también se recalculan
+        self.env.cr.precommit.data.setdefault('universidad.grade.subjects', set()).update(
+            self.sudo().subject_id.ids)
+        self._register_grade_hook()
+
+    def _queue_grade_removal(self):
+        """
+        Remember the grades leaving the portal of their current student.
+        """
+        removed = self.env.cr.precommit.data.setdefault('universidad.grade.removed', {})
+        self.env.cr.precommit.data.setdefault('universidad.grade.students', set()).update(
+            self.sudo().student_id.ids)
+        self.env.cr.precommit.data.setdefault('universidad.grade.subjects', set()).update(
+            self.sudo().subject_id.ids)
+        for grade in self.sudo():
+            partner = grade.student_id.user_id.partner_id
+            if partner:
+                removed.setdefault(partner.id, []).append(grade.id)
+        if self:
+            self._register_grade_hook()
+
+    def _register_grade_hook(self):
+        """Register the pre-commit hook once per transaction."""
+        data = self.env.cr.precommit.data
+        if not data.get('universidad.grade.hooked'):
+            data['universidad.grade.hooked'] = True
+            self.env.cr.precommit.add(self._flush_grade_changes)
+
+    def _flush_grade_changes(self):
+        """
+        Process the grades changed in the transaction, right before commit.
+
+        The grades are pushed to the portal; the adjusted grades, the degree
+        audits and the rankings are queued for the refresh cron.
+        """
+        data = self.env.cr.precommit.data
+        data.pop('universidad.grade.hooked', None)
+        changed = self.env['university.grade'].sudo().browse(
+            data.pop('universidad.grade.changed', set())
+        ).exists()
+        removed = data.pop('universidad.grade.removed', {})
+        students = changed.student_id | self.env['university.student'].browse(
+            data.pop('universidad.grade.students', set())).exists()
+        subjects = changed.subject_id | self.env['university.subject'].browse(
+            data.pop('universidad.grade.subjects', set())).exists()
+        self.env['university.grade'].sudo()._publish_to_students(changed, removed)
+        Queue = self.env['university.refresh.queue'].sudo()
+        Queue._enqueue('grade_policy', subjects.ids)
+        Queue._enqueue('degree_audit', students.ids)
+        self.env['university.grade.ranking'].sudo()._queue_refresh(subjects)
+
+    @api.model
+    def _publish_to_students(self, grades, removed=None):
+        """
+        Push changed grades to the portal of their students over the bus.
+
+        Grades are grouped by the partner of the student's user so that every
+        student receives a single notification with all their changes.
+
+        Args:
+            grades (recordset): Created or modified grades
+            removed (dict): Deleted grade ids by partner id
+        """
+        payloads = {}
+        for grade in grades:
+            partner = grade.student_id.user_id.partner_id
+            if partner:
+                payloads.setdefault(partner, {'grades': [], 'removed': []})['grades'].append(
+                    grade._get_portal_payload()
+                )
+        for partner_id, grade_ids in (removed or {}).items():
+            partner = self.env['res.partner'].browse(partner_id)
+            payloads.setdefault(partner, {'grades': [], 'removed': []})['removed'].extend(grade_ids)
+        if payloads:
+            self.env['bus.bus']._sendmany([
+                (partner, 'universidad.grade/updated', payload)
+                for partner, payload in payloads.items()
+            ])
+
+    def _get_portal_payload(self):
+        """
+        Get the values shown for a grade in the portal grades table.
+
+        Returns:
+            dict: Grade values for the portal page
+        """
+        self.ensure_one()
+        enrollment = self.enrollment_id
+        return {
+            'id': self.id,
+            'university_id': enrollment.university_id.id,
+            'term_id': enrollment.term_id.id,
+            'subject': enrollment.subject_id.name or '',
+            'professor': enrollment.professor_id.name or '',
+            'university': enrollment.university_id.name or '',
+            'date': enrollment.date.strftime('%d/%m/%Y') if enrollment.date else '',
+            'grade': self.grade,
+        }
+
     @api.depends('subject_id', 'grade')
     def _compute_display_name(self):
         for record in self:
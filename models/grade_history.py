@@ -0,0 +1,154 @@
+"""
+Module for the grade change history.
+
+This module implements the UniversityGradeHistory model, a compact append-only
+log of every value a grade has had. Rows are inserted in bulk by
+``university.grade`` and are never updated nor deleted.
+"""
+
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+from odoo.tools import SQL, sql
+
+class UniversityGradeHistory(models.Model):
+    """
+    University Grade History Model.
+
+    This class represents one change of a grade value. It has no access log
+    columns and is indexed for the two usual questions: the history of a
+    student and the changes made by a user over a period.
+
+    Attributes:
+        grade_id (Many2one): Grade that changed (empty if later deleted)
+        student_id (Many2one): Student who owns the grade
+        subject_id (Many2one): Subject of the grade
+        old_grade (Float): Value before the change (empty on creation)
+        new_grade (Float): Value after the change
+        user_id (Many2one): User who made the change
+        change_date (Datetime): When the change was made
+    """
+    _name = 'university.grade.history'
+    _description = 'University Grade History'
+    _order = 'change_date desc, id desc'
+    _log_access = False  # Append-only log, no create/write metadata columns
+
+    grade_id = fields.Many2one(
+        'university.grade',
+        string='Grade',
+        ondelete='set null',
+        readonly=True,
+        help="Grade that was created or modified"
+    )
+
+    student_id = fields.Many2one(
+        'university.student',
+        string='Student',
+        ondelete='cascade',
+        readonly=True,
+        help="Student who owns the grade"
+    )
+
+    subject_id = fields.Many2one(
+        'university.subject',
+        string='Subject',
+        ondelete='set null',
+        readonly=True,
+        help="Subject of the grade"
+    )
+
+    old_grade = fields.Float(
+        string='Old Grade',
+        readonly=True,
+        help="Grade value before the change, empty when the grade was created"
+    )
+
+    new_grade = fields.Float(
+        string='New Grade',
+        readonly=True,
+        help="Grade value after the change"
+    )
+
+    user_id = fields.Many2one(
+        'res.users',
+        string='Changed By',
+        ondelete='set null',
+        readonly=True,
+        help="User who made the change"
+    )
+
+    change_date = fields.Datetime(
+        string='Change Date',
+        readonly=True,
+        help="Date and time of the change"
+    )
+
+    def init(self):
+        """
+        Create the indexes used by the per-student and per-user queries.
+        """
+        sql.create_index(
+            self.env.cr, 'university_grade_history_student_date_idx',
+            self._table, ['student_id', 'change_date DESC'],
+        )
+        sql.create_index(
+            self.env.cr, 'university_grade_history_user_date_idx',
+            self._table, ['user_id', 'change_date DESC'],
+        )
+
+    @api.model
+    def _log_changes(self, changes):
+        """
+        Append grade changes to the history in a single statement.
+
+        Args:
+            changes (list): Tuples of (grade_id, student_id, subject_id,
+                old_grade, new_grade)
+        """
+        if not changes:
+            return
+        columns = list(zip(*changes))
+        self.env.cr.execute(SQL("""
+            INSERT INTO %s
+                (grade_id, student_id, subject_id, old_grade, new_grade, user_id, change_date)
+            SELECT grade_id, student_id, subject_id, old_grade, new_grade, %s, %s
+              FROM unnest(%s::int[], %s::int[], %s::int[], %s::float8[], %s::float8[])
+                   AS changes(grade_id, student_id, subject_id, old_grade, new_grade)
+        """, SQL.identifier(self._table), self.env.uid, fields.Datetime.now(),
+            *map(list, columns)))
+
+    @api.model
+    def _get_student_history(self, student, limit=None):
+        """
+        Get the grade history of a student, most recent first.
+
+        Args:
+            student (record): university.student record
+            limit (int): Maximum number of rows
+
+        Returns:
+            recordset: History rows of the student
+        """
+        return self.search([('student_id', '=', student.id)], limit=limit)
+
+    @api.model
+    def _get_user_changes(self, user, date_from):
+        """
+        Get the grade changes made by a user since a given date.
+
+        Args:
+            user (record): res.users record, e.g. the professor's user
+            date_from (datetime): Start of the period
+
+        Returns:
+            recordset: History rows made by the user
+        """
+        return self.search([
+            ('user_id', '=', user.id),
+            ('change_date', '>=', date_from),
+        ])
+
+    def write(self, vals):
+        raise UserError(_('The grade history cannot be modified.'))
+
+    def unlink(self):
+        raise UserError(_('The grade history cannot be deleted.'))
@@ -0,0 +1,216 @@
+"""
+Module for the grade adjustment policies.
+
+This module implements the UniversityGradePolicy model, the curve applied to
+the grades of a subject to obtain their adjusted value: a linear scale, a cap,
+a shift to a target mean or a z-score curve. The adjusted grades are stored on
+university.grade and computed for every grade of a subject in one statement,
+so the reports read them instead of evaluating the curve on each query.
+Grade changes queue their subjects, adjusted by the refresh cron.
+"""
+
+from odoo import models, fields, api, _
+from odoo.exceptions import ValidationError
+
+POLICY_TYPES = [
+    ('linear', 'Linear Scale'),
+    ('cap', 'Cap'),
+    ('normalize', 'Normalize to Mean'),
+    ('zscore', 'Z-Score Curve'),
+]
+
+class UniversityGradePolicy(models.Model):
+    """
+    University Grade Policy Model.
+
+    The policy of a subject is the first active policy of the subject, else
+    of its department, else the first one without subject nor department.
+    Grades of subjects without policy are not adjusted.
+
+    Attributes:
+        name (Char): Policy name
+        sequence (Integer): Priority among policies of the same level
+        active (Boolean): Whether the policy is applied
+        policy_type (Selection): Curve applied to the grades
+        subject_id (Many2one): Subject the policy applies to
+        department_id (Many2one): Department whose subjects the policy applies to
+        factor (Float): Multiplier of the linear scale
+        offset (Float): Points added by the linear scale
+        max_grade (Float): Cap, and upper limit when clamping
+        target_mean (Float): Mean of the normalized and curved grades
+        target_std (Float): Standard deviation of the curved grades
+        clamp (Boolean): Keep the adjusted grades between 0 and the maximum
+    """
+    _name = 'university.grade.policy'
+    _description = 'University Grade Adjustment Policy'
+    _order = 'sequence, id'
+
+    name = fields.Char(string='Name', required=True)
+    sequence = fields.Integer(string='Sequence', default=10)
+    active = fields.Boolean(string='Active', default=True)
+    policy_type = fields.Selection(
+        POLICY_TYPES,
+        string='Type',
+        required=True,
+        default='linear'
+    )
+    subject_id = fields.Many2one(
+        'university.subject',
+        string='Subject',
+        ondelete='cascade',
+        index=True,
+        help="Subject whose grades are adjusted"
+    )
+    department_id = fields.Many2one(
+        'university.department',
+        string='Department',
+        ondelete='cascade',
+        index=True,
+        help="Department whose subjects are adjusted, unless they have a policy of their own"
+    )
+    factor = fields.Float(string='Factor', default=1.0, help="Linear scale: grades are multiplied by this factor")
+    offset = fields.Float(string='Offset', help="Linear scale: points added after the factor")
+    max_grade = fields.Float(string='Maximum Grade', default=10.0, help="Cap: grades above this value are lowered to it")
+    target_mean = fields.Float(
+        string='Target Mean',
+        default=6.0,
+        help="Normalize and z-score: mean of the adjusted grades of the subject"
+    )
+    target_std = fields.Float(
+        string='Target Deviation',
+        default=1.5,
+        help="Z-score: standard deviation of the adjusted grades of the subject"
+    )
+    clamp = fields.Boolean(
+        string='Clamp',
+        help="Keep the adjusted grades between 0 and the maximum grade"
+    )
+
+    def init(self):
+        """
+        Adjust the grades stored before the adjusted value existed.
+        """
+        self.env.cr.execute("SELECT 1 FROM university_grade WHERE adjusted_grade IS NULL LIMIT 1")
+        if self.env.cr.fetchone():
+            self._apply()
+
+    @api.constrains('subject_id', 'department_id')
+    def _check_scope(self):
+        """
+        Validates that a policy targets a subject or a department, not both.
+
+        Raises:
+            ValidationError: If both a subject and a department are set.
+        """
+        for policy in self:
+            if policy.subject_id and policy.department_id:
+                raise ValidationError(_('A policy applies to a subject or to a department, not both.'))
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        policies = super().create(vals_list)
+        self._apply(policies._get_affected_subjects())
+        return policies
+
+    def write(self, vals):
+        before = self._get_affected_subjects()
+        result = super().write(vals)
+        after = self._get_affected_subjects()
+        self._apply(None if before is None or after is None else before | after)
+        return result
+
+    def unlink(self):
+        subjects = self._get_affected_subjects()
+        result = super().unlink()
+        self._apply(subjects)
+        return result
+
+    @api.model
+    def _apply_queued(self, subject_ids):
+        self._apply(self.env['university.subject'].browse(subject_ids).exists())
+
+    def _get_affected_subjects(self):
+        """
+        Get the subjects whose adjusted grades depend on the policies.
+
+        Returns:
+            recordset: Subjects, or None if a default policy is involved
+        """
+        policies = self.with_context(active_test=False)
+        if any(not policy.subject_id and not policy.department_id for policy in policies):
+            return None
+        return policies.subject_id | self.env['university.subject'].sudo().search([
+            ('department_id', 'in', policies.department_id.ids)])
+
+    @api.model
+    def _apply(self, subjects=None):
+        """
+        Store the adjusted grades of the subjects.
+
+        The mean and deviation of each subject come from window functions
+        over its grades, so every grade of the subjects is adjusted by the
+        same UPDATE. Grades whose adjusted value did not change are not
+        rewritten.
+
+        Args:
+            subjects (recordset): Subjects to adjust, None for all
+        """
+        if subjects is not None and not subjects:
+            return
+        self.env.flush_all()
+        self.env.cr.execute("""
+            WITH policy AS (
+                SELECT sub.id AS subject_id, p.policy_type, p.factor, p."offset", p.max_grade,
+                       p.target_mean, p.target_std, p.clamp
+                  FROM university_subject sub
+                  CROSS JOIN LATERAL (
+                        SELECT *
+                          FROM university_grade_policy p
+                         WHERE p.active
+                           AND (p.subject_id = sub.id
+                                OR (p.subject_id IS NULL AND p.department_id = sub.department_id)
+                                OR (p.subject_id IS NULL AND p.department_id IS NULL))
+                      ORDER BY p.subject_id IS NULL, p.department_id IS NULL, p.sequence, p.id
+                         LIMIT 1
+                  ) p
+                 WHERE %(all)s OR sub.id = ANY(%(subject_ids)s)
+            ),
+            stats AS (
+                SELECT g.id, g.subject_id, g.grade,
+                       AVG(g.grade) OVER subject AS mean,
+                       STDDEV_POP(g.grade) OVER subject AS std
+                  FROM university_grade g
+                 WHERE %(all)s OR g.subject_id = ANY(%(subject_ids)s)
+                WINDOW subject AS (PARTITION BY g.subject_id)
+            ),
+            adjusted AS (
+                SELECT s.id, p.clamp, p.max_grade,
+                       CASE p.policy_type
+                            WHEN 'linear' THEN s.grade * p.factor + p."offset"
+                            WHEN 'cap' THEN LEAST(s.grade, p.max_grade)
+                            WHEN 'normalize' THEN s.grade + p.target_mean - s.mean
+                            WHEN 'zscore' THEN p.target_mean
+                                 + p.target_std * COALESCE((s.grade - s.mean) / NULLIF(s.std, 0), 0)
+                       END AS value,
+                       s.grade
+                  FROM stats s
+                  LEFT JOIN policy p ON p.subject_id = s.subject_id
+            ),
+            final AS (
+                SELECT id,
+                       ROUND(CASE WHEN clamp THEN GREATEST(0, LEAST(max_grade, COALESCE(value, grade)))
+                                  ELSE COALESCE(value, grade)
+                             END::numeric, 2) AS value
+                  FROM adjusted
+            )
+            UPDATE university_grade g
+               SET adjusted_grade = f.value
+              FROM final f
+             WHERE f.id = g.id
+               AND g.adjusted_grade IS DISTINCT FROM f.value
+        """, {
+            'all': subjects is None,
+            'subject_ids': subjects.ids if subjects is not None else [],
+        })
+        # Adjusted grades were written in SQL
+        self.env['university.grade'].invalidate_model(['adjusted_grade'])
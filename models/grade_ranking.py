@@ -0,0 +1,233 @@
+"""
+Module for the student rankings.
+
+This module implements the UniversityGradeRanking model, a stored table with
+the rank and percentile of every student within a subject, a department and
+a university, by average grade. Ranks are computed in SQL with window
+functions. The cohorts of the subjects whose grades changed are queued and
+rebuilt by a cron (see ``university.refresh.queue``), one statement per
+scope reading only the grades of the queued cohorts.
+"""
+
+from odoo import models, fields, api
+from odoo.tools import sql
+
+SCOPES = [
+    ('subject', 'Subject'),
+    ('department', 'Department'),
+    ('university', 'University'),
+]
+
+# scope -> (ranking column of the cohort, grade filter, (subject, department, university) of the cohort)
+COHORTS = {
+    'subject': ('subject_id', 'g.subject_id', ('sub.id', 'sub.department_id', 'sub.university_id')),
+    'department': ('department_id', 'sub.department_id', ('NULL::int', 'sub.department_id', 'sub.university_id')),
+    'university': ('university_id', 'sub.university_id', ('NULL::int', 'NULL::int', 'sub.university_id')),
+}
+
+class UniversityGradeRanking(models.Model):
+    """
+    University Grade Ranking Model.
+
+    This class represents the position of a student in a cohort: the students
+    graded in the same subject, department or university.
+
+    Attributes:
+        scope (Selection): Subject, department or university cohort
+        subject_id (Many2one): Subject of the cohort (subject scope)
+        department_id (Many2one): Department of the cohort
+        university_id (Many2one): University of the cohort
+        student_id (Many2one): Ranked student
+        average_grade (Float): Average grade of the student in the cohort
+        grade_count (Integer): Number of grades averaged
+        rank (Integer): Position in the cohort, 1 for the best average
+        cohort_size (Integer): Number of students in the cohort
+        percentile (Float): Percentage of the cohort ranked at or below the student
+    """
+    _name = 'university.grade.ranking'
+    _description = 'University Student Ranking'
+    _order = 'scope, rank, student_id'
+
+    scope = fields.Selection(SCOPES, string='Scope', required=True, readonly=True)
+    subject_id = fields.Many2one(
+        'university.subject',
+        string='Subject',
+        ondelete='cascade',
+        readonly=True
+    )
+    department_id = fields.Many2one(
+        'university.department',
+        string='Department',
+        ondelete='cascade',
+        readonly=True
+    )
+    university_id = fields.Many2one(
+        'university.university',
+        string='University',
+        ondelete='cascade',
+        readonly=True
+    )
+    student_id = fields.Many2one(
+        'university.student',
+        string='Student',
+        required=True,
+        ondelete='cascade',
+        readonly=True
+    )
+    average_grade = fields.Float(string='Average Grade', readonly=True, aggregator='avg')
+    grade_count = fields.Integer(string='Number of Grades', readonly=True)
+    rank = fields.Integer(string='Rank', readonly=True, aggregator=False)
+    cohort_size = fields.Integer(string='Cohort Size', readonly=True, aggregator=False)
+    percentile = fields.Float(
+        string='Percentile',
+        readonly=True,
+        aggregator=False,
+        help="Percentage of the cohort with an average at or below the student's"
+    )
+
+    def init(self):
+        """
+        Create the indexes used by the refresh and by the portal, the unique
+        index of the cohort rows, and build the rankings on installation.
+        """
+        self.env.cr.execute(f"""
+            CREATE INDEX IF NOT EXISTS university_grade_ranking_student_idx
+                ON {self._table} (student_id, scope)
+        """)
+        self.env.cr.execute(f"""
+            CREATE INDEX IF NOT EXISTS university_grade_ranking_cohort_idx
+                ON {self._table} (scope, subject_id, department_id, university_id, rank)
+        """)
+        if not sql.index_exists(self.env.cr, 'university_grade_ranking_unique_idx'):
+            # Duplicados de refrescos concurrentes anteriores al índice
+            self.env.cr.execute(f"""
+                DELETE FROM {self._table} r
+                 USING {self._table} other
+                 WHERE other.scope = r.scope AND other.student_id = r.student_id
+                   AND other.subject_id IS NOT DISTINCT FROM r.subject_id
+                   AND other.department_id IS NOT DISTINCT FROM r.department_id
+                   AND other.university_id IS NOT DISTINCT FROM r.university_id
+                   AND other.id < r.id
+            """)
+            self.env.cr.execute(f"""
+                CREATE UNIQUE INDEX university_grade_ranking_unique_idx
+                    ON {self._table} (scope, COALESCE(subject_id, 0), COALESCE(department_id, 0),
+                                      COALESCE(university_id, 0), student_id)
+            """)
+        self.env.cr.execute(f"SELECT 1 FROM {self._table} LIMIT 1")
+        if not self.env.cr.fetchone():
+            self._refresh()
+
+    @api.model
+    def _refresh(self, subjects=None, departments=None, universities=None):
+        """
+        Recompute the rankings of some cohorts.
+
+        Each scope is only rebuilt for the records given for it, with one
+        statement per scope reading the grades of those cohorts only. Grade
+        changes queue their cohorts for the refresh cron, so concurrent grade
+        entries never rebuild the same rows.
+
+        Args:
+            subjects (recordset): Subjects whose cohorts are rebuilt
+            departments (recordset): Departments whose cohorts are rebuilt
+            universities (recordset): Universities whose cohorts are rebuilt
+
+        If no argument is given, every ranking is rebuilt.
+        """
+        given = {'subject': subjects, 'department': departments, 'university': universities}
+        if all(records is None for records in given.values()):
+            scopes = {scope: None for scope in COHORTS}
+        else:
+            scopes = {scope: records.ids for scope, records in given.items() if records}
+        if not scopes:
+            return
+        self.env.flush_all()
+        for scope, ids in scopes.items():
+            self._rebuild(scope, ids)
+        # Rows were replaced in SQL
+        self.env.invalidate_all()
+
+    @api.model
+    def _rebuild(self, scope, ids=None):
+        """
+        Replace the rankings of the cohorts of a scope.
+
+        Args:
+            scope (str): Key of COHORTS
+            ids (list): Ids of the cohort records, None for all of them
+        """
+        column, grade_filter, (subject_expr, department_expr, university_expr) = COHORTS[scope]
+        cr = self.env.cr
+        params = {'scope': scope, 'ids': ids, 'uid': self.env.uid}
+        cr.execute(f"""
+            DELETE FROM {self._table}
+             WHERE scope = %(scope)s {f"AND {column} = ANY(%(ids)s)" if ids is not None else ""}
+        """, params)
+        cr.execute(f"""
+            WITH averages AS (
+                SELECT {subject_expr} AS subject_id, {department_expr} AS department_id,
+                       {university_expr} AS university_id, g.student_id,
+                       AVG(g.grade) AS average_grade, COUNT(*) AS grade_count
+                  FROM university_grade g
+                  JOIN university_subject sub ON sub.id = g.subject_id
+                 {f"WHERE {grade_filter} = ANY(%(ids)s)" if ids is not None else ""}
+              GROUP BY 1, 2, 3, 4
+            )
+            INSERT INTO {self._table}
+                (scope, subject_id, department_id, university_id, student_id,
+                 average_grade, grade_count, rank, cohort_size, percentile,
+                 create_uid, create_date, write_uid, write_date)
+            SELECT %(scope)s, subject_id, department_id, university_id, student_id,
+                   ROUND(average_grade::numeric, 2), grade_count,
+                   RANK() OVER cohort,
+                   COUNT(*) OVER (PARTITION BY subject_id, department_id, university_id),
+                   ROUND((100 * CUME_DIST() OVER cohort_asc)::numeric, 1),
+                   %(uid)s, NOW() AT TIME ZONE 'UTC', %(uid)s, NOW() AT TIME ZONE 'UTC'
+              FROM averages
+            WINDOW cohort AS (PARTITION BY subject_id, department_id, university_id
+                              ORDER BY average_grade DESC),
+                   cohort_asc AS (PARTITION BY subject_id, department_id, university_id
+                                  ORDER BY average_grade)
+        """, params)
+
+    @api.model
+    def _queue_refresh(self, subjects):
+        """
+        Queue the subject, department and university cohorts of some subjects.
+
+        Args:
+            subjects (recordset): Subjects whose grades changed
+        """
+        subjects = subjects.sudo()
+        Queue = self.env['university.refresh.queue']
+        Queue._enqueue('ranking_subject', subjects.ids)
+        Queue._enqueue('ranking_department', subjects.department_id.ids)
+        Queue._enqueue('ranking_university', subjects.university_id.ids)
+
+    @api.model
+    def _refresh_subjects(self, subject_ids):
+        self._refresh(subjects=self.env['university.subject'].browse(subject_ids).exists())
+
+    @api.model
+    def _refresh_departments(self, department_ids):
+        self._refresh(departments=self.env['university.department'].browse(department_ids).exists())
+
+    @api.model
+    def _refresh_universities(self, university_ids):
+        self._refresh(universities=self.env['university.university'].browse(university_ids).exists())
+
+    @api.model
+    def _get_student_rankings(self, student):
+        """
+        Get the positions of a student in all their cohorts.
+
+        Args:
+            student (record): university.student record
+
+        Returns:
+            recordset: Rankings of the student, broadest cohort first
+        """
+        order = [scope for scope, _label in reversed(SCOPES)]
+        return self.search([('student_id', '=', student.id)]).sorted(
+            lambda ranking: (order.index(ranking.scope), ranking.rank))
@@ -0,0 +1,31 @@
+"""
+Module for timing the reports of the University module.
+
+This module extends ir.actions.report to record the rendering time of the
+module reports in the operational metrics.
+"""
+
+import time
+
+from odoo import models
+
+from .. import metrics
+
+class IrActionsReport(models.Model):
+    """
+    Report action extended with the rendering metrics.
+    """
+    _inherit = 'ir.actions.report'
+
+    def _render(self, report_ref, res_ids, data=None):
+        """
+        Render a report, timing the reports of the module.
+        """
+        report = self._get_report(report_ref)
+        if not report.report_name.startswith('Universidad.'):
+            return super()._render(report_ref, res_ids, data=data)
+        start = time.perf_counter()
+        result = super()._render(report_ref, res_ids, data=data)
+        metrics.observe('universidad_report_render_seconds', time.perf_counter() - start,
+                        report=report.report_name, format=report.report_type)
+        return result
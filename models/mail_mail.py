@@ -0,0 +1,27 @@
+"""
+Module for counting the mails of the University module.
+
+This module extends mail.mail to count, in the operational metrics, the mails
+of the university records handed to the mail server.
+"""
+
+from odoo import models
+
+from .. import metrics
+
+class MailMail(models.Model):
+    """
+    Outgoing mail extended with the sending metrics.
+    """
+    _inherit = 'mail.mail'
+
+    def _postprocess_sent_message(self, success_pids, success_emails=None, failure_reason=False, failure_type=None):
+        """
+        Count the mails of the university records by result, before the
+        sent mails are deleted.
+        """
+        for mail in self:
+            if (mail.model or '').startswith('university.'):
+                metrics.inc('universidad_mail_sent_total', state='exception' if failure_type else 'sent')
+        return super()._postprocess_sent_message(
+            success_pids, success_emails=success_emails, failure_reason=failure_reason, failure_type=failure_type)
@@ -8,6 +8,7 @@ assignments, and email communications.
 
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
+from odoo.tools import sql
 
 # Definition of the UniversityProfessor model
 class UniversityProfessor(models.Model):
@@ -92,6 +93,15 @@ class UniversityProfessor(models.Model):
         help="Indicates if the professor is head of any department"  
     )
 
+    def init(self):
+        """
+        Create the prefix index of the website autocomplete.
+        """
+        sql.create_index(
+            self.env.cr, 'university_professor_name_prefix_idx',
+            self._table, ['lower(name) text_pattern_ops'],
+        )
+
     @api.depends('enrollment_ids')  # Trigger when enrollment_ids change
     def _compute_enrollment_count(self):
         """
@@ -100,8 +110,10 @@ class UniversityProfessor(models.Model):
         This method calculates the number of enrollments linked to 
         the professor and updates enrollment_count.
         """
+        counts = dict(self.env['university.enrollment']._read_group(
+            [('professor_id', 'in', self._origin.ids)], ['professor_id'], ['__count']))
         for professor in self:
-            professor.enrollment_count = len(professor.enrollment_ids)  # Count linked enrollments
+            professor.enrollment_count = counts.get(professor._origin, 0)  # Count linked enrollments
 
     @api.depends('department_id', 'department_id.head_id')  # Trigger when department or head changes
     def _compute_is_department_head(self):
@@ -111,12 +123,12 @@ class UniversityProfessor(models.Model):
         Checks if this professor is assigned as head of any department
         and updates is_department_head accordingly.
         """
+        heads = {
+            head for [head] in self.env['university.department']._read_group(
+                [('head_id', 'in', self.ids)], ['head_id'])  # Departments headed by these professors
+        }
         for professor in self:
-            professor.is_department_head = bool(
-                self.env['university.department'].search_count([
-                    ('head_id', '=', professor.id)  # Search for departments where this professor is head
-                ])
-            )
+            professor.is_department_head = professor in heads
 
     def action_view_enrollments(self):
         """
@@ -209,7 +221,13 @@ class UniversityProfessor(models.Model):
                 'email': vals['professor_email']  # Update email
             })
 
-        return super().write(vals)  # Call the parent write method
+        # Changing the subjects of a professor changes the professor of
+        # their enrollments: large updates are deferred to background jobs
+        Job = self.env['university.recompute.job']
+        before = Job._snapshot_to_compute()
+        result = super().write(vals)  # Call the parent write method
+        Job._defer_recomputes(before, self)
+        return result
 
     def action_send_welcome_email(self):
         """
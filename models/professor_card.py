@@ -0,0 +1,97 @@
+"""
+Module for the website professor cards read model.
+
+This module implements the UniversityProfessorCard model, a SQL view that
+projects exactly what the professor cards of the website show, so that large
+listings are rendered from a single query without loading professor records,
+their images or their subjects.
+"""
+
+from odoo import models, fields
+
+class UniversityProfessorCard(models.Model):
+    """
+    University Professor Card Model.
+    
+    This class represents a read-only SQL view with one row per professor and
+    the aggregated names of the subjects the professor teaches.
+    
+    Attributes:
+        name (Char): Professor's full name
+        university_id (Many2one): Associated university
+        university_name (Char): Name of the university
+        department_id (Many2one): Academic department
+        department_name (Char): Name of the department
+        subject_count (Integer): Number of subjects taught
+        subject_names (Char): Subject names, one per line
+        has_image (Boolean): Whether the professor has a profile picture
+    """
+    _name = 'university.professor.card'
+    _description = 'University Professor Card'
+    _auto = False  # Indicates this is a SQL view, not a table
+    _order = 'id'
+
+    name = fields.Char(string='Name', readonly=True)
+
+    university_id = fields.Many2one(
+        'university.university',
+        string='University',
+        readonly=True
+    )
+    university_name = fields.Char(string='University Name', readonly=True)
+
+    department_id = fields.Many2one(
+        'university.department',
+        string='Department',
+        readonly=True
+    )
+    department_name = fields.Char(string='Department Name', readonly=True)
+
+    subject_count = fields.Integer(string='Subject Count', readonly=True)
+    subject_names = fields.Char(
+        string='Subjects',
+        readonly=True,
+        help="Names of the subjects taught, one per line"
+    )
+    has_image = fields.Boolean(string='Has Image', readonly=True)
+
+    def init(self):
+        """
+        Initialize the SQL view for the professor cards.
+        
+        The relation table between professors and subjects is taken from the
+        field definition, so the view follows any change of the Many2many.
+        """
+        subject_ids = self.env['university.professor']._fields['subject_ids']
+        self.env.cr.execute("DROP VIEW IF EXISTS university_professor_card CASCADE")
+        self.env.cr.execute(f"""
+            CREATE VIEW university_professor_card AS (
+                SELECT
+                    p.id,
+                    p.name,
+                    p.university_id,
+                    u.name AS university_name,
+                    p.department_id,
+                    d.name AS department_name,
+                    sb.subject_count,
+                    sb.subject_names,
+                    EXISTS (
+                        SELECT 1 FROM ir_attachment a
+                         WHERE a.res_model = 'university.professor'
+                           AND a.res_field = 'image_1920'
+                           AND a.res_id = p.id
+                    ) AS has_image
+                FROM
+                    university_professor p
+                    LEFT JOIN university_university u ON u.id = p.university_id
+                    LEFT JOIN university_department d ON d.id = p.department_id
+                    LEFT JOIN LATERAL (
+                        SELECT
+                            COUNT(sub.id) AS subject_count,
+                            STRING_AGG(sub.name, E'\\n' ORDER BY sub.id) AS subject_names
+                        FROM "{subject_ids.relation}" rel
+                        JOIN university_subject sub ON sub.id = rel."{subject_ids.column2}"
+                        WHERE rel."{subject_ids.column1}" = p.id
+                    ) sb ON TRUE
+            )
+        """)
@@ -0,0 +1,218 @@
+"""
+Module for deferred recomputation of denormalized fields.
+
+This module implements the UniversityRecomputeJob model. Renaming a subject,
+changing its professors or moving a student to another university makes the
+ORM recompute stored fields on every related enrollment and grade inside the
+user's transaction. When the number of rows is large, those recomputations
+are taken out of the transaction and processed by a cron job in committed
+chunks, with progress tracking.
+"""
+
+import json
+import logging
+import time
+
+from odoo import models, fields, api, _
+
+_logger = logging.getLogger(__name__)
+
+# Stored computed/related fields whose recomputation may be deferred
+DEFERRED_FIELDS = {
+    'university.enrollment': ['professor_id', 'university_id', 'department_id'],
+    'university.grade': ['university_id', 'subject_id', 'term_id', 'display_name'],
+}
+
+class UniversityRecomputeJob(models.Model):
+    """
+    University Recompute Job Model.
+
+    This class represents a deferred recomputation of stored fields on a set
+    of records. Jobs are processed in order by a cron, one committed chunk at
+    a time, so interactive edits return immediately.
+
+    Attributes:
+        name (Char): Description of the change that created the job
+        model_name (Char): Model of the records to recompute
+        field_names (Char): Comma separated fields to recompute
+        res_ids (Text): JSON list of the record ids to recompute
+        total_count (Integer): Number of records to recompute
+        done_count (Integer): Number of records already recomputed
+        progress (Float): Percentage done (computed)
+        state (Selection): Pending, running, done or failed
+        subject_ids (Many2many): Subjects whose change created the job
+        student_ids (Many2many): Students whose change created the job
+    """
+    _name = 'university.recompute.job'
+    _description = 'University Deferred Recompute Job'
+    _order = 'id'
+
+    name = fields.Char(string='Description', required=True, readonly=True)
+    model_name = fields.Char(string='Model', required=True, readonly=True)
+    field_names = fields.Char(string='Fields', required=True, readonly=True)
+    res_ids = fields.Text(string='Record IDs', required=True, readonly=True)
+
+    total_count = fields.Integer(string='Records', readonly=True)
+    done_count = fields.Integer(string='Done', readonly=True)
+    progress = fields.Float(
+        string='Progress',
+        compute='_compute_progress',
+        help="Percentage of the records already recomputed"
+    )
+
+    state = fields.Selection([
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ], string='Status', default='pending', required=True, readonly=True, index=True)
+    error = fields.Text(string='Error', readonly=True)
+
+    subject_ids = fields.Many2many(
+        'university.subject',
+        string='Subjects',
+        readonly=True,
+        help="Subjects whose change created this job"
+    )
+    student_ids = fields.Many2many(
+        'university.student',
+        string='Students',
+        readonly=True,
+        help="Students whose change created this job"
+    )
+
+    @api.depends('total_count', 'done_count')
+    def _compute_progress(self):
+        for job in self:
+            job.progress = 100.0 * job.done_count / job.total_count if job.total_count else 100.0
+
+    @api.model
+    def _snapshot_to_compute(self):
+        """
+        Get the records currently marked to recompute for the deferred fields.
+
+        Returns:
+            dict: Record ids by (model name, field name)
+        """
+        snapshot = {}
+        for model_name, field_names in DEFERRED_FIELDS.items():
+            Model = self.env[model_name]
+            for field_name in field_names:
+                field = Model._fields[field_name]
+                snapshot[model_name, field_name] = set(self.env.records_to_compute(field).ids)
+        return snapshot
+
+    @api.model
+    def _defer_recomputes(self, before, sources):
+        """
+        Move the recomputations triggered by a write into background jobs.
+
+        Only the records marked to recompute since ``before`` are considered,
+        and only when they exceed the configured threshold; small changes keep
+        being recomputed synchronously.
+
+        Args:
+            before (dict): Result of _snapshot_to_compute() before the write
+            sources (recordset): Subjects or students that were written
+
+        Returns:
+            recordset: Created jobs
+        """
+        threshold = int(self.env['ir.config_parameter'].sudo().get_param(
+            'Universidad.recompute_defer_threshold', 1000))
+        pending = {}
+        for (model_name, field_name), ids in self._snapshot_to_compute().items():
+            new_ids = ids - before.get((model_name, field_name), set())
+            if new_ids:
+                pending[model_name, field_name] = new_ids
+        if sum(len(ids) for ids in pending.values()) <= threshold:
+            return self.browse()
+
+        by_model = {}
+        for (model_name, field_name), ids in pending.items():
+            Model = self.env[model_name]
+            self.env.remove_to_compute(Model._fields[field_name], Model.browse(ids))
+            model_fields, model_ids = by_model.setdefault(model_name, ([], set()))
+            model_fields.append(field_name)
+            model_ids.update(ids)
+
+        source_values = {}
+        if sources._name == 'university.subject':
+            source_values['subject_ids'] = [(6, 0, sources.ids)]
+        elif sources._name == 'university.student':
+            source_values['student_ids'] = [(6, 0, sources.ids)]
+        jobs = self.sudo().create([{
+            'name': _('%(model)s changed: %(names)s', model=sources._description,
+                      names=', '.join(sources.mapped('display_name'))[:200]),
+            'model_name': model_name,
+            'field_names': ','.join(field_names),
+            'res_ids': json.dumps(sorted(ids)),
+            'total_count': len(ids),
+            **source_values,
+        } for model_name, (field_names, ids) in by_model.items()])
+        self.env.ref('Universidad.ir_cron_process_recompute_jobs')._trigger()
+        return jobs
+
+    @api.model
+    def _is_consistent(self):
+        """
+        Tell whether every deferred recomputation has been applied.
+
+        Returns:
+            bool: True if no job is pending, running or failed
+        """
+        return not self.sudo().search_count([('state', '!=', 'done')], limit=1)
+
+    @api.model
+    def _cron_process_jobs(self, time_budget=240):
+        """
+        Process pending jobs in committed chunks.
+
+        Args:
+            time_budget (int): Seconds after which the cron stops and lets the
+                next run continue
+        """
+        chunk_size = int(self.env['ir.config_parameter'].sudo().get_param(
+            'Universidad.recompute_chunk_size', 1000))
+        deadline = time.monotonic() + time_budget
+        for job in self.search([('state', 'in', ('pending', 'running'))]):
+            while job.done_count < job.total_count:
+                if time.monotonic() > deadline:
+                    self.env.ref('Universidad.ir_cron_process_recompute_jobs')._trigger()
+                    return
+                try:
+                    job._process_chunk(chunk_size)
+                    self.env.cr.commit()
+                except Exception as e:
+                    self.env.cr.rollback()
+                    _logger.exception("Deferred recompute job %s failed", job.id)
+                    job.write({'state': 'failed', 'error': str(e)})
+                    self.env.cr.commit()
+                    break
+            if job.state != 'failed':
+                job.state = 'done'
+                self.env.cr.commit()
+
+    def _process_chunk(self, chunk_size):
+        """
+        Recompute the next chunk of records of the job.
+
+        Args:
+            chunk_size (int): Number of records to recompute
+        """
+        self.ensure_one()
+        ids = json.loads(self.res_ids)[self.done_count:self.done_count + chunk_size]
+        Model = self.env[self.model_name].sudo()
+        records = Model.browse(ids).exists()
+        for field_name in self.field_names.split(','):
+            self.env.add_to_compute(Model._fields[field_name], records)
+        self.env.flush_all()
+        self.write({
+            'state': 'running',
+            'done_count': self.done_count + len(ids),
+        })
+
+    def action_retry(self):
+        """Put failed jobs back in the queue."""
+        self.filtered(lambda job: job.state == 'failed').write({'state': 'pending', 'error': False})
+        self.env.ref('Universidad.ir_cron_process_recompute_jobs')._trigger()
@@ -0,0 +1,116 @@
+"""
+Module for the deferred refreshes of the derived tables.
+
+This module implements the UniversityRefreshQueue model, the ids whose
+derived rows must be rebuilt outside the transaction that changed them.
+Grade entry only appends the ids; a cron claims them, deduplicates them and
+rebuilds each kind in committed batches, so saving a grade never waits for
+the adjusted grades, the degree audits or the rankings.
+"""
+
+import logging
+
+from odoo import models, fields, api
+
+_logger = logging.getLogger(__name__)
+
+# kind -> (label, model, method called with the list of queued ids), in processing order
+KINDS = {
+    'grade_policy': ("Adjusted grades", 'university.grade.policy', '_apply_queued'),
+    'degree_audit': ("Degree audits", 'university.degree.audit', '_refresh_queued'),
+    'ranking_subject': ("Subject rankings", 'university.grade.ranking', '_refresh_subjects'),
+    'ranking_department': ("Department rankings", 'university.grade.ranking', '_refresh_departments'),
+    'ranking_university': ("University rankings", 'university.grade.ranking', '_refresh_universities'),
+}
+
+class UniversityRefreshQueue(models.Model):
+    """
+    University Refresh Queue Model.
+
+    This class represents one record whose derived rows are outdated. The
+    same id may be queued several times by concurrent transactions: there is
+    no unique constraint to wait on, the duplicates are merged when the batch
+    is claimed.
+
+    Attributes:
+        kind (Selection): Derived rows to rebuild
+        res_id (Integer): Id of the record to refresh
+    """
+    _name = 'university.refresh.queue'
+    _description = 'University Derived Table Refresh Queue'
+    _order = 'id'
+    _log_access = False  # Written and consumed in SQL
+
+    kind = fields.Selection(
+        [(kind, label) for kind, (label, _model, _method) in KINDS.items()],
+        string='Kind',
+        required=True,
+        readonly=True
+    )
+    res_id = fields.Integer(string='Record ID', required=True, readonly=True)
+
+    def init(self):
+        """
+        Create the index used to claim the batches of a kind.
+        """
+        self.env.cr.execute(f"""
+            CREATE INDEX IF NOT EXISTS university_refresh_queue_kind_idx
+                ON {self._table} (kind, id)
+        """)
+
+    @api.model
+    def _enqueue(self, kind, ids):
+        """
+        Queue records for a deferred refresh and wake up the cron.
+
+        Args:
+            kind (str): Key of KINDS
+            ids (iterable): Ids of the records to refresh
+        """
+        ids = sorted(set(ids))
+        if not ids:
+            return
+        self.env.cr.execute(f"""
+            INSERT INTO {self._table} (kind, res_id) SELECT %s, unnest(%s::int[])
+        """, [kind, ids])
+        data = self.env.cr.postcommit.data
+        if not data.get('universidad.refresh.triggered'):
+            data['universidad.refresh.triggered'] = True
+            self.env.ref('Universidad.ir_cron_process_refresh_queue').sudo()._trigger()
+            # Puede llamarse desde un pre-commit, después del flush del ORM
+            self.env['ir.cron.trigger'].flush_model()
+
+    @api.model
+    def _claim(self, kind, limit):
+        """
+        Remove a batch of queued ids of a kind, skipping the rows claimed by
+        another worker.
+
+        Returns:
+            list: Distinct ids of the batch
+        """
+        self.env.cr.execute(f"""
+            DELETE FROM {self._table}
+             WHERE id IN (SELECT id FROM {self._table}
+                           WHERE kind = %s ORDER BY id LIMIT %s
+                             FOR UPDATE SKIP LOCKED)
+         RETURNING res_id
+        """, [kind, limit])
+        return sorted({row[0] for row in self.env.cr.fetchall()})
+
+    @api.model
+    def _cron_process(self, batch_size=50):
+        """
+        Rebuild the queued derived rows, one committed batch at a time.
+
+        Args:
+            batch_size (int): Maximum number of queued rows claimed per batch
+        """
+        for kind, (_label, model_name, method) in KINDS.items():
+            while True:
+                ids = self._claim(kind, batch_size)
+                if not ids:
+                    break
+                getattr(self.env[model_name].sudo(), method)(ids)
+                self.env.cr.commit()
+                _logger.debug("Refreshed %s for %s records", kind, len(ids))
@@ -6,7 +6,7 @@ reporting of grades across the university system, including aggregated statistic
 and performance metrics.
 """
 
-from odoo import models, fields
+from odoo import models, fields, api, _
 
 class ReportUniversityGrade(models.Model):
     """
@@ -22,7 +22,9 @@ class ReportUniversityGrade(models.Model):
         department_id (Many2one): Academic department
         student_id (Many2one): Student who received the grades
         subject_id (Many2one): Subject being graded
-        adjusted_grade (Float): Grade after applying adjustment factor
+        term_id (Many2one): Academic term of the grades
+        in_current_term (Boolean): Grades of the current term (searchable)
+        adjusted_grade (Float): Average of the grades adjusted by the subject policy
         total_grade (Float): Sum of all grades
         count_grades (Integer): Total number of grades
         average_grade (Float): Average grade calculation
@@ -66,13 +68,27 @@ class ReportUniversityGrade(models.Model):
         readonly=True,
         help="Subject being graded"
     )
+
+    term_id = fields.Many2one(
+        'university.term',
+        string='Term',
+        readonly=True,
+        help="Academic term of the grades"
+    )
+
+    in_current_term = fields.Boolean(
+        string='In Current Term',
+        compute='_compute_in_current_term',
+        search='_search_in_current_term',
+        help="Belongs to the current term; searched on its literal id, served by the partial indexes"
+    )
     
     # Numerical Fields for Grade Analysis
     adjusted_grade = fields.Float(
         string='Adjusted Grade',
         group_operator="avg",
         readonly=True,
-        help="Grade after applying 10% increase factor"
+        help="Average of the grades after the adjustment policy of their subject"
     )
     
     total_grade = fields.Float(
@@ -95,6 +111,18 @@ class ReportUniversityGrade(models.Model):
         help="Average grade calculation for the grouping"
     )
 
+    @api.depends('term_id')
+    def _compute_in_current_term(self):
+        current_id = self.env['university.term']._get_current_id()
+        for record in self:
+            record.in_current_term = bool(current_id) and record.term_id.id == current_id
+
+    def _search_in_current_term(self, operator, value):
+        if operator not in ('=', '!='):
+            raise NotImplementedError(_('Operation not supported'))
+        current_id = self.env['university.term']._get_current_id()
+        return [('term_id', '=' if (operator == '=') == bool(value) else '!=', current_id or False)]
+
     def init(self):
         """
         Initialize the SQL view for grade reporting.
@@ -116,10 +144,11 @@ class ReportUniversityGrade(models.Model):
                     p.department_id,
                     g.student_id,
                     e.subject_id,
+                    g.term_id,
                     SUM(g.grade) AS total_grade,
                     COUNT(g.id) AS count_grades,
                     ROUND(AVG(g.grade)::numeric, 2) AS average_grade,
-                    ROUND(AVG(g.grade)::numeric * 1.1, 2) AS adjusted_grade
+                    ROUND(AVG(g.adjusted_grade)::numeric, 2) AS adjusted_grade
                 FROM 
                     university_grade g
                     JOIN university_enrollment e ON g.enrollment_id = e.id
@@ -129,6 +158,7 @@ class ReportUniversityGrade(models.Model):
                     e.professor_id,
                     p.department_id,
                     g.student_id,
-                    e.subject_id
+                    e.subject_id,
+                    g.term_id
             )
         """)
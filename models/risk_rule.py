@@ -0,0 +1,91 @@
+"""
+Module for the at-risk early warning rules.
+
+This module implements the UniversityRiskRule model, the configurable
+conditions that flag a student as at risk: failing several subjects in the
+current term, a drop of the term average or a low term average. The rules are
+evaluated by a scheduled job, see UniversityStudentRisk.
+"""
+
+from odoo import models, fields, api, _
+from odoo.exceptions import ValidationError
+
+RULE_TYPES = [
+    ('failed_subjects', 'Failed Subjects in Term'),
+    ('average_drop', 'Average Drop'),
+    ('low_average', 'Low Term Average'),
+]
+
+class UniversityRiskRule(models.Model):
+    """
+    University Risk Rule Model.
+
+    Attributes:
+        name (Char): Rule name
+        sequence (Integer): Display order
+        active (Boolean): Whether the rule is evaluated
+        rule_type (Selection): Condition checked by the rule
+        threshold (Float): Limit of the condition
+        university_id (Many2one): University the rule applies to, empty for all
+    """
+    _name = 'university.risk.rule'
+    _description = 'University At-Risk Rule'
+    _order = 'sequence, id'
+
+    name = fields.Char(string='Name', required=True, translate=True)
+    sequence = fields.Integer(string='Sequence', default=10)
+    active = fields.Boolean(string='Active', default=True)
+    rule_type = fields.Selection(
+        RULE_TYPES,
+        string='Condition',
+        required=True,
+        default='failed_subjects'
+    )
+    threshold = fields.Float(
+        string='Threshold',
+        required=True,
+        default=2.0,
+        help="Failed subjects: flag from this number of subjects failed in the current term.\n"
+             "Average drop: flag when the average falls more than this from the previous term.\n"
+             "Low term average: flag when the current term average is below this."
+    )
+    university_id = fields.Many2one(
+        'university.university',
+        string='University',
+        help="University the rule applies to. Empty for all universities"
+    )
+
+    @api.constrains('threshold')
+    def _check_threshold(self):
+        """
+        Validates that the threshold is not negative.
+
+        Raises:
+            ValidationError: If the threshold is negative.
+        """
+        for rule in self:
+            if rule.threshold < 0:
+                raise ValidationError(_('The threshold of a rule cannot be negative.'))
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        rules = super().create(vals_list)
+        self._trigger_evaluation()
+        return rules
+
+    def write(self, vals):
+        result = super().write(vals)
+        self._trigger_evaluation()
+        return result
+
+    def unlink(self):
+        result = super().unlink()
+        self._trigger_evaluation()
+        return result
+
+    @api.model
+    def _trigger_evaluation(self):
+        """
+        Re-evaluate the flags in background once the rules changed.
+        """
+        self.env.ref('Universidad.ir_cron_compute_risk_flags')._trigger()
@@ -0,0 +1,340 @@
+"""
+Module for the academic-year rollover.
+
+This module implements the UniversityRollover model, which prepares a new
+academic year in bulk: it clones the subject offerings of the previous year,
+copies their professor links and prerequisites, and re-enrolls the students
+who failed them.
+Each step is a single set-based statement committed on its own, so an
+interrupted rollover resumes where it stopped.
+"""
+
+import logging
+from datetime import date
+
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+
+_logger = logging.getLogger(__name__)
+
+# Steps in execution order: key -> label
+STEPS = [
+    ('subjects', 'Clone Subjects'),
+    ('professors', 'Copy Professor Links'),
+    ('prerequisites', 'Copy Prerequisites'),
+    ('reenroll', 'Re-enroll Failed Students'),
+    ('done', 'Done'),
+]
+
+# Grades below this value are failed
+PASS_GRADE = 5.0
+
+class UniversityRollover(models.Model):
+    """
+    University Rollover Model.
+
+    This class represents the rollover of the subject offerings of one
+    academic year into the next one. The cron runs the remaining steps of
+    running rollovers; every step skips the rows it already created.
+
+    Attributes:
+        name (Char): Rollover reference
+        university_id (Many2one): University to roll over, empty for all
+        from_year (Integer): Academic year whose offerings are cloned
+        to_year (Integer): New academic year
+        include_undated (Boolean): Also clone subjects without academic year
+        enrollment_date (Date): Date of the carried forward enrollments
+        state (Selection): Draft, running, done or failed
+        step (Selection): Next step to run
+        progress (Float): Percentage of the steps done (computed)
+        subject_count (Integer): Subjects cloned
+        professor_link_count (Integer): Professor links copied
+        prerequisite_link_count (Integer): Prerequisite links copied
+        reenrollment_count (Integer): Failed students re-enrolled
+    """
+    _name = 'university.rollover'
+    _description = 'University Academic Year Rollover'
+    _order = 'id desc'
+
+    name = fields.Char(string='Reference', compute='_compute_name', store=True)
+    university_id = fields.Many2one(
+        'university.university',
+        string='University',
+        help="University whose subjects are rolled over. Empty for all universities"
+    )
+    from_year = fields.Integer(
+        string='From Year',
+        required=True,
+        default=lambda self: fields.Date.today().year,
+        help="Academic year whose subject offerings are cloned"
+    )
+    to_year = fields.Integer(
+        string='To Year',
+        required=True,
+        default=lambda self: fields.Date.today().year + 1,
+        help="New academic year"
+    )
+    include_undated = fields.Boolean(
+        string='Include Subjects Without Year',
+        default=True,
+        help="Also clone subjects that have no academic year, e.g. created before rollovers were used"
+    )
+    enrollment_date = fields.Date(
+        string='Enrollment Date',
+        compute='_compute_enrollment_date',
+        store=True,
+        readonly=False,
+        required=True,
+        help="Date of the enrollments carried forward for failed subjects"
+    )
+
+    state = fields.Selection([
+        ('draft', 'Draft'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ], string='Status', default='draft', required=True, readonly=True, index=True)
+    step = fields.Selection(
+        [(key, label) for key, label in STEPS],
+        string='Next Step',
+        default=STEPS[0][0],
+        required=True,
+        readonly=True
+    )
+    progress = fields.Float(
+        string='Progress',
+        compute='_compute_progress',
+        help="Percentage of the rollover steps already done"
+    )
+    error = fields.Text(string='Error', readonly=True)
+
+    subject_count = fields.Integer(string='Subjects Cloned', readonly=True)
+    professor_link_count = fields.Integer(string='Professor Links', readonly=True)
+    prerequisite_link_count = fields.Integer(string='Prerequisite Links', readonly=True)
+    reenrollment_count = fields.Integer(string='Re-enrollments', readonly=True)
+
+    _sql_constraints = [
+        ('years_check', 'CHECK(to_year > from_year)', 'The new academic year must follow the rolled over one.'),
+    ]
+
+    @api.depends('from_year', 'to_year', 'university_id')
+    def _compute_name(self):
+        for rollover in self:
+            rollover.name = _('%(from)s → %(to)s %(university)s',
+                              **{'from': rollover.from_year, 'to': rollover.to_year,
+                                 'university': rollover.university_id.name or _('(all)')})
+
+    @api.depends('to_year')
+    def _compute_enrollment_date(self):
+        for rollover in self:
+            if rollover.to_year:
+                rollover.enrollment_date = date(rollover.to_year, 9, 1)
+
+    @api.depends('step')
+    def _compute_progress(self):
+        keys = [key for key, _label in STEPS]
+        for rollover in self:
+            rollover.progress = 100.0 * keys.index(rollover.step) / (len(keys) - 1)
+
+    def _get_params(self):
+        """
+        Get the parameters shared by the step queries.
+
+        Returns:
+            dict: Query parameters
+        """
+        self.ensure_one()
+        return {
+            'from_year': self.from_year,
+            'to_year': self.to_year,
+            'include_undated': self.include_undated,
+            'university_id': self.university_id.id or None,
+            'from_start': date(self.from_year, 1, 1),
+            'from_end': date(self.from_year, 12, 31),
+            'uid': self.env.uid,
+        }
+
+    def _step_subjects(self):
+        """
+        Clone the subject offerings of the previous year.
+
+        Undated subjects keep no year once cloned, so an undated original and
+        last year's clone of it are both candidates: one offering is cloned
+        per lineage, the dated one first, and lineages that already have an
+        offering in the new year are skipped.
+
+        Returns:
+            int: Number of subjects created
+        """
+        self.env.cr.execute("""
+            INSERT INTO university_subject
+                (name, university_id, department_id, credits, academic_year, origin_subject_id, lineage_id,
+                 create_uid, create_date, write_uid, write_date)
+            SELECT DISTINCT ON (COALESCE(s.lineage_id, s.id))
+                   s.name, s.university_id, s.department_id, s.credits, %(to_year)s, s.id,
+                   COALESCE(s.lineage_id, s.id),
+                   %(uid)s, NOW() AT TIME ZONE 'UTC', %(uid)s, NOW() AT TIME ZONE 'UTC'
+              FROM university_subject s
+             WHERE (s.academic_year = %(from_year)s
+                    OR (%(include_undated)s AND s.academic_year IS NULL))
+               AND (%(university_id)s::int IS NULL OR s.university_id = %(university_id)s)
+               AND NOT EXISTS (
+                    SELECT 1 FROM university_subject n
+                     WHERE COALESCE(n.lineage_id, n.id) = COALESCE(s.lineage_id, s.id)
+                       AND n.academic_year = %(to_year)s
+               )
+          ORDER BY COALESCE(s.lineage_id, s.id), s.academic_year IS NULL, s.id DESC
+        """, self._get_params())
+        return self.env.cr.rowcount
+
+    def _step_professors(self):
+        """
+        Copy the professor links of the previous offerings to their clones.
+
+        Returns:
+            int: Number of links created
+        """
+        field = self.env['university.subject']._fields['professor_ids']
+        self.env.cr.execute(f"""
+            INSERT INTO "{field.relation}" ("{field.column1}", "{field.column2}")
+            SELECT n.id, rel."{field.column2}"
+              FROM university_subject n
+              JOIN "{field.relation}" rel ON rel."{field.column1}" = n.origin_subject_id
+             WHERE n.academic_year = %(to_year)s
+               AND (%(university_id)s::int IS NULL OR n.university_id = %(university_id)s)
+            ON CONFLICT DO NOTHING
+        """, self._get_params())
+        return self.env.cr.rowcount
+
+    def _step_prerequisites(self):
+        """
+        Copy the prerequisites of the previous offerings to their clones.
+
+        Prerequisites whose lineage has an offering in the new year are
+        replaced by it; the others are kept as they are.
+
+        Returns:
+            int: Number of links created
+        """
+        field = self.env['university.subject']._fields['prerequisite_ids']
+        self.env.cr.execute(f"""
+            INSERT INTO "{field.relation}" ("{field.column1}", "{field.column2}")
+            SELECT n.id, COALESCE(np.id, rel."{field.column2}")
+              FROM university_subject n
+              JOIN "{field.relation}" rel ON rel."{field.column1}" = n.origin_subject_id
+              JOIN university_subject p ON p.id = rel."{field.column2}"
+              LEFT JOIN university_subject np ON np.lineage_id = COALESCE(p.lineage_id, p.id)
+                                             AND np.academic_year = %(to_year)s
+             WHERE n.academic_year = %(to_year)s
+               AND (%(university_id)s::int IS NULL OR n.university_id = %(university_id)s)
+            ON CONFLICT DO NOTHING
+         RETURNING "{field.column1}"
+        """, self._get_params())
+        rows = self.env.cr.fetchall()
+        subjects = self.env['university.subject'].browse({row[0] for row in rows})
+        self.env['university.subject.prerequisite']._refresh(subjects)
+        return len(rows)
+
+    def _step_reenroll(self):
+        """
+        Enroll the students who failed a subject in its new offering.
+
+        A student failed a subject when every grade of their enrollments in
+        the previous year, in any offering of its lineage, is below the pass
+        grade.
+
+        Returns:
+            int: Number of enrollments created
+        """
+        enrollment_ids = self.env['university.enrollment']._insert_enrollment_pairs("""
+            SELECT e.student_id, n.id AS subject_id
+              FROM university_grade g
+              JOIN university_enrollment e ON e.id = g.enrollment_id
+              JOIN university_subject s ON s.id = e.subject_id
+              JOIN university_subject n ON n.lineage_id = COALESCE(s.lineage_id, s.id)
+                                       AND n.academic_year = %(to_year)s
+             WHERE e.date BETWEEN %(from_start)s AND %(from_end)s
+               AND (%(university_id)s::int IS NULL OR n.university_id = %(university_id)s)
+          GROUP BY e.student_id, n.id
+            HAVING MAX(g.grade) < %(pass_grade)s
+        """, {**self._get_params(), 'pass_grade': PASS_GRADE}, self.enrollment_date,
+            check_prerequisites=False)
+        return len(enrollment_ids)
+
+    def _run_next_step(self):
+        """
+        Run the next step of the rollover and move to the following one.
+        """
+        self.ensure_one()
+        self.env.flush_all()
+        keys = [key for key, _label in STEPS]
+        count = getattr(self, '_step_%s' % self.step)()
+        counter = {
+            'subjects': 'subject_count',
+            'professors': 'professor_link_count',
+            'prerequisites': 'prerequisite_link_count',
+            'reenroll': 'reenrollment_count',
+        }[self.step]
+        next_step = keys[keys.index(self.step) + 1]
+        # Rows were inserted in SQL
+        self.env.invalidate_all()
+        self.write({
+            counter: self[counter] + count,
+            'step': next_step,
+            'state': 'done' if next_step == 'done' else 'running',
+        })
+
+    def action_start(self):
+        """
+        Queue the rollover for the background job.
+
+        Raises:
+            UserError: If another rollover to the same year is running
+        """
+        for rollover in self:
+            if self.search_count([
+                ('id', '!=', rollover.id),
+                ('state', '=', 'running'),
+                ('to_year', '=', rollover.to_year),
+            ], limit=1):
+                raise UserError(_('Another rollover to %s is already running.', rollover.to_year))
+        self.filtered(lambda r: r.state in ('draft', 'failed')).write({'state': 'running', 'error': False})
+        self.env.ref('Universidad.ir_cron_process_rollovers')._trigger()
+
+    def action_view_subjects(self):
+        """
+        Display the subject offerings of the new year.
+
+        Returns:
+            dict: Window action on the cloned subjects
+        """
+        self.ensure_one()
+        domain = [('academic_year', '=', self.to_year), ('origin_subject_id', '!=', False)]
+        if self.university_id:
+            domain.append(('university_id', '=', self.university_id.id))
+        return {
+            'type': 'ir.actions.act_window',
+            'name': _('Subjects %s', self.to_year),
+            'res_model': 'university.subject',
+            'view_mode': 'list,form',
+            'domain': domain,
+        }
+
+    @api.model
+    def _cron_process_rollovers(self):
+        """
+        Run the remaining steps of the running rollovers.
+
+        Every step is committed on its own: when the cron is interrupted the
+        next run continues with the first step not done.
+        """
+        for rollover in self.search([('state', '=', 'running')], order='id'):
+            while rollover.state == 'running':
+                try:
+                    rollover._run_next_step()
+                    self.env.cr.commit()
+                except Exception as e:
+                    self.env.cr.rollback()
+                    _logger.exception("Rollover %s failed at step %s", rollover.id, rollover.step)
+                    rollover.write({'state': 'failed', 'error': str(e)})
+                    self.env.cr.commit()
@@ -8,6 +8,7 @@ academic records, and system access management.
 
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError, UserError
+from odoo.tools import sql
 import base64
 from markupsafe import escape, Markup
 
@@ -28,6 +29,11 @@ class UniversityStudent(models.Model):
         state_id (Many2one): State/Province
         country_id (Many2one): Country
         tutor_id (Many2one): Academic tutor
+        degree_program_id (Many2one): Degree the student is working towards
+        degree_audit_id (Many2one): Stored degree progress (computed)
+        at_risk (Boolean): Matches an at-risk rule in the current term
+        risk_flag_count (Integer): Number of at-risk rules matched
+        risk_flag_ids (One2many): At-risk rules matched
         enrollment_ids (One2many): Course enrollments
         grade_ids (One2many): Academic grades
         email_student (Char): Student's email address
@@ -36,6 +42,7 @@ class UniversityStudent(models.Model):
         active (Boolean): Record active status
         enrollment_count (Integer): Total enrollments (computed)
         grade_count (Integer): Total grades (computed)
+        attendance_rate (Float): Percentage of sessions attended (computed)
     """
     _name = 'university.student'
     _description = 'University Student'
@@ -96,6 +103,43 @@ class UniversityStudent(models.Model):
         help="Academic advisor/tutor"
     )
     
+    degree_program_id = fields.Many2one(
+        'university.degree.program',
+        string='Degree Program',
+        domain="[('university_id', '=', university_id)]",
+        index=True,
+        help="Degree the student is working towards"
+    )
+
+    degree_audit_id = fields.Many2one(
+        'university.degree.audit',
+        string='Degree Audit',
+        compute='_compute_degree_audit',
+        help="Progress of the student towards their degree"
+    )
+
+    # Early warning, written by the at-risk job
+    at_risk = fields.Boolean(
+        string='At Risk',
+        readonly=True,
+        index=True,
+        help="The student matches at least one at-risk rule in the current term"
+    )
+
+    risk_flag_count = fields.Integer(
+        string='Risk Flags',
+        readonly=True,
+        help="Number of at-risk rules matched by the student"
+    )
+
+    risk_flag_ids = fields.One2many(
+        'university.student.risk',
+        'student_id',
+        string='At-Risk Flags',
+        readonly=True,
+        help="At-risk rules matched by the student in the current term"
+    )
+
     enrollment_ids = fields.One2many(  #relacion con modelo matriculas
         'university.enrollment', #un estudiante tiene varias matriculas
         'student_id',
@@ -136,6 +180,12 @@ class UniversityStudent(models.Model):
         help="Whether the student record is active"
     )
 
+    recompute_pending = fields.Boolean(
+        string='Recompute Pending',
+        compute='_compute_recompute_pending',
+        help="Enrollments and grades of this student are still being updated in background"
+    )
+
     # Computed Fields
     enrollment_count = fields.Integer(  #contador de matriculas
         string='Enrollment Count',
@@ -149,6 +199,21 @@ class UniversityStudent(models.Model):
         help="Total number of grades received"
     )
 
+    attendance_rate = fields.Float(
+        string='Attendance (%)',
+        compute='_compute_attendance_rate',
+        help="Percentage of the class sessions attended, over all the subjects"
+    )
+
+    def init(self):
+        """
+        Create the prefix index of the website autocomplete.
+        """
+        sql.create_index(
+            self.env.cr, 'university_student_name_prefix_idx',
+            self._table, ['lower(name) text_pattern_ops'],
+        )
+
     @api.depends('enrollment_ids') #trigger de matriculas
     def _compute_enrollment_count(self): #metodo de mcontar matriculas
         """
@@ -157,8 +222,10 @@ class UniversityStudent(models.Model):
         This method computes the total number of course enrollments
         for each student record.
         """
+        counts = dict(self.env['university.enrollment']._read_group(
+            [('student_id', 'in', self._origin.ids)], ['student_id'], ['__count']))
         for student in self:
-            student.enrollment_count = len(student.enrollment_ids)
+            student.enrollment_count = counts.get(student._origin, 0)
 
     @api.depends('grade_ids') #trigger de notas
     def _compute_grade_count(self): #metodo de contar notas
@@ -168,8 +235,62 @@ class UniversityStudent(models.Model):
         This method computes the total number of grades received
         for each student record.
         """
+        counts = dict(self.env['university.grade']._read_group(
+            [('student_id', 'in', self._origin.ids)], ['student_id'], ['__count']))
+        for student in self:
+            student.grade_count = counts.get(student._origin, 0)
+
+    def _compute_attendance_rate(self):
+        """
+        Aggregate the attendance counters of the student's enrollments.
+        """
+        rates = self.env['university.attendance'].sudo()._get_rates(
+            'student_id', [('student_id', 'in', self._origin.ids)])
         for student in self:
-            student.grade_count = len(student.grade_ids)
+            student.attendance_rate = rates.get(student._origin, 0.0)
+
+    def _compute_degree_audit(self):
+        """
+        Get the stored degree progress of the students.
+        """
+        audits = self.env['university.degree.audit'].sudo().search([('student_id', 'in', self.ids)])
+        audit_by_student = {audit.student_id.id: audit for audit in audits}
+        for student in self:
+            student.degree_audit_id = audit_by_student.get(student.id, False)
+
+    def _compute_recompute_pending(self):
+        """
+        Flag students with deferred recomputations not yet applied.
+        """
+        pending = self.env['university.recompute.job'].sudo().search([
+            ('student_ids', 'in', self.ids),
+            ('state', '!=', 'done'),
+        ]).student_ids
+        for student in self:
+            student.recompute_pending = student in pending
+
+    def write(self, vals):
+        """
+        Update students, deferring large recomputations to background jobs.
+
+        Moving a student to another university updates stored fields on all
+        their enrollments and grades. Above the configured threshold those
+        updates are processed by a cron in committed chunks. Changing the
+        degree program re-evaluates the degree audit of the students.
+
+        Args:
+            vals (dict): Values to update
+
+        Returns:
+            bool: Result of the write operation
+        """
+        Job = self.env['university.recompute.job']
+        before = Job._snapshot_to_compute()
+        result = super().write(vals)
+        Job._defer_recomputes(before, self)
+        if 'degree_program_id' in vals or 'university_id' in vals:
+            self.env['university.degree.audit'].sudo()._refresh(students=self)
+        return result
 
     def action_view_enrollments(self): #boton para ver matriculas
         """
@@ -209,6 +330,22 @@ class UniversityStudent(models.Model):
             'target': 'current',
         }
 
+    def action_view_attendance(self):
+        """
+        Display the attendance of the student in each subject.
+
+        Returns:
+            dict: Window action for the attendance view
+        """
+        return {
+            'type': 'ir.actions.act_window',
+            'name': _('Attendance'),
+            'res_model': 'university.attendance',
+            'view_mode': 'list,pivot',
+            'domain': [('student_id', '=', self.id)],
+            'target': 'current',
+        }
+
     @api.model #modelo, no registros
     def create(self, vals):  #sobreescribimo el metodo de odoo (create) (vals son los valores)
         """
@@ -250,6 +387,9 @@ class UniversityStudent(models.Model):
                 'partner_id': user.partner_id.id #asignamos el partner
             })
 
+        if student.degree_program_id: #auditoria del grado
+            self.env['university.degree.audit'].sudo()._refresh(students=student)
+
         return student
 
     def _get_customer_information(self): #extraer info templates
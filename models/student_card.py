@@ -0,0 +1,99 @@
+"""
+Module for the website student cards read model.
+
+This module implements the UniversityStudentCard model, a SQL view that
+projects exactly what the student cards of the website show, so that large
+listings are rendered from a single query without loading student records,
+their images or their enrollments.
+"""
+
+from odoo import models, fields
+
+class UniversityStudentCard(models.Model):
+    """
+    University Student Card Model.
+    
+    This class represents a read-only SQL view with one row per student and
+    the aggregated names of the subjects the student is enrolled in.
+    
+    Attributes:
+        name (Char): Student's full name
+        active (Boolean): Student active status
+        university_id (Many2one): Associated university
+        university_name (Char): Name of the university
+        tutor_id (Many2one): Academic tutor
+        tutor_name (Char): Name of the tutor
+        enrollment_count (Integer): Number of enrollments
+        subject_names (Char): Enrolled subject names, one per line
+        has_image (Boolean): Whether the student has a profile picture
+    """
+    _name = 'university.student.card'
+    _description = 'University Student Card'
+    _auto = False  # Indicates this is a SQL view, not a table
+    _order = 'id'
+
+    name = fields.Char(string='Name', readonly=True)
+    active = fields.Boolean(string='Active', readonly=True)
+
+    university_id = fields.Many2one(
+        'university.university',
+        string='University',
+        readonly=True
+    )
+    university_name = fields.Char(string='University Name', readonly=True)
+
+    tutor_id = fields.Many2one(
+        'university.professor',
+        string='Tutor',
+        readonly=True
+    )
+    tutor_name = fields.Char(string='Tutor Name', readonly=True)
+
+    enrollment_count = fields.Integer(string='Enrollment Count', readonly=True)
+    subject_names = fields.Char(
+        string='Subjects',
+        readonly=True,
+        help="Names of the enrolled subjects, one per line, in enrollment order"
+    )
+    has_image = fields.Boolean(string='Has Image', readonly=True)
+
+    def init(self):
+        """
+        Initialize the SQL view for the student cards.
+        
+        The subjects are aggregated per student in a lateral subquery, so the
+        view only touches the enrollments of the students actually selected.
+        """
+        self.env.cr.execute("DROP VIEW IF EXISTS university_student_card CASCADE")
+        self.env.cr.execute("""
+            CREATE VIEW university_student_card AS (
+                SELECT
+                    s.id,
+                    s.name,
+                    s.active,
+                    s.university_id,
+                    u.name AS university_name,
+                    s.tutor_id,
+                    t.name AS tutor_name,
+                    en.enrollment_count,
+                    en.subject_names,
+                    EXISTS (
+                        SELECT 1 FROM ir_attachment a
+                         WHERE a.res_model = 'university.student'
+                           AND a.res_field = 'image_1920'
+                           AND a.res_id = s.id
+                    ) AS has_image
+                FROM
+                    university_student s
+                    LEFT JOIN university_university u ON u.id = s.university_id
+                    LEFT JOIN university_professor t ON t.id = s.tutor_id
+                    LEFT JOIN LATERAL (
+                        SELECT
+                            COUNT(e.id) AS enrollment_count,
+                            STRING_AGG(sub.name, E'\\n' ORDER BY e.name) AS subject_names
+                        FROM university_enrollment e
+                        JOIN university_subject sub ON sub.id = e.subject_id
+                        WHERE e.student_id = s.id
+                    ) en ON TRUE
+            )
+        """)
@@ -0,0 +1,285 @@
+"""
+Module for the at-risk early warning flags.
+
+This module implements the UniversityStudentRisk model, one row per student
+and rule the student currently matches, and the UniversityTutorRiskDigest
+model, the summary of the flagged students of each tutor. Both are rebuilt by
+a scheduled job in a single pass over the grades of the current and previous
+terms, so a tutor's dashboard only reads precomputed rows.
+"""
+
+import logging
+
+from odoo import models, fields, api, _
+
+_logger = logging.getLogger(__name__)
+
+# Grades below this value are failed
+PASS_GRADE = 5.0
+
+class UniversityStudentRisk(models.Model):
+    """
+    University Student Risk Model.
+
+    This class represents a rule matched by a student in the current term.
+
+    Attributes:
+        student_id (Many2one): Flagged student
+        rule_id (Many2one): Rule matched
+        tutor_id (Many2one): Tutor of the student
+        university_id (Many2one): University of the student
+        term_id (Many2one): Term evaluated
+        digest_id (Many2one): Digest of the tutor
+        value (Float): Measured value: failed subjects, average drop or average
+        threshold (Float): Threshold of the rule when evaluated
+        compute_date (Datetime): When the flag was computed
+    """
+    _name = 'university.student.risk'
+    _description = 'University Student At-Risk Flag'
+    _order = 'tutor_id, student_id, rule_id'
+    _log_access = False  # Derived table, refreshed in SQL
+
+    student_id = fields.Many2one(
+        'university.student',
+        string='Student',
+        required=True,
+        ondelete='cascade',
+        index=True,
+        readonly=True
+    )
+    rule_id = fields.Many2one(
+        'university.risk.rule',
+        string='Rule',
+        required=True,
+        ondelete='cascade',
+        readonly=True
+    )
+    rule_type = fields.Selection(related='rule_id.rule_type', string='Condition')
+    tutor_id = fields.Many2one(
+        'university.professor',
+        string='Tutor',
+        ondelete='set null',
+        index=True,
+        readonly=True
+    )
+    university_id = fields.Many2one(
+        'university.university',
+        string='University',
+        ondelete='cascade',
+        readonly=True
+    )
+    term_id = fields.Many2one(
+        'university.term',
+        string='Term',
+        ondelete='cascade',
+        readonly=True
+    )
+    digest_id = fields.Many2one(
+        'university.tutor.risk.digest',
+        string='Digest',
+        ondelete='set null',
+        index=True,
+        readonly=True
+    )
+    value = fields.Float(string='Value', readonly=True, aggregator=False)
+    threshold = fields.Float(string='Threshold', readonly=True, aggregator=False)
+    compute_date = fields.Datetime(string='Computed On', readonly=True)
+
+    @api.model
+    def _compute_flags(self):
+        """
+        Evaluate the active rules and rebuild the flags and tutor digests.
+
+        The grades of the current and previous terms are aggregated once per
+        student; every rule is then checked against those figures. Flags,
+        digests and the at-risk fields of the students are written by the
+        same statement.
+        """
+        self.env.flush_all()
+        cr = self.env.cr
+        Term = self.env['university.term'].sudo()
+        term = Term._get_current()
+        previous = term and Term.search([('date_end', '<', term.date_start)], order='date_end desc', limit=1)
+        if not term:
+            _logger.info("No current term: at-risk flags cleared")
+        cr.execute("DELETE FROM university_student_risk")
+        cr.execute("DELETE FROM university_tutor_risk_digest")
+        cr.execute("""
+            WITH per_subject AS (
+                SELECT g.student_id, g.subject_id, g.term_id,
+                       MAX(g.grade) AS best_grade, SUM(g.grade) AS total, COUNT(*) AS grade_count
+                  FROM university_grade g
+                 WHERE g.term_id = %(term_id)s OR g.term_id = %(previous_id)s
+              GROUP BY g.student_id, g.subject_id, g.term_id
+            ),
+            stats AS (
+                SELECT student_id,
+                       COUNT(*) FILTER (WHERE term_id = %(term_id)s AND best_grade < %(pass_grade)s)
+                           AS failed_subjects,
+                       SUM(total) FILTER (WHERE term_id = %(term_id)s)
+                           / NULLIF(SUM(grade_count) FILTER (WHERE term_id = %(term_id)s), 0)
+                           AS current_average,
+                       SUM(total) FILTER (WHERE term_id = %(previous_id)s)
+                           / NULLIF(SUM(grade_count) FILTER (WHERE term_id = %(previous_id)s), 0)
+                           AS previous_average
+                  FROM per_subject
+              GROUP BY student_id
+            ),
+            measured AS (
+                SELECT st.id AS student_id, st.tutor_id, st.university_id, r.id AS rule_id,
+                       r.rule_type, r.threshold,
+                       CASE r.rule_type
+                            WHEN 'failed_subjects' THEN s.failed_subjects
+                            WHEN 'average_drop' THEN s.previous_average - s.current_average
+                            WHEN 'low_average' THEN s.current_average
+                       END AS value
+                  FROM stats s
+                  JOIN university_student st ON st.id = s.student_id AND st.active
+                  JOIN university_risk_rule r ON r.active
+                                             AND (r.university_id IS NULL OR r.university_id = st.university_id)
+            ),
+            flags AS (
+                SELECT * FROM measured
+                 WHERE CASE rule_type
+                            WHEN 'failed_subjects' THEN value >= threshold
+                            WHEN 'average_drop' THEN value > threshold
+                            WHEN 'low_average' THEN value < threshold
+                       END
+            ),
+            flag_counts AS (
+                SELECT student_id, COUNT(*) AS flag_count
+                  FROM flags
+              GROUP BY student_id
+            ),
+            digests AS (
+                INSERT INTO university_tutor_risk_digest
+                    (tutor_id, term_id, student_count, at_risk_count, flag_count, compute_date)
+                SELECT st.tutor_id, %(term_id)s, COUNT(*), COUNT(fc.student_id),
+                       COALESCE(SUM(fc.flag_count), 0), NOW() AT TIME ZONE 'UTC'
+                  FROM university_student st
+                  LEFT JOIN flag_counts fc ON fc.student_id = st.id
+                 WHERE st.active AND st.tutor_id IS NOT NULL
+              GROUP BY st.tutor_id
+             RETURNING id, tutor_id
+            ),
+            inserted AS (
+                INSERT INTO university_student_risk
+                    (student_id, rule_id, tutor_id, university_id, term_id, digest_id,
+                     value, threshold, compute_date)
+                SELECT f.student_id, f.rule_id, f.tutor_id, f.university_id, %(term_id)s, d.id,
+                       ROUND(f.value::numeric, 2), f.threshold, NOW() AT TIME ZONE 'UTC'
+                  FROM flags f
+                  LEFT JOIN digests d ON d.tutor_id = f.tutor_id
+            )
+            UPDATE university_student st
+               SET at_risk = fc.flag_count IS NOT NULL,
+                   risk_flag_count = COALESCE(fc.flag_count, 0)
+              FROM university_student s
+              LEFT JOIN flag_counts fc ON fc.student_id = s.id
+             WHERE s.id = st.id
+               AND (s.at_risk OR fc.flag_count IS NOT NULL)
+        """, {
+            'term_id': term.id or None,
+            'previous_id': previous.id or None,
+            'pass_grade': PASS_GRADE,
+        })
+        # Rows were replaced in SQL
+        self.env.invalidate_all()
+
+    @api.model
+    def _cron_compute_flags(self):
+        """
+        Scheduled evaluation of the at-risk rules.
+        """
+        self._compute_flags()
+
+
+class UniversityTutorRiskDigest(models.Model):
+    """
+    University Tutor Risk Digest Model.
+
+    This class represents the at-risk summary of the students of a tutor,
+    loaded as is by the tutor dashboard.
+
+    Attributes:
+        tutor_id (Many2one): Tutor
+        user_id (Many2one): User of the tutor (related)
+        term_id (Many2one): Term evaluated
+        student_count (Integer): Active students of the tutor
+        at_risk_count (Integer): Students with at least one flag
+        flag_count (Integer): Flags of the students
+        at_risk_ratio (Float): Percentage of students at risk (computed)
+        compute_date (Datetime): When the digest was computed
+        flag_ids (One2many): Flags of the students
+    """
+    _name = 'university.tutor.risk.digest'
+    _description = 'University Tutor At-Risk Digest'
+    _order = 'at_risk_count desc, tutor_id'
+    _rec_name = 'tutor_id'
+    _log_access = False  # Derived table, refreshed in SQL
+
+    tutor_id = fields.Many2one(
+        'university.professor',
+        string='Tutor',
+        required=True,
+        ondelete='cascade',
+        readonly=True
+    )
+    user_id = fields.Many2one(related='tutor_id.user_id', string='User')
+    term_id = fields.Many2one(
+        'university.term',
+        string='Term',
+        ondelete='set null',
+        readonly=True
+    )
+    student_count = fields.Integer(string='Students', readonly=True)
+    at_risk_count = fields.Integer(string='Students at Risk', readonly=True)
+    flag_count = fields.Integer(string='Flags', readonly=True)
+    at_risk_ratio = fields.Float(
+        string='At Risk (%)',
+        compute='_compute_at_risk_ratio',
+        help="Percentage of the students of the tutor flagged as at risk"
+    )
+    compute_date = fields.Datetime(string='Computed On', readonly=True)
+    flag_ids = fields.One2many(
+        'university.student.risk',
+        'digest_id',
+        string='Flags',
+        readonly=True
+    )
+
+    _sql_constraints = [
+        ('tutor_uniq', 'UNIQUE(tutor_id)', 'A tutor has a single at-risk digest.'),
+    ]
+
+    @api.depends('student_count', 'at_risk_count')
+    def _compute_at_risk_ratio(self):
+        for digest in self:
+            if digest.student_count:
+                digest.at_risk_ratio = 100.0 * digest.at_risk_count / digest.student_count
+            else:
+                digest.at_risk_ratio = 0.0
+
+    def action_view_students(self):
+        """
+        Display the students at risk of the tutors.
+
+        Returns:
+            dict: Window action on the flagged students
+        """
+        return {
+            'type': 'ir.actions.act_window',
+            'name': _('Students at Risk'),
+            'res_model': 'university.student',
+            'view_mode': 'kanban,form',
+            'domain': [('tutor_id', 'in', self.tutor_id.ids), ('at_risk', '=', True)],
+            'target': 'current',
+        }
+
+    @api.model
+    def action_refresh(self):
+        """
+        Evaluate the at-risk rules now instead of waiting for the job.
+        """
+        self.env['university.student.risk'].sudo()._compute_flags()
+        return {'type': 'ir.actions.client', 'tag': 'reload'}
@@ -6,7 +6,9 @@ operations in the university management system, including department assignments
 professor associations, and enrollment tracking.
 """
 
-from odoo import models, fields, api
+from odoo import models, fields, api, _
+from odoo.exceptions import ValidationError
+from odoo.tools import sql
 
 class UniversitySubject(models.Model):
     """
@@ -19,9 +21,17 @@ class UniversitySubject(models.Model):
         name (Char): Subject name
         university_id (Many2one): Associated university
         department_id (Many2one): Department offering the subject
+        academic_year (Integer): Year in which the subject is offered
+        origin_subject_id (Many2one): Offering it was rolled over from
+        lineage_id (Many2one): First offering of the subject (computed)
+        credits (Float): Credits earned by passing the subject
+        prerequisite_ids (Many2many): Subjects that must be passed first
+        all_prerequisite_ids (Many2many): Direct and indirect prerequisites (computed)
         professor_ids (Many2many): Professors teaching the subject
         enrollment_ids (One2many): Student enrollments in this subject
         enrollment_count (Integer): Total number of enrollments (computed)
+        session_count (Integer): Number of class sessions (computed)
+        attendance_rate (Float): Percentage of sessions attended (computed)
         image_1920 (Image): Subject's representative image
     """
     _name = 'university.subject'
@@ -49,6 +59,56 @@ class UniversitySubject(models.Model):
         help="Department responsible for this subject"
     )
 
+    # Academic Year Offering
+    academic_year = fields.Integer(
+        string='Academic Year',
+        index=True,
+        help="Year in which this subject is offered. Empty for subjects not tied to a year"
+    )
+
+    origin_subject_id = fields.Many2one(
+        'university.subject',
+        string='Previous Offering',
+        index=True,
+        ondelete='set null',
+        readonly=True,
+        help="Subject offering this one was rolled over from"
+    )
+
+    lineage_id = fields.Many2one(
+        'university.subject',
+        string='First Offering',
+        compute='_compute_lineage',
+        store=True,
+        recursive=True,
+        index=True,
+        help="First offering of the subject; offerings of the same lineage are the same subject over the years"
+    )
+
+    credits = fields.Float(
+        string='Credits',
+        default=6.0,
+        help="Credits a student earns by passing this subject"
+    )
+
+    # Prerequisites
+    prerequisite_ids = fields.Many2many(
+        'university.subject',
+        'university_subject_prerequisite_rel',
+        'subject_id',
+        'prerequisite_id',
+        string='Prerequisites',
+        domain="[('university_id', '=', university_id), ('id', '!=', id)]",
+        help="Subjects a student must have passed before enrolling in this one"
+    )
+
+    all_prerequisite_ids = fields.Many2many(
+        'university.subject',
+        string='All Prerequisites',
+        compute='_compute_all_prerequisites',
+        help="Direct and indirect prerequisites of the subject"
+    )
+
     # Teaching Staff
     professor_ids = fields.Many2many( #relacion con los profesores
         'university.professor',  #las asignaturas las pueden dar varios profesores
@@ -71,12 +131,39 @@ class UniversitySubject(models.Model):
         help="Total number of student enrollments"
     )
 
+    session_count = fields.Integer(
+        string='Session Count',
+        compute='_compute_attendance',
+        help="Number of class sessions of the subject"
+    )
+
+    attendance_rate = fields.Float(
+        string='Attendance (%)',
+        compute='_compute_attendance',
+        help="Percentage of the class sessions attended by the enrolled students"
+    )
+
     # Media
     image_1920 = fields.Image(
         string="Image",
         help="Subject's representative image"
     )
 
+    recompute_pending = fields.Boolean(
+        string='Recompute Pending',
+        compute='_compute_recompute_pending',
+        help="Enrollments and grades of this subject are still being updated in background"
+    )
+
+    def init(self):
+        """
+        Create the prefix index of the website autocomplete.
+        """
+        sql.create_index(
+            self.env.cr, 'university_subject_name_prefix_idx',
+            self._table, ['lower(name) text_pattern_ops'],
+        )
+
     @api.depends('enrollment_ids') #trigger para recalcular matriculas
     def _compute_enrollment_count(self):
         """
@@ -85,8 +172,110 @@ class UniversitySubject(models.Model):
         This method computes the total number of student enrollments
         for each subject record.
         """
+        counts = dict(self.env['university.enrollment']._read_group(
+            [('subject_id', 'in', self._origin.ids)], ['subject_id'], ['__count']))
+        for subject in self:
+            subject.enrollment_count = counts.get(subject._origin, 0)
+
+    def _compute_attendance(self):
+        """
+        Count the sessions and aggregate the attendance counters of the subjects.
+        """
+        domain = [('subject_id', 'in', self._origin.ids)]
+        counts = dict(self.env['university.session'].sudo()._read_group(domain, ['subject_id'], ['__count']))
+        rates = self.env['university.attendance'].sudo()._get_rates('subject_id', domain)
+        for subject in self:
+            subject.session_count = counts.get(subject._origin, 0)
+            subject.attendance_rate = rates.get(subject._origin, 0.0)
+
+    @api.depends('origin_subject_id.lineage_id')
+    def _compute_lineage(self):
+        for subject in self:
+            subject.lineage_id = subject.origin_subject_id.lineage_id or subject.origin_subject_id or subject
+
+    def _compute_all_prerequisites(self):
+        """
+        Read the transitive prerequisites from the closure table.
+        """
+        closure = self.env['university.subject.prerequisite'].sudo().search([('subject_id', 'in', self.ids)])
         for subject in self:
-            subject.enrollment_count = len(subject.enrollment_ids)
+            subject.all_prerequisite_ids = closure.filtered(
+                lambda row: row.subject_id == subject
+            ).prerequisite_id
+
+    @api.constrains('prerequisite_ids')
+    def _check_prerequisite_cycle(self):
+        """
+        Validates that prerequisites do not form a cycle.
+
+        Raises:
+            ValidationError: If a subject would (indirectly) require itself.
+        """
+        if self._has_cycle('prerequisite_ids'):
+            raise ValidationError(_('A subject cannot be a prerequisite of itself, directly or indirectly.'))
+
+    def _compute_recompute_pending(self):
+        """
+        Flag subjects with deferred recomputations not yet applied.
+        """
+        pending = self.env['university.recompute.job'].sudo().search([
+            ('subject_ids', 'in', self.ids),
+            ('state', '!=', 'done'),
+        ]).subject_ids
+        for subject in self:
+            subject.recompute_pending = subject in pending
+
+    def write(self, vals):
+        """
+        Update subjects, deferring large recomputations to background jobs.
+
+        Renaming a subject or changing its professors or department updates
+        stored fields on all its enrollments and grades. Above the configured
+        threshold those updates are processed by a cron in committed chunks.
+        Prerequisite changes refresh the prerequisite closure table, and
+        credit changes the degree audit of the students who passed the subject.
+        A new department may bring another grade adjustment policy.
+
+        Args:
+            vals (dict): Values to update
+
+        Returns:
+            bool: Result of the write operation
+        """
+        Job = self.env['university.recompute.job']
+        before = Job._snapshot_to_compute()
+        result = super().write(vals)
+        Job._defer_recomputes(before, self)
+        if 'prerequisite_ids' in vals:
+            self.flush_recordset(['prerequisite_ids'])
+            self.env['university.subject.prerequisite']._refresh(self)
+        if 'credits' in vals or 'department_id' in vals:
+            passed = self.env['university.grade'].sudo().search([
+                ('subject_id', 'in', self.ids),
+                ('grade', '>=', 5.0),
+            ])
+            self.env['university.degree.audit'].sudo()._refresh(students=passed.student_id)
+        if 'department_id' in vals:
+            self.env['university.grade.policy'].sudo()._apply(self)
+        return result
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """
+        Create subjects and add their prerequisites to the closure table.
+
+        Args:
+            vals_list (list): Values for creating the subject records
+
+        Returns:
+            recordset: Newly created subject records
+        """
+        subjects = super().create(vals_list)
+        with_prerequisites = subjects.filtered('prerequisite_ids')
+        if with_prerequisites:
+            with_prerequisites.flush_recordset(['prerequisite_ids'])
+            self.env['university.subject.prerequisite']._refresh(with_prerequisites)
+        return subjects
 
     def action_view_enrollments(self): #boton inteligente
         """
@@ -106,3 +295,175 @@ class UniversitySubject(models.Model):
             'context': {'default_subject_id': self.id},
             'target': 'current',
         }
+
+    def action_view_sessions(self):
+        """
+        Display the class sessions of the subject.
+
+        Returns:
+            dict: Window action for the session view
+        """
+        return {
+            'type': 'ir.actions.act_window',
+            'name': _('Sessions'),
+            'res_model': 'university.session',
+            'view_mode': 'list,form',
+            'domain': [('subject_id', '=', self.id)],
+            'context': {'default_subject_id': self.id},
+            'target': 'current',
+        }
+
+    def action_open_grade_grid(self):
+        """
+        Open the grade entry grid of the subject.
+
+        Returns:
+            dict: Client action of the grid
+        """
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'university_grade_grid',
+            'name': _('Grades of %s', self.name),
+            'params': {'subject_id': self.id},
+        }
+
+    def get_grade_grid(self, term_id=None):
+        """
+        Read the rows of the grade entry grid: one per enrollment of the
+        subject, with its latest grade.
+
+        Args:
+            term_id (int): Term of the enrollments, 0 for every term, None
+                for the current term when the subject has enrollments in it
+
+        Returns:
+            dict: Subject, terms of its enrollments, selected term and rows
+        """
+        self.ensure_one()
+        self.check_access('read')
+        self.env['university.grade'].check_access('read')
+        self.env.flush_all()
+        self.env.cr.execute("""
+            SELECT t.id, t.name
+              FROM university_term t
+             WHERE EXISTS (SELECT 1 FROM university_enrollment e
+                            WHERE e.subject_id = %s AND e.term_id = t.id)
+          ORDER BY t.date_start DESC
+        """, [self.id])
+        terms = [{'id': row[0], 'name': row[1]} for row in self.env.cr.fetchall()]
+        if term_id is None:
+            current_id = self.env['university.term']._get_current_id()
+            term_id = current_id if any(term['id'] == current_id for term in terms) else 0
+        self.env.cr.execute("""
+            SELECT e.id, e.name, st.id, st.name, g.id, g.grade, g.adjusted_grade
+              FROM university_enrollment e
+              JOIN university_student st ON st.id = e.student_id
+              LEFT JOIN LATERAL (
+                    SELECT g.id, g.grade, g.adjusted_grade
+                      FROM university_grade g
+                     WHERE g.enrollment_id = e.id
+                  ORDER BY g.date DESC, g.id DESC
+                     LIMIT 1
+              ) g ON TRUE
+             WHERE e.subject_id = %(subject_id)s
+               AND (%(term_id)s = 0 OR e.term_id = %(term_id)s)
+          ORDER BY st.name, e.id
+        """, {'subject_id': self.id, 'term_id': term_id or 0})
+        return {
+            'subject': {'id': self.id, 'name': self.name},
+            'terms': terms,
+            'term_id': term_id or 0,
+            'rows': [{
+                'enrollment_id': enrollment_id,
+                'enrollment': enrollment_name,
+                'student_id': student_id,
+                'student': student_name,
+                'grade_id': grade_id or False,
+                'grade': grade,
+                'adjusted_grade': adjusted_grade,
+            } for enrollment_id, enrollment_name, student_id, student_name, grade_id, grade, adjusted_grade
+                in self.env.cr.fetchall()],
+        }
+
+    def save_grade_grid(self, entries, date=None):
+        """
+        Save the edited cells of the grade entry grid in one call.
+
+        Every entry is validated before anything is written: the enrollment
+        must belong to the subject and appear once, the grade must belong to
+        the enrollment, and the value must be a number between 0 and 10. New
+        grades are created in one batch; edited grades are written in one
+        batch per value.
+
+        Args:
+            entries (list): Dicts with enrollment_id, grade_id (False for a
+                new grade) and grade
+            date (str): Date of the new grades, today by default
+
+        Returns:
+            dict: Numbers of created and updated grades, or the errors by
+                enrollment id ("#<index>" for an entry without enrollment)
+                when nothing was saved
+        """
+        self.ensure_one()
+
+        def is_id(value):
+            return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+        enrollments = self.env['university.enrollment'].browse(
+            {entry.get('enrollment_id') for entry in entries if is_id(entry.get('enrollment_id'))}).exists()
+        grades = self.env['university.grade'].browse(
+            {entry.get('grade_id') for entry in entries if is_id(entry.get('grade_id'))}).exists()
+        enrollments.fetch(['subject_id', 'student_id'])
+        grades.fetch(['enrollment_id', 'grade'])
+
+        errors = {}
+        seen = set()
+        for index, entry in enumerate(entries):
+            enrollment_id = entry.get('enrollment_id')
+            grade_id = entry.get('grade_id') or False
+            value = entry.get('grade')
+            if not is_id(enrollment_id):
+                # Sin matrícula el error se indexa por la posición de la entrada
+                errors['#%d' % index] = _('The entry has no enrollment.')
+                continue
+            enrollment = enrollments.browse(enrollment_id)
+            if enrollment not in enrollments or enrollment.subject_id != self:
+                errors[enrollment_id] = _('The enrollment is not of this subject.')
+            elif enrollment_id in seen:
+                errors[enrollment_id] = _('The enrollment appears more than once.')
+            elif grade_id and (not is_id(grade_id) or grades.browse(grade_id) not in grades
+                               or grades.browse(grade_id).enrollment_id != enrollment):
+                errors[enrollment_id] = _('The grade is not of this enrollment.')
+            elif isinstance(value, bool) or not isinstance(value, (int, float)) or not 0 <= value <= 10:
+                errors[enrollment_id] = _('The grade must be between 0 and 10.')
+            seen.add(enrollment_id)
+        if errors:
+            return {'errors': errors}
+
+        create_vals = []
+        by_value = {}
+        for entry in entries:
+            value = round(float(entry['grade']), 2)
+            if entry.get('grade_id'):
+                grade = grades.browse(entry['grade_id'])
+                if grade.grade != value:
+                    by_value.setdefault(value, []).append(grade.id)
+            else:
+                enrollment = enrollments.browse(entry['enrollment_id'])
+                create_vals.append({
+                    'enrollment_id': enrollment.id,
+                    'student_id': enrollment.student_id.id,
+                    'grade': value,
+                    'date': date or fields.Date.context_today(self),
+                })
+        Grade = self.env['university.grade']
+        if create_vals:
+            Grade.create(create_vals)
+        for value, grade_ids in by_value.items():
+            Grade.browse(grade_ids).write({'grade': value})
+        return {
+            'created': len(create_vals),
+            'updated': sum(len(grade_ids) for grade_ids in by_value.values()),
+        }
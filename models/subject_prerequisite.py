@@ -0,0 +1,161 @@
+"""
+Module for the transitive closure of subject prerequisites.
+
+This module implements the UniversitySubjectPrerequisite model, a table with
+one row per (subject, direct or indirect prerequisite) pair. It is maintained
+with a recursive query whenever prerequisites change, so that checking the
+eligibility of a student, or of a whole cohort, is a single indexed query
+against the passed grades instead of a walk of the prerequisite graph.
+"""
+
+from odoo import models, fields, api
+from odoo.tools import sql
+
+# Prerequisites are passed with this grade or more
+PASS_GRADE = 5.0
+
+
+def missing_prerequisites_query(student_col, subject_col):
+    """
+    Correlated subquery returning the prerequisites not passed by a student.
+
+    A prerequisite is passed when the student has a passing grade in any
+    offering of the same subject lineage, e.g. the previous year's offering.
+
+    Args:
+        student_col (str): SQL expression of the student id
+        subject_col (str): SQL expression of the subject to enroll in
+
+    Returns:
+        str: SQL subquery selecting the missing prerequisite ids
+    """
+    return f"""
+        SELECT c.prerequisite_id
+          FROM university_subject_prerequisite c
+          JOIN university_subject ps ON ps.id = c.prerequisite_id
+         WHERE c.subject_id = {subject_col}
+           AND NOT EXISTS (
+                SELECT 1
+                  FROM university_grade g
+                  JOIN university_subject gs ON gs.id = g.subject_id
+                 WHERE g.student_id = {student_col}
+                   AND g.grade >= {PASS_GRADE}
+                   AND gs.lineage_id = ps.lineage_id
+           )
+    """
+
+
+class UniversitySubjectPrerequisite(models.Model):
+    """
+    University Subject Prerequisite Closure Model.
+
+    This class represents the transitive closure of the prerequisite graph:
+    a row means the subject requires the prerequisite, directly (depth 1) or
+    through other subjects.
+
+    Attributes:
+        subject_id (Many2one): Subject with prerequisites
+        prerequisite_id (Many2one): Direct or indirect prerequisite
+        depth (Integer): Length of the shortest prerequisite chain
+    """
+    _name = 'university.subject.prerequisite'
+    _description = 'University Subject Prerequisite Closure'
+    _order = 'subject_id, depth, prerequisite_id'
+    _log_access = False  # Derived table, rebuilt from the prerequisites
+
+    subject_id = fields.Many2one(
+        'university.subject',
+        string='Subject',
+        required=True,
+        ondelete='cascade',
+        readonly=True
+    )
+    prerequisite_id = fields.Many2one(
+        'university.subject',
+        string='Prerequisite',
+        required=True,
+        ondelete='cascade',
+        index=True,
+        readonly=True
+    )
+    depth = fields.Integer(string='Depth', readonly=True)
+
+    _sql_constraints = [
+        ('subject_prerequisite_uniq', 'UNIQUE(subject_id, prerequisite_id)',
+         'A prerequisite is listed once per subject.'),
+    ]
+
+    def init(self):
+        """
+        Build the closure of the existing prerequisites.
+        """
+        relation = self.env['university.subject']._fields['prerequisite_ids'].relation
+        if sql.table_exists(self.env.cr, relation):
+            self._refresh()
+
+    @api.model
+    def _refresh(self, subjects=None):
+        """
+        Recompute the closure rows of subjects after a prerequisite change.
+
+        The subjects that require a changed subject, directly or not, have
+        their rows recomputed as well.
+
+        Args:
+            subjects (recordset): Subjects whose prerequisites changed, None
+                to rebuild the whole closure
+        """
+        field = self.env['university.subject']._fields['prerequisite_ids']
+        cr = self.env.cr
+        if subjects is None:
+            cr.execute(f"DELETE FROM {self._table}")
+            start = ""
+        else:
+            if not subjects:
+                return
+            cr.execute(f"""
+                SELECT %(ids)s::int[] || COALESCE(ARRAY_AGG(DISTINCT subject_id), '{{}}')
+                  FROM {self._table}
+                 WHERE prerequisite_id = ANY(%(ids)s)
+            """, {'ids': subjects.ids})
+            subject_ids = cr.fetchone()[0]
+            cr.execute(f"DELETE FROM {self._table} WHERE subject_id = ANY(%s)", [subject_ids])
+            start = cr.mogrify(f'WHERE r."{field.column1}" = ANY(%s)', [subject_ids]).decode()
+        cr.execute(f"""
+            WITH RECURSIVE walk(subject_id, prerequisite_id, depth) AS (
+                SELECT r."{field.column1}", r."{field.column2}", 1
+                  FROM "{field.relation}" r
+                 {start}
+                UNION
+                SELECT w.subject_id, r."{field.column2}", w.depth + 1
+                  FROM walk w
+                  JOIN "{field.relation}" r ON r."{field.column1}" = w.prerequisite_id
+            )
+            INSERT INTO {self._table} (subject_id, prerequisite_id, depth)
+            SELECT subject_id, prerequisite_id, MIN(depth)
+              FROM walk
+          GROUP BY subject_id, prerequisite_id
+        """)
+        self.env.invalidate_all()
+
+    @api.model
+    def _get_missing_prerequisites(self, pairs_query, params):
+        """
+        Get the prerequisites not passed for many (student, subject) pairs.
+
+        Args:
+            pairs_query (str): SQL query returning (student_id, subject_id) rows
+            params (dict): Parameters of pairs_query
+
+        Returns:
+            dict: Missing prerequisite ids by (student_id, subject_id); pairs
+                with every prerequisite passed are not listed
+        """
+        self.env.flush_all()
+        self.env.cr.execute(f"""
+            SELECT p.student_id, p.subject_id, ARRAY_AGG(m.prerequisite_id)
+              FROM ({pairs_query}) p
+             CROSS JOIN LATERAL ({missing_prerequisites_query('p.student_id', 'p.subject_id')}) m
+          GROUP BY p.student_id, p.subject_id
+        """, params)
+        return {(student_id, subject_id): ids for student_id, subject_id, ids in self.env.cr.fetchall()}
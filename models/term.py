@@ -0,0 +1,321 @@
+"""
+Module for managing academic terms.
+
+This module implements the UniversityTerm model. Enrollments and grades are
+linked to the term containing their date, and one term is flagged as the
+current one. Queries on the current term are served by partial indexes that
+only cover its rows; when the current term changes they are rebuilt by a cron,
+concurrently, so grade entry is never blocked by the build. The partial
+indexes only match queries filtering on the literal id of the current term,
+given by ``_get_current_id()``.
+"""
+
+from odoo import models, fields, api, _
+from odoo.exceptions import ValidationError
+from odoo.tools import sql
+
+from .. import cache
+
+# Partial indexes on the current term rows: name -> (table, columns)
+CURRENT_TERM_INDEXES = {
+    'university_enrollment_current_term_idx': ('university_enrollment', ['student_id', 'subject_id']),
+    'university_grade_current_term_student_idx': ('university_grade', ['student_id', 'date DESC']),
+    'university_grade_current_term_university_idx': ('university_grade', ['university_id', 'date DESC']),
+}
+
+# Id del periodo actual en cada proceso, invalidado al cambiar la tabla de periodos
+_current_term = cache.register('current_term', ['university.term'], max_size=1)
+
+class UniversityTerm(models.Model):
+    """
+    University Term Model.
+
+    This class represents an academic term (semester, trimester...). Terms do
+    not overlap, so every date belongs to at most one term.
+
+    Attributes:
+        name (Char): Term name
+        date_start (Date): First day of the term
+        date_end (Date): Last day of the term
+        academic_year (Integer): Academic year the term belongs to
+        is_current (Boolean): Whether this is the current term
+    """
+    _name = 'university.term'
+    _description = 'University Academic Term'
+    _order = 'date_start desc'
+
+    name = fields.Char(
+        string='Name',
+        required=True,
+        help="Name of the term, e.g. 2025 - First Semester"
+    )
+
+    date_start = fields.Date(
+        string='Start Date',
+        required=True,
+        help="First day of the term"
+    )
+
+    date_end = fields.Date(
+        string='End Date',
+        required=True,
+        help="Last day of the term"
+    )
+
+    academic_year = fields.Integer(
+        string='Academic Year',
+        compute='_compute_academic_year',
+        store=True,
+        readonly=False,
+        help="Academic year the term belongs to"
+    )
+
+    is_current = fields.Boolean(
+        string='Current Term',
+        copy=False,
+        help="Term used by default in the portal, the website and the reports"
+    )
+
+    _sql_constraints = [
+        ('dates_check', 'CHECK(date_start <= date_end)', 'The term must end after it starts.'),
+    ]
+
+    def init(self):
+        """
+        Ensure a single current term and create the missing current term
+        indexes. Indexes built for a previous current term are replaced by
+        the index cron.
+        """
+        self.env.cr.execute(f"""
+            CREATE UNIQUE INDEX IF NOT EXISTS university_term_current_uniq
+                ON {self._table} (is_current) WHERE is_current
+        """)
+        current_id = self._read_current_id()
+        for indexname, (tablename, expressions) in CURRENT_TERM_INDEXES.items():
+            if current_id and sql.column_exists(self.env.cr, tablename, 'term_id'):
+                sql.create_index(self.env.cr, indexname, tablename, expressions,
+                                 where=f"term_id = {int(current_id)}")
+
+    @api.depends('date_start')
+    def _compute_academic_year(self):
+        for term in self:
+            term.academic_year = term.date_start.year if term.date_start else 0
+
+    @api.constrains('date_start', 'date_end')
+    def _check_overlap(self):
+        """
+        Check that terms do not overlap.
+
+        Raises:
+            ValidationError: If the term overlaps another one
+        """
+        for term in self:
+            overlapping = self.search([
+                ('id', '!=', term.id),
+                ('date_start', '<=', term.date_end),
+                ('date_end', '>=', term.date_start),
+            ], limit=1)
+            if overlapping:
+                raise ValidationError(_('Term %(term)s overlaps %(other)s.',
+                                        term=term.name, other=overlapping.name))
+
+    @api.model
+    def _get_current_id(self):
+        """
+        Get the id of the current term, cached in every worker until the
+        term table changes.
+
+        Returns:
+            int: Current term id, or 0 if none is set
+        """
+        # La transacción que cambia el periodo actual no ve la caché
+        if self.env.cr.postcommit.data.get('universidad.current_term.changed'):
+            return self._read_current_id()
+        return _current_term.get(self.env, 'id', self._read_current_id)
+
+    @api.model
+    def _read_current_id(self):
+        self.flush_model(['is_current'])
+        self.env.cr.execute("SELECT id FROM university_term WHERE is_current LIMIT 1")
+        row = self.env.cr.fetchone()
+        return row[0] if row else 0
+
+    @api.model
+    def _get_current(self):
+        """
+        Get the current term.
+
+        Returns:
+            record: Current university.term, empty if none is set
+        """
+        return self.browse(self._get_current_id())
+
+    @api.model
+    def _find_term(self, date):
+        """
+        Get the term containing a date.
+
+        Args:
+            date (date): Date to look up
+
+        Returns:
+            record: university.term containing the date, empty if none
+        """
+        if not date:
+            return self.browse()
+        return self.sudo().search([
+            ('date_start', '<=', date),
+            ('date_end', '>=', date),
+        ], limit=1)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        if any(vals.get('is_current') for vals in vals_list):
+            self.search([('is_current', '=', True)]).write({'is_current': False})
+        terms = super().create(vals_list)
+        terms._assign_terms()
+        if any(terms.mapped('is_current')):
+            self._on_current_term_change()
+        return terms
+
+    def write(self, vals):
+        if vals.get('is_current'):
+            self.search([('is_current', '=', True), ('id', 'not in', self.ids)]).write({'is_current': False})
+        date_ranges = [(term.date_start, term.date_end) for term in self]
+        result = super().write(vals)
+        if 'date_start' in vals or 'date_end' in vals:
+            self._assign_terms(date_ranges)
+        if 'is_current' in vals:
+            self._on_current_term_change()
+        return result
+
+    def unlink(self):
+        was_current = any(self.mapped('is_current'))
+        result = super().unlink()
+        if was_current:
+            self._on_current_term_change()
+        return result
+
+    def _on_current_term_change(self):
+        """
+        Bypass the cached current term until commit and schedule the rebuild
+        of its partial indexes.
+        """
+        self.env.cr.postcommit.data['universidad.current_term.changed'] = True
+        cron = self.env.ref('Universidad.ir_cron_update_current_term_indexes', raise_if_not_found=False)
+        if cron:
+            cron.sudo()._trigger()
+
+    @api.model
+    def _cron_update_current_term_indexes(self):
+        """
+        Replace the partial indexes built for another term than the current one.
+
+        A partial index predicate must be a constant, so each index is built
+        again with CREATE INDEX CONCURRENTLY under a temporary name, then
+        swapped with the old one. Concurrent builds cannot run in a
+        transaction: they use a separate cursor in autocommit mode. A
+        concurrent build waits for every older open transaction, the one of
+        the cron included: it is committed first, and the current term is
+        read on the autocommit cursor.
+        """
+        # Sin transacción abierta en el cron, o CREATE INDEX CONCURRENTLY no termina
+        self.env.cr.commit()
+        with self.env.registry.cursor() as cr:
+            cr._cnx.autocommit = True
+            try:
+                cr.execute("SELECT id FROM university_term WHERE is_current LIMIT 1")
+                row = cr.fetchone()
+                current_id = row[0] if row else 0
+                for indexname, (tablename, expressions) in CURRENT_TERM_INDEXES.items():
+                    self._swap_current_term_index(cr, indexname, tablename, expressions, current_id)
+            finally:
+                cr._cnx.autocommit = False
+
+    @api.model
+    def _swap_current_term_index(self, cr, indexname, tablename, expressions, current_id):
+        """
+        Build a partial index for the current term, unless it is up to date.
+
+        Args:
+            cr (Cursor): Cursor in autocommit mode
+            indexname (str): Name of the index
+            tablename (str): Indexed table
+            expressions (list): Indexed columns and expressions
+            current_id (int): Current term id, 0 to only drop the index
+        """
+        predicate = f"(term_id = {int(current_id)})"
+        cr.execute("""
+            SELECT pg_get_expr(i.indpred, i.indrelid), i.indisvalid
+              FROM pg_index i
+              JOIN pg_class c ON c.oid = i.indexrelid
+             WHERE c.relname = %s
+        """, [indexname])
+        row = cr.fetchone()
+        if row and row[1] and current_id and row[0] == predicate:
+            return
+        tmpname = f"{indexname}_new"
+        # Restos de una construcción interrumpida, inválidos
+        cr.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{tmpname}"')
+        if current_id and sql.column_exists(cr, tablename, 'term_id'):
+            cr.execute(f"""
+                CREATE INDEX CONCURRENTLY "{tmpname}" ON "{tablename}" ({", ".join(expressions)})
+                 WHERE term_id = {int(current_id)}
+            """)
+        cr.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{indexname}"')
+        if current_id and sql.column_exists(cr, tablename, 'term_id'):
+            cr.execute(f'ALTER INDEX "{tmpname}" RENAME TO "{indexname}"')
+
+    def _assign_terms(self, date_ranges=()):
+        """
+        Link the enrollments and grades dated in these terms to them, and
+        reset the attendance of the enrollments changing term.
+
+        Args:
+            date_ranges (list): Previous (date_start, date_end) of the terms,
+                whose rows may have to move to another term
+        """
+        self.env.flush_all()
+        ranges = [(term.date_start, term.date_end) for term in self] + list(date_ranges)
+        if not ranges:
+            return
+        cr = self.env.cr
+        cr.execute("""
+            WITH target AS (
+                SELECT e.id,
+                       (SELECT t.id FROM university_term t
+                         WHERE e.date BETWEEN t.date_start AND t.date_end
+                         LIMIT 1) AS term_id
+                  FROM university_enrollment e
+                 WHERE e.date BETWEEN %(date_from)s AND %(date_to)s
+                    OR e.term_id = ANY(%(term_ids)s)
+            )
+            UPDATE university_enrollment e
+               SET term_id = target.term_id
+              FROM target
+             WHERE target.id = e.id
+               AND e.term_id IS DISTINCT FROM target.term_id
+         RETURNING e.id
+        """, {
+            'date_from': min(start for start, _end in ranges),
+            'date_to': max(end for _start, end in ranges),
+            'term_ids': self.ids,
+        })
+        enrollment_ids = [row[0] for row in cr.fetchall()]
+        if enrollment_ids:
+            cr.execute("""
+                UPDATE university_grade g
+                   SET term_id = e.term_id
+                  FROM university_enrollment e
+                 WHERE e.id = g.enrollment_id
+                   AND e.id = ANY(%s)
+                   AND g.term_id IS DISTINCT FROM e.term_id
+            """, [enrollment_ids])
+            # Rows were updated in SQL
+            self.env.invalidate_all()
+            self.env['university.attendance']._reset(enrollment_ids)
+
+    def action_set_current(self):
+        """Make this term the current one."""
+        self.ensure_one()
+        self.is_current = True
@@ -7,6 +7,8 @@ staff administration, and student enrollment tracking.
 """
 
 from odoo import models, fields, api
+from odoo.osv import expression
+from odoo.tools import sql
 
 class University(models.Model):
     """
@@ -171,16 +173,27 @@ class University(models.Model):
         store=False
     )
     
+    def init(self):
+        """
+        Create the prefix index of the website autocomplete.
+        """
+        sql.create_index(
+            self.env.cr, 'university_university_name_prefix_idx',
+            self._table, ['lower(name) text_pattern_ops'],
+        )
+
     @api.depends('name')
     def _compute_same_name_university(self):
+        # Una sola búsqueda para todos los nombres, sin distinguir mayúsculas
+        names = {university.name.lower() for university in self if university.name}
+        homonyms = self.with_context(active_test=False).search(
+            expression.OR([[('name', '=ilike', name)] for name in names])
+        ) if names else self.browse()
         for university in self:
-            university.same_name_university_id = self.search([
-                ('name', '=ilike', university.name),
-                ('id', '!=', university.id),
-                '|',
-                ('active', '=', True),
-                ('active', '=', False)
-            ], limit=1)
+            university.same_name_university_id = next((
+                other for other in homonyms
+                if other.name.lower() == (university.name or '').lower() and other.id != university.id
+            ), False)
 
     @api.depends('enrollment_ids')   #dependemos de matriculas, trigger para recalcular matriculas
     def _compute_enrollment_count(self): #funcion para contar matriculas
@@ -190,8 +203,10 @@ class University(models.Model):
         This method computes the total number of course enrollments
         across all departments and programs.
         """
+        counts = dict(self.env['university.enrollment']._read_group(
+            [('university_id', 'in', self._origin.ids)], ['university_id'], ['__count']))
         for record in self:
-            record.enrollment_count = len(record.enrollment_ids)
+            record.enrollment_count = counts.get(record._origin, 0)
 
     @api.depends('student_ids')  #dependemos de estudiantes, trigger para recalcular estudiantes
     def _compute_student_count(self): #funcion para contar estudiantes
@@ -201,8 +216,10 @@ class University(models.Model):
         This method computes the total number of students currently
         enrolled in the university.
         """
+        counts = dict(self.env['university.student']._read_group(
+            [('university_id', 'in', self._origin.ids)], ['university_id'], ['__count']))
         for record in self:
-            record.student_count = len(record.student_ids)
+            record.student_count = counts.get(record._origin, 0)
 
     @api.depends('professor_ids') #dependemos de profesores, trigger para recalcular profesores
     def _compute_professor_count(self): #funcion para contar profesores
@@ -212,8 +229,10 @@ class University(models.Model):
         This method computes the total number of faculty members
         currently employed by the university.
         """
+        counts = dict(self.env['university.professor']._read_group(
+            [('university_id', 'in', self._origin.ids)], ['university_id'], ['__count']))
         for record in self:
-            record.professor_count = len(record.professor_ids)
+            record.professor_count = counts.get(record._origin, 0)
 
     @api.depends('department_ids') #dependemos de departamentos, trigger para recalcular departamentos
     def _compute_department_count(self): #funcion para contar departamentos
@@ -223,8 +242,10 @@ class University(models.Model):
         This method computes the total number of academic departments
         within the university.
         """
+        counts = dict(self.env['university.department']._read_group(
+            [('university_id', 'in', self._origin.ids)], ['university_id'], ['__count']))
         for record in self:
-            record.department_count = len(record.department_ids)
+            record.department_count = counts.get(record._origin, 0)
 
     @api.model
     def _get_lang(self):
@@ -0,0 +1,124 @@
+/** @odoo-module **/
+
+/**
+ * Portal grades live updates.
+ *
+ * Listens to the "universidad.grade/updated" notifications sent on the
+ * student's partner channel when grades are published, and updates the
+ * grades table in place instead of having students reload /my/grades.
+ */
+
+import publicWidget from "@web/legacy/js/public/public_widget";
+
+const PASS_GRADE = 5.0;
+
+publicWidget.registry.UniversityPortalGrades = publicWidget.Widget.extend({
+    selector: ".o_university_portal_grades",
+
+    /**
+     * @override
+     */
+    start() {
+        // Admins see every grade, the live updates only concern students
+        if (this.el.dataset.isAdmin !== "1") {
+            this.busService = this.bindService("bus_service");
+            this._onGradesUpdated = this._onGradesUpdated.bind(this);
+            this.busService.subscribe("universidad.grade/updated", this._onGradesUpdated);
+            this.busService.start();
+        }
+        return this._super(...arguments);
+    },
+
+    /**
+     * @override
+     */
+    destroy() {
+        if (this.busService) {
+            this.busService.unsubscribe("universidad.grade/updated", this._onGradesUpdated);
+        }
+        this._super(...arguments);
+    },
+
+    //--------------------------------------------------------------------------
+    // Private
+    //--------------------------------------------------------------------------
+
+    /**
+     * Whether a grade must be listed with the filters currently applied.
+     *
+     * @param {Object} grade
+     * @returns {boolean}
+     */
+    _matchesFilters(grade) {
+        const universityId = parseInt(this.el.dataset.universityId || "0");
+        const termId = parseInt(this.el.dataset.termId || "0");
+        const gradeFilter = this.el.dataset.gradeFilter || "all";
+        if (universityId && grade.university_id !== universityId) {
+            return false;
+        }
+        if (termId && grade.term_id !== termId) {
+            return false;
+        }
+        if (gradeFilter === "passed") {
+            return grade.grade >= PASS_GRADE;
+        }
+        if (gradeFilter === "failed") {
+            return grade.grade < PASS_GRADE;
+        }
+        return true;
+    },
+
+    /**
+     * Build the table row of a grade, same markup as the QWeb template.
+     *
+     * @param {Object} grade
+     * @returns {HTMLElement}
+     */
+    _renderRow(grade) {
+        const row = document.createElement("tr");
+        row.dataset.gradeId = grade.id;
+        for (const value of [grade.subject, grade.professor, grade.university, grade.date]) {
+            const cell = document.createElement("td");
+            cell.textContent = value;
+            row.appendChild(cell);
+        }
+        const gradeCell = document.createElement("td");
+        gradeCell.className = "text-center";
+        const badge = document.createElement("span");
+        badge.className = `badge rounded-pill fs-6 ${grade.grade >= PASS_GRADE ? "bg-success" : "bg-danger"}`;
+        badge.textContent = grade.grade.toFixed(2);
+        gradeCell.appendChild(badge);
+        row.appendChild(gradeCell);
+        return row;
+    },
+
+    //--------------------------------------------------------------------------
+    // Handlers
+    //--------------------------------------------------------------------------
+
+    /**
+     * @param {Object} payload
+     * @param {Object[]} payload.grades created or modified grades
+     * @param {number[]} payload.removed ids of the deleted grades
+     */
+    _onGradesUpdated({ grades, removed }) {
+        const tbody = this.el.querySelector("tbody");
+        for (const gradeId of removed || []) {
+            tbody.querySelector(`tr[data-grade-id="${gradeId}"]`)?.remove();
+        }
+        for (const grade of grades || []) {
+            const existing = tbody.querySelector(`tr[data-grade-id="${grade.id}"]`);
+            if (!this._matchesFilters(grade)) {
+                existing?.remove();
+            } else if (existing) {
+                existing.replaceWith(this._renderRow(grade));
+            } else {
+                tbody.prepend(this._renderRow(grade));
+            }
+        }
+        this.el.querySelector(".o_university_no_grades")
+            .classList.toggle("d-none", !!tbody.querySelector("tr"));
+    },
+});
+
+export default publicWidget.registry.UniversityPortalGrades;
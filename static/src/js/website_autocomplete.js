@@ -0,0 +1,136 @@
+/** @odoo-module **/
+
+/**
+ * Search box suggestions of the website listings.
+ *
+ * Asks /university/autocomplete for the names starting with the typed text,
+ * at most once per pause in the typing, and shows them under the search box.
+ * Picking a suggestion opens its listing; submitting the form still runs the
+ * full search.
+ */
+
+import publicWidget from "@web/legacy/js/public/public_widget";
+import { debounce } from "@web/core/utils/timing";
+
+const MIN_PREFIX = 2;
+const DEBOUNCE_DELAY = 200;
+
+const TYPE_ICONS = {
+    university: "fa-university",
+    professor: "fa-user",
+    student: "fa-graduation-cap",
+    subject: "fa-book",
+};
+
+publicWidget.registry.UniversityAutocomplete = publicWidget.Widget.extend({
+    selector: ".o_university_autocomplete",
+    events: {
+        "input input[name='search']": "_onInput",
+        "keydown input[name='search']": "_onKeydown",
+        "focusout": "_onFocusout",
+    },
+
+    /**
+     * @override
+     */
+    start() {
+        this.input = this.el.querySelector("input[name='search']");
+        this.input.setAttribute("autocomplete", "off");
+        this.menu = document.createElement("div");
+        this.menu.className = "dropdown-menu w-100 shadow-sm top-100 start-0";
+        this.el.classList.add("position-relative");
+        this.el.appendChild(this.menu);
+        this._fetchSuggestions = debounce(this._fetchSuggestions.bind(this), DEBOUNCE_DELAY);
+        return this._super(...arguments);
+    },
+
+    /**
+     * @override
+     */
+    destroy() {
+        this.controller?.abort();
+        this.menu?.remove();
+        this._super(...arguments);
+    },
+
+    //--------------------------------------------------------------------------
+    // Private
+    //--------------------------------------------------------------------------
+
+    /**
+     * Request the suggestions of the current text, cancelling the previous
+     * request still running.
+     */
+    async _fetchSuggestions() {
+        const term = this.input.value.trim();
+        this.controller?.abort();
+        if (term.length < MIN_PREFIX) {
+            this._render([]);
+            return;
+        }
+        this.controller = new AbortController();
+        const params = new URLSearchParams({ term, types: this.el.dataset.types || "" });
+        try {
+            const response = await fetch(`/university/autocomplete?${params}`, {
+                signal: this.controller.signal,
+            });
+            this._render(await response.json());
+        } catch (error) {
+            if (error.name !== "AbortError") {
+                this._render([]);
+            }
+        }
+    },
+
+    /**
+     * @param {Object[]} suggestions
+     */
+    _render(suggestions) {
+        this.menu.replaceChildren();
+        for (const suggestion of suggestions) {
+            const item = document.createElement("a");
+            item.className = "dropdown-item";
+            item.href = suggestion.url;
+            const icon = document.createElement("i");
+            icon.className = `fa ${TYPE_ICONS[suggestion.type]} me-2 text-muted`;
+            item.append(icon, suggestion.name);
+            this.menu.appendChild(item);
+        }
+        this.menu.classList.toggle("show", suggestions.length > 0);
+    },
+
+    //--------------------------------------------------------------------------
+    // Handlers
+    //--------------------------------------------------------------------------
+
+    _onInput() {
+        this._fetchSuggestions();
+    },
+
+    /**
+     * Arrow down moves to the suggestions, escape closes them.
+     *
+     * @param {KeyboardEvent} ev
+     */
+    _onKeydown(ev) {
+        if (ev.key === "Escape") {
+            this._render([]);
+        } else if (ev.key === "ArrowDown" && this.menu.firstChild) {
+            ev.preventDefault();
+            this.menu.firstChild.focus();
+        }
+    },
+
+    /**
+     * Close the suggestions when the focus leaves the form.
+     *
+     * @param {FocusEvent} ev
+     */
+    _onFocusout(ev) {
+        if (!this.el.contains(ev.relatedTarget)) {
+            this.menu.classList.remove("show");
+        }
+    },
+});
+
+export default publicWidget.registry.UniversityAutocomplete;
@@ -0,0 +1,174 @@
+/** @odoo-module **/
+
+/**
+ * Grade entry grid of a subject.
+ *
+ * Lists the enrollments of a subject with their latest grade, like a
+ * spreadsheet column: professors type the grades of the whole class, moving
+ * down with Enter, and save every edited cell in one RPC. Cells rejected by
+ * the server are highlighted with the reason and nothing is saved.
+ */
+
+import { Component, onWillStart, useState } from "@odoo/owl";
+import { _t } from "@web/core/l10n/translation";
+import { registry } from "@web/core/registry";
+import { useService } from "@web/core/utils/hooks";
+import { formatFloat } from "@web/core/utils/numbers";
+import { standardActionServiceProps } from "@web/webclient/actions/action_service";
+
+const PASS_GRADE = 5.0;
+
+export class UniversityGradeGrid extends Component {
+    static template = "Universidad.GradeGrid";
+    static props = { ...standardActionServiceProps };
+
+    setup() {
+        this.orm = useService("orm");
+        this.notification = useService("notification");
+        this.action = useService("action");
+        this.subjectId = this.props.action.params?.subject_id || this.props.action.context?.active_id;
+        this.state = useState({
+            subject: null,
+            terms: [],
+            termId: 0,
+            rows: [],
+            edits: {},
+            errors: {},
+            saving: false,
+        });
+        onWillStart(() => this.load(null));
+    }
+
+    get dirtyCount() {
+        return Object.keys(this.state.edits).length;
+    }
+
+    /**
+     * @param {number|null} termId null for the default term of the subject
+     */
+    async load(termId) {
+        const grid = await this.orm.call("university.subject", "get_grade_grid", [[this.subjectId]], {
+            term_id: termId,
+        });
+        Object.assign(this.state, {
+            subject: grid.subject,
+            terms: grid.terms,
+            termId: grid.term_id,
+            rows: grid.rows,
+            edits: {},
+            errors: {},
+        });
+    }
+
+    formatGrade(value) {
+        return value === false || value === null ? "" : formatFloat(value, { digits: [3, 2] });
+    }
+
+    cellValue(row) {
+        return row.enrollment_id in this.state.edits
+            ? this.state.edits[row.enrollment_id]
+            : this.formatGrade(row.grade);
+    }
+
+    rowClass(row) {
+        const value = parseFloat(this.cellValue(row));
+        return {
+            "table-warning": row.enrollment_id in this.state.edits,
+            "text-danger": !isNaN(value) && value < PASS_GRADE,
+        };
+    }
+
+    //--------------------------------------------------------------------------
+    // Handlers
+    //--------------------------------------------------------------------------
+
+    onInput(row, ev) {
+        const value = ev.target.value.trim();
+        delete this.state.errors[row.enrollment_id];
+        if (value === this.formatGrade(row.grade)) {
+            delete this.state.edits[row.enrollment_id];
+        } else {
+            this.state.edits[row.enrollment_id] = value;
+        }
+    }
+
+    /**
+     * Enter and arrows move between the cells of the column.
+     *
+     * @param {KeyboardEvent} ev
+     */
+    onKeydown(ev) {
+        const step = { Enter: 1, ArrowDown: 1, ArrowUp: -1 }[ev.key];
+        if (!step) {
+            return;
+        }
+        ev.preventDefault();
+        const inputs = [...ev.target.closest("tbody").querySelectorAll("input")];
+        const next = inputs[inputs.indexOf(ev.target) + step];
+        next?.focus();
+        next?.select();
+    }
+
+    async onTermChange(ev) {
+        if (this.dirtyCount && !window.confirm(_t("Discard the grades not saved?"))) {
+            ev.target.value = this.state.termId;
+            return;
+        }
+        await this.load(parseInt(ev.target.value));
+    }
+
+    async onSave() {
+        const entries = [];
+        const errors = {};
+        for (const row of this.state.rows) {
+            if (!(row.enrollment_id in this.state.edits)) {
+                continue;
+            }
+            const value = parseFloat(this.state.edits[row.enrollment_id].replace(",", "."));
+            if (isNaN(value)) {
+                errors[row.enrollment_id] = _t("Not a number");
+                continue;
+            }
+            entries.push({ enrollment_id: row.enrollment_id, grade_id: row.grade_id, grade: value });
+        }
+        if (Object.keys(errors).length) {
+            this.state.errors = errors;
+            return;
+        }
+        this.state.saving = true;
+        try {
+            const result = await this.orm.call("university.subject", "save_grade_grid", [
+                [this.subjectId],
+                entries,
+            ]);
+            if (result.errors) {
+                this.state.errors = result.errors;
+                this.notification.add(_t("No grade was saved: fix the highlighted cells."), { type: "danger" });
+                return;
+            }
+            this.notification.add(
+                _t("%(created)s grades created, %(updated)s updated.", result),
+                { type: "success" }
+            );
+            await this.load(this.state.termId);
+        } finally {
+            this.state.saving = false;
+        }
+    }
+
+    onDiscard() {
+        this.state.edits = {};
+        this.state.errors = {};
+    }
+
+    openSubject() {
+        return this.action.doAction({
+            type: "ir.actions.act_window",
+            res_model: "university.subject",
+            res_id: this.subjectId,
+            views: [[false, "form"]],
+        });
+    }
+}
+
+registry.category("actions").add("university_grade_grid", UniversityGradeGrid);
@@ -0,0 +1,152 @@
+/** @odoo-module **/
+
+/**
+ * Paged relation pane of the backend forms.
+ *
+ * Replaces the one2many fields of the university, student, subject and
+ * professor forms. The related records are not part of the form data: the
+ * pane reads the visible page and the total count in one RPC when its tab is
+ * shown, and the next pages on demand, so opening a form does not depend on
+ * the size of its relations.
+ *
+ * Usage in a form view:
+ *
+ *     <widget name="university_relation_pane" model="university.enrollment"
+ *             inverse="student_id" columns="subject_id,professor_id,date"/>
+ */
+
+import { Component, onWillStart, onWillUpdateProps, useState } from "@odoo/owl";
+import { deserializeDate, deserializeDateTime, formatDate, formatDateTime } from "@web/core/l10n/dates";
+import { Pager } from "@web/core/pager/pager";
+import { registry } from "@web/core/registry";
+import { formatFloat } from "@web/core/utils/numbers";
+import { useService } from "@web/core/utils/hooks";
+import { standardWidgetProps } from "@web/views/widgets/standard_widget_props";
+
+export class UniversityRelationPane extends Component {
+    static template = "Universidad.RelationPane";
+    static components = { Pager };
+    static props = {
+        ...standardWidgetProps,
+        resModel: String,
+        inverseField: String,
+        columns: { type: Array, element: String },
+        limit: { type: Number, optional: true },
+        order: { type: String, optional: true },
+    };
+    static defaultProps = {
+        limit: 40,
+        order: "",
+    };
+
+    setup() {
+        this.orm = useService("orm");
+        this.action = useService("action");
+        this.fieldService = useService("field");
+        this.state = useState({ records: [], total: 0, offset: 0, loading: true });
+        onWillStart(async () => {
+            this.fields = await this.fieldService.loadFields(this.props.resModel, {
+                fieldNames: this.props.columns,
+                attributes: ["string", "type", "selection", "digits"],
+            });
+            await this.load(this.props.record.resId, 0);
+        });
+        onWillUpdateProps(async (nextProps) => {
+            if (nextProps.record.resId !== this.props.record.resId) {
+                await this.load(nextProps.record.resId, 0);
+            }
+        });
+    }
+
+    get domain() {
+        return [[this.props.inverseField, "=", this.props.record.resId]];
+    }
+
+    /**
+     * Read one page of the related records and their count.
+     *
+     * @param {number|false} resId id of the form record, false while it is new
+     * @param {number} offset
+     */
+    async load(resId, offset) {
+        if (!resId) {
+            Object.assign(this.state, { records: [], total: 0, offset: 0, loading: false });
+            return;
+        }
+        this.state.loading = true;
+        const specification = {};
+        for (const name of this.props.columns) {
+            specification[name] = this.fields[name].type === "many2one" ? { fields: { display_name: {} } } : {};
+        }
+        const { length, records } = await this.orm.webSearchRead(
+            this.props.resModel,
+            [[this.props.inverseField, "=", resId]],
+            { specification, offset, limit: this.props.limit, order: this.props.order }
+        );
+        Object.assign(this.state, { records, total: length, offset, loading: false });
+    }
+
+    format(record, name) {
+        const field = this.fields[name];
+        const value = record[name];
+        switch (field.type) {
+            case "many2one":
+                return value ? value.display_name : "";
+            case "date":
+                return value ? formatDate(deserializeDate(value)) : "";
+            case "datetime":
+                return value ? formatDateTime(deserializeDateTime(value)) : "";
+            case "float":
+            case "monetary":
+                return formatFloat(value, { digits: field.digits });
+            case "selection":
+                return (field.selection.find(([key]) => key === value) || ["", ""])[1];
+            case "boolean":
+                return value ? "✓" : "";
+            default:
+                return value === false ? "" : String(value);
+        }
+    }
+
+    onPagerChange({ offset }) {
+        return this.load(this.props.record.resId, offset);
+    }
+
+    openRecord(record) {
+        return this.action.doAction({
+            type: "ir.actions.act_window",
+            res_model: this.props.resModel,
+            res_id: record.id,
+            views: [[false, "form"]],
+            target: "current",
+        });
+    }
+
+    /**
+     * Open every related record in a list, where they can also be created.
+     */
+    openAll() {
+        return this.action.doAction({
+            type: "ir.actions.act_window",
+            name: this.props.record.data.name,
+            res_model: this.props.resModel,
+            domain: this.domain,
+            context: { [`default_${this.props.inverseField}`]: this.props.record.resId },
+            views: [[false, "list"], [false, "form"]],
+            target: "current",
+        });
+    }
+}
+
+export const universityRelationPane = {
+    component: UniversityRelationPane,
+    extractProps: ({ attrs }) => ({
+        resModel: attrs.model,
+        inverseField: attrs.inverse,
+        columns: attrs.columns.split(",").map((name) => name.trim()),
+        limit: attrs.limit ? parseInt(attrs.limit) : undefined,
+        order: attrs.order,
+    }),
+};
+
+registry.category("view_widgets").add("university_relation_pane", universityRelationPane);
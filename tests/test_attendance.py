@@ -0,0 +1,138 @@
+"""
+Attendance bitmap tests for the University module.
+
+The sessions write the attendance rows in SQL: these tests check the bits and
+the counters after marking, re-marking and deleting sessions, and after an
+enrollment moves to another term.
+
+Run them with ``odoo-bin -d <db> -u Universidad --test-tags /Universidad:attendance``.
+"""
+
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install', 'attendance')
+class TestAttendance(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        university = cls.env['university.university'].create({'name': 'Attendance University'})
+        department = cls.env['university.department'].create({
+            'name': 'Attendance Department',
+            'university_id': university.id,
+        })
+        cls.subject = cls.env['university.subject'].create({
+            'name': 'Attendance Subject',
+            'university_id': university.id,
+            'department_id': department.id,
+        })
+        cls.term = cls.env['university.term'].create({
+            'name': 'Attendance First Term',
+            'date_start': '2025-01-01',
+            'date_end': '2025-06-30',
+        })
+        cls.next_term = cls.env['university.term'].create({
+            'name': 'Attendance Second Term',
+            'date_start': '2025-07-01',
+            'date_end': '2025-12-31',
+        })
+        cls.first, cls.second = [
+            cls.env['university.enrollment'].create({
+                'student_id': cls.env['university.student'].create({
+                    'name': 'Attendance Student %s' % index,
+                    'university_id': university.id,
+                    'email_student': 'attendance.student%s@example.com' % index,
+                }).id,
+                'subject_id': cls.subject.id,
+                'date': '2025-03-01',
+            })
+            for index in (1, 2)
+        ]
+
+    def _sessions(self, count):
+        return self.env['university.session'].create([
+            {'subject_id': self.subject.id, 'term_id': self.term.id, 'date': '2025-03-%02d' % (day + 2)}
+            for day in range(count)
+        ])
+
+    def _row(self, enrollment):
+        """
+        Read the attendance row of an enrollment.
+
+        Returns:
+            tuple: (present bits, marked bits, present count, session count),
+                bit 0 first, or None without a row
+        """
+        self.env.flush_all()
+        self.env.cr.execute("""
+            SELECT present_bits::text, marked_bits::text, present_count, session_count
+              FROM university_attendance
+             WHERE enrollment_id = %s
+        """, [enrollment.id])
+        return self.env.cr.fetchone()
+
+    def test_mark(self):
+        session = self._sessions(1)
+        self.assertEqual(session.position, 0)
+        session._mark_attendance([self.second.id])
+        self.assertEqual(self._row(self.first), ('1', '1', 1, 1))
+        self.assertEqual(self._row(self.second), ('0', '1', 0, 1))
+        self.assertEqual(session.present_count, 1)
+        self.assertEqual(session.absent_enrollment_ids, self.second)
+
+    def test_remark(self):
+        session = self._sessions(1)
+        session._mark_attendance([self.second.id])
+        session._mark_attendance([self.first.id])
+        self.assertEqual(self._row(self.first), ('0', '1', 0, 1))
+        self.assertEqual(self._row(self.second), ('1', '1', 1, 1))
+        session.action_mark_all_present()
+        self.assertEqual(self._row(self.first), ('1', '1', 1, 1))
+        self.assertEqual(self._row(self.second), ('1', '1', 1, 1))
+
+    def test_mark_several_sessions(self):
+        first_session, second_session = self._sessions(2)
+        self.assertEqual(second_session.position, 1)
+        # Sessions marked out of order grow the bitmaps
+        second_session._mark_attendance([self.first.id])
+        self.assertEqual(self._row(self.first), ('00', '01', 0, 1))
+        first_session._mark_attendance()
+        self.assertEqual(self._row(self.first), ('10', '11', 1, 2))
+        self.assertEqual(self._row(self.second), ('11', '11', 2, 2))
+        rates = self.env['university.attendance']._get_rates('subject_id', [('subject_id', '=', self.subject.id)])
+        self.assertEqual(rates, {self.subject: 75.0})
+
+    def test_unlink(self):
+        first_session, second_session, unmarked_session = self._sessions(3)
+        first_session._mark_attendance()
+        second_session._mark_attendance([self.first.id])
+        unmarked_session.unlink()
+        self.assertEqual(self._row(self.first), ('10', '11', 1, 2))
+        first_session.unlink()
+        self.assertEqual(self._row(self.first), ('00', '01', 0, 1))
+        self.assertEqual(self._row(self.second), ('01', '01', 1, 1))
+        second_session.unlink()
+        self.assertEqual(self._row(self.first), ('00', '00', 0, 0))
+        self.assertEqual(self._row(self.second), ('00', '00', 0, 0))
+
+    def test_enrollment_date_change(self):
+        self._sessions(1)._mark_attendance([self.second.id])
+        self.first.date = '2025-05-01'  # Same term, attendance kept
+        self.assertEqual(self._row(self.first), ('1', '1', 1, 1))
+        self.second.date = '2025-09-01'
+        self.assertEqual(self.second.term_id, self.next_term)
+        self.assertEqual(self._row(self.second), ('', '', 0, 0))
+        attendance = self.env['university.attendance'].search([('enrollment_id', '=', self.second.id)])
+        self.assertEqual(attendance.term_id, self.next_term)
+        self.assertEqual(self._row(self.first), ('1', '1', 1, 1))
+
+    def test_term_dates_change(self):
+        self._sessions(1)._mark_attendance([self.second.id])
+        # The enrollments move out of the term in SQL
+        self.term.date_end = '2025-02-28'
+        self.assertFalse(self.first.term_id)
+        self.assertEqual(self._row(self.first), ('', '', 0, 0))
+        self.assertEqual(self._row(self.second), ('', '', 0, 0))
+        attendance = self.env['university.attendance'].search([('enrollment_id', '=', self.first.id)])
+        self.assertFalse(attendance.term_id)
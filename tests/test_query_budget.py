@@ -0,0 +1,219 @@
+"""
+Query-budget regression tests for the University module.
+
+Every hot path is measured on a generated dataset, then the dataset grows and
+the path is measured again: the number of SQL queries must not change, so a
+loop issuing one query per record fails the test, and must stay within the
+budget of the path.
+
+Each path has its own budget. The budgets are generous upper bounds, not
+measured counts yet. Once the suite has been run, set each budget to the
+measured count plus one or two queries, so that a single extra query fails
+the test.
+
+Run them with ``odoo-bin -d <db> -u Universidad --test-tags /Universidad:query_budget``.
+"""
+
+from odoo.tests import HttpCase, TransactionCase, new_test_user, tagged
+
+from ..tools import datagen
+
+# Dataset loaded before the first measure, and data added before the second.
+# Small enough to stay below the prefetch size, read in one batch.
+INITIAL_SIZES = {
+    'universities': 2,
+    'departments': 2,
+    'professors': 2,
+    'subjects': 3,
+    'students': 30,
+    'max_enrollments': 3,
+    'max_grades': 2,
+}
+GROWTH_SIZES = {
+    'universities': 3,
+    'departments': 3,
+    'professors': 3,
+    'subjects': 4,
+    'students': 60,
+    'max_enrollments': 3,
+    'max_grades': 1,
+}
+
+# Computed fields read on every record of the model, one by one, and the
+# budget of each read: the search, the fetch of the dependencies and the
+# queries of the compute method. Upper bounds until measured, see above.
+COMPUTES = [
+    ('university.university', 'same_name_university_id', 10),
+    ('university.university', 'enrollment_count', 10),
+    ('university.university', 'student_count', 10),
+    ('university.university', 'professor_count', 10),
+    ('university.university', 'department_count', 10),
+    ('university.department', 'professor_count', 4),
+    ('university.professor', 'enrollment_count', 6),
+    ('university.professor', 'is_department_head', 6),
+    ('university.subject', 'lineage_id', 10),
+    ('university.subject', 'enrollment_count', 10),
+    ('university.subject', 'all_prerequisite_ids', 10),
+    ('university.subject', 'recompute_pending', 10),
+    ('university.student', 'enrollment_count', 10),
+    ('university.student', 'grade_count', 10),
+    ('university.student', 'degree_audit_id', 10),
+    ('university.student', 'recompute_pending', 10),
+    ('university.enrollment', 'university_id', 8),
+    ('university.enrollment', 'professor_id', 8),
+    ('university.enrollment', 'term_id', 8),
+    ('university.grade', 'display_name', 4),
+    ('university.term', 'academic_year', 3),
+]
+
+# Creation of one enrollment, pending recomputes included
+ENROLLMENT_CREATE_BUDGET = 40
+
+# Pages rendered with warm caches: request dispatch and website layout, plus
+# the validator, card and dropdown queries of each route
+ROUTE_BUDGETS = {
+    '/students?term_id=0': 120,
+    '/professors': 120,
+    '/universities': 120,
+}
+PORTAL_GRADES_BUDGETS = {
+    'student': 120,
+    'admin': 120,
+}
+
+
+class QueryBudgetCase:
+    """
+    Helpers shared by the model and the route tests.
+    """
+
+    @classmethod
+    def _generate(cls, env):
+        datagen.generate(env, seed=1, **INITIAL_SIZES)
+
+    def _grow(self):
+        datagen.generate(self.env, seed=2, **GROWTH_SIZES)
+
+    def _count_queries(self, func, flush=False):
+        """
+        Count the queries of a function, run with an empty cache.
+
+        Args:
+            func (callable): Measured operation
+            flush (bool): Count the writes left pending by the operation too
+
+        Returns:
+            int: Number of SQL queries
+        """
+        self.env.flush_all()
+        self.env.invalidate_all()
+        start = self.cr.sql_log_count
+        func()
+        if flush:
+            self.env.flush_all()
+        return self.cr.sql_log_count - start
+
+    def assertQueriesConstant(self, func, budget, flush=False):
+        """
+        Check that a function issues the same number of queries, within the
+        budget, before and after the dataset grows.
+
+        The function runs once before each measure to warm the caches.
+        """
+        func()
+        before = self._count_queries(func, flush)
+        self._grow()
+        func()
+        after = self._count_queries(func, flush)
+        self.assertEqual(before, after, "Queries grow with the data: %s -> %s" % (before, after))
+        self.assertLessEqual(after, budget, "%s queries, budget %s" % (after, budget))
+
+
+@tagged('post_install', '-at_install', 'query_budget')
+class TestModelQueryBudget(QueryBudgetCase, TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls._generate(cls.env)
+
+    def _read_computes(self, model, fnames):
+        """
+        Read computed fields on every record, recomputing the stored ones.
+        """
+        records = self.env[model].sudo().search([])
+        for fname in fnames:
+            field = records._fields[fname]
+            if field.store:
+                self.env.add_to_compute(field, records)
+            records.mapped(fname)
+
+    def test_computes(self):
+        for model, fname, budget in COMPUTES:
+            # Each compute grows its own copy of the dataset
+            with self.subTest(model=model, field=fname), self.env.cr.savepoint() as savepoint:
+                self.assertQueriesConstant(lambda: self._read_computes(model, [fname]), budget)
+                savepoint.rollback()
+
+    def _free_pairs(self):
+        """
+        Get (student, subject) pairs of the same university not enrolled yet.
+        """
+        self.env.flush_all()
+        self.cr.execute("""
+            SELECT st.id, sub.id
+              FROM university_student st
+              JOIN university_subject sub ON sub.university_id = st.university_id
+             WHERE NOT EXISTS (
+                    SELECT 1 FROM university_enrollment e
+                     WHERE e.student_id = st.id AND e.subject_id = sub.id)
+               AND NOT EXISTS (
+                    SELECT 1 FROM university_subject_prerequisite p WHERE p.subject_id = sub.id)
+          ORDER BY st.id DESC, sub.id
+        """)
+        return iter(self.cr.fetchall())
+
+    def test_enrollment_create(self):
+        def create():
+            student_id, subject_id = next(self._free_pairs())
+            self.env['university.enrollment'].create({'student_id': student_id, 'subject_id': subject_id})
+        self.assertQueriesConstant(create, ENROLLMENT_CREATE_BUDGET, flush=True)
+
+
+@tagged('post_install', '-at_install', 'query_budget')
+class TestRouteQueryBudget(QueryBudgetCase, HttpCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls._generate(cls.env)
+        # Portal user of the generated student with the most grades
+        cls.env.flush_all()
+        cls.env.cr.execute("""
+            SELECT student_id FROM university_grade
+          GROUP BY student_id ORDER BY COUNT(*) DESC, student_id LIMIT 1
+        """)
+        cls.student = cls.env['university.student'].browse(cls.env.cr.fetchone()[0])
+        user = new_test_user(cls.env, login='budget_student',
+                             groups='base.group_portal,Universidad.group_university_student')
+        cls.student.write({'user_id': user.id, 'partner_id': user.partner_id.id})
+
+    def _page(self, path):
+        def request():
+            response = self.url_open(path)
+            self.assertEqual(response.status_code, 200, path)
+        return request
+
+    def test_website_listings(self):
+        self.authenticate(None, None)
+        for path, budget in ROUTE_BUDGETS.items():
+            with self.subTest(path=path):
+                self.assertQueriesConstant(self._page(path), budget)
+
+    def test_portal_grades_student(self):
+        self.authenticate('budget_student', 'budget_student')
+        self.assertQueriesConstant(self._page('/my/grades?term_id=0'), PORTAL_GRADES_BUDGETS['student'])
+
+    def test_portal_grades_admin(self):
+        self.authenticate('admin', 'admin')
+        self.assertQueriesConstant(self._page('/my/grades?term_id=0'), PORTAL_GRADES_BUDGETS['admin'])
@@ -0,0 +1,4 @@
+"""
+Development tools of the University module: benchmark data generator and
+benchmark suite. Not loaded with the module, imported from an Odoo shell.
+"""
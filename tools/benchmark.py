@@ -0,0 +1,341 @@
+"""
+Benchmark suite for the University module.
+
+Times the hot paths of the module on the current database, usually filled by
+datagen.generate(): enrollment creation, the counters, the grade report, the
+website and portal pages and the student PDF. Every benchmark is run several
+times; the timings and the number of queries are written to a JSON file so
+the results of two versions can be compared with compare().
+
+Pages are requested in-process through the WSGI application, so no server
+has to be running, but the data must be committed.
+
+Usage, from an Odoo shell (``odoo-bin shell -d <db>``)::
+
+    from odoo.addons.Universidad.tools import benchmark
+    benchmark.run(env, output='/tmp/university-bench.json')
+    benchmark.compare('/tmp/university-bench-old.json', '/tmp/university-bench.json')
+"""
+
+import json
+import logging
+import statistics
+import threading
+import time
+from datetime import date, datetime
+
+from odoo import http, release
+from odoo.modules.module import get_manifest
+
+from .datagen import PREFIX
+
+_logger = logging.getLogger(__name__)
+
+# Password of the student user created for the portal benchmarks
+BENCH_PASSWORD = 'bench-password'
+
+# Enrollments created by the enrollment benchmark, per run
+ENROLLMENT_BATCH = 20
+
+BENCHMARKS = []
+
+def benchmark(name):
+    """
+    Register a benchmark.
+
+    The decorated function receives the environment and the context built
+    by _prepare(), and runs the measured operation once.
+    """
+    def decorator(func):
+        BENCHMARKS.append((name, func))
+        return func
+    return decorator
+
+
+class _Rollback(Exception):
+    """Raised to undo the writes of a benchmark run."""
+
+
+def _rolled_back(env, func):
+    """
+    Run a function in a savepoint rolled back afterwards.
+    """
+    try:
+        with env.cr.savepoint():
+            func()
+            env.flush_all()
+            raise _Rollback()
+    except _Rollback:
+        env.invalidate_all()
+
+
+def _request(client, path):
+    """
+    Request a page and check the response.
+
+    Raises:
+        AssertionError: If the page is not served
+    """
+    response = client.get(path)
+    assert response.status_code == 200, "%s returned %s" % (path, response.status_code)
+    return response
+
+
+def _client(env, login=None, password=None):
+    """
+    Get a WSGI test client, logged in if a login is given.
+    """
+    from werkzeug.test import Client
+    client = Client(http.root, use_cookies=True)
+    if login:
+        response = client.post('/web/session/authenticate', json={
+            'jsonrpc': '2.0', 'method': 'call',
+            'params': {'db': env.cr.dbname, 'login': login, 'password': password},
+        })
+        assert 'error' not in response.json, response.json.get('error')
+    return client
+
+
+def _prepare(env):
+    """
+    Pick the records used by the benchmarks and create the portal user.
+
+    The generated student with the most grades gets a user with
+    BENCH_PASSWORD; the change is committed so the in-process requests can
+    log in.
+
+    Returns:
+        dict: Benchmark context
+    """
+    env.cr.execute("""
+        SELECT g.student_id
+          FROM university_grade g
+          JOIN university_student st ON st.id = g.student_id
+         WHERE st.name LIKE %s
+      GROUP BY g.student_id
+      ORDER BY COUNT(*) DESC, g.student_id
+         LIMIT 1
+    """, [PREFIX + ' %'])
+    row = env.cr.fetchone()
+    if not row:
+        raise ValueError("No grades in the database: run datagen.generate() first")
+    student = env['university.student'].browse(row[0])
+    if not student.user_id:
+        user = env['res.users'].with_context(no_reset_password=True).create({
+            'name': student.name,
+            'login': student.email_student,
+            'password': BENCH_PASSWORD,
+            'groups_id': [
+                (4, env.ref('base.group_portal').id),
+                (4, env.ref('Universidad.group_university_student').id),
+            ],
+        })
+        student.write({'user_id': user.id, 'partner_id': user.partner_id.id})
+    else:
+        student.user_id.password = BENCH_PASSWORD
+    env.cr.commit()
+
+    # Pairs of the same university not enrolled this year
+    today = date.today()
+    env.cr.execute("""
+        SELECT st.id, sub.id
+          FROM university_student st
+          JOIN university_subject sub ON sub.university_id = st.university_id
+         WHERE NOT EXISTS (
+                SELECT 1 FROM university_enrollment e
+                 WHERE e.student_id = st.id AND e.subject_id = sub.id
+                   AND e.date BETWEEN %s AND %s)
+           AND NOT EXISTS (
+                SELECT 1 FROM university_subject_prerequisite p WHERE p.subject_id = sub.id)
+      ORDER BY st.id, sub.id
+         LIMIT %s
+    """, [today.replace(month=1, day=1), today.replace(month=12, day=31), ENROLLMENT_BATCH])
+    return {
+        'student': student,
+        'pairs': env.cr.fetchall(),
+        'anonymous': _client(env),
+        'portal': _client(env, student.user_id.login, BENCH_PASSWORD),
+    }
+
+
+@benchmark('enrollment_create')
+def _bench_enrollment_create(env, context):
+    def create():
+        Enrollment = env['university.enrollment']
+        for student_id, subject_id in context['pairs']:
+            Enrollment.create({'student_id': student_id, 'subject_id': subject_id})
+    _rolled_back(env, create)
+
+
+@benchmark('counters')
+def _bench_counters(env, context):
+    universities = env['university.university'].search([])
+    universities.mapped('enrollment_count')
+    universities.mapped('student_count')
+    universities.mapped('professor_count')
+    universities.mapped('department_count')
+    env['university.professor'].search([]).mapped('enrollment_count')
+    env['university.student'].search([], limit=500).mapped('enrollment_count')
+
+
+@benchmark('report_grade_by_university')
+def _bench_report_by_university(env, context):
+    env['report.university.grade']._read_group(
+        [], ['university_id'], ['count_grades:sum', 'adjusted_grade:avg'])
+
+
+@benchmark('report_grade_by_professor_term')
+def _bench_report_by_professor_term(env, context):
+    env['report.university.grade']._read_group(
+        [], ['professor_id', 'term_id'], ['count_grades:sum', 'adjusted_grade:avg'])
+
+
+@benchmark('report_grade_by_subject')
+def _bench_report_by_subject(env, context):
+    env['report.university.grade']._read_group(
+        [], ['subject_id'], ['count_grades:sum', 'adjusted_grade:avg'])
+
+
+@benchmark('page_students')
+def _bench_page_students(env, context):
+    _request(context['anonymous'], '/students')
+
+
+@benchmark('page_professors')
+def _bench_page_professors(env, context):
+    _request(context['anonymous'], '/professors')
+
+
+@benchmark('page_my_grades')
+def _bench_page_my_grades(env, context):
+    _request(context['portal'], '/my/grades?term_id=0')
+
+
+@benchmark('student_report_html')
+def _bench_student_report_html(env, context):
+    env['ir.actions.report']._render_qweb_html('Universidad.report_student', context['student'].ids)
+
+
+@benchmark('student_report_pdf')
+def _bench_student_report_pdf(env, context):
+    env['ir.actions.report']._render_qweb_pdf('Universidad.report_student', context['student'].ids)
+
+
+def _measure(env, func, context, repeat):
+    """
+    Run a benchmark once to warm the caches, then `repeat` times.
+
+    Returns:
+        dict: Timings in seconds and number of queries of the measured runs
+    """
+    thread = threading.current_thread()
+    func(env, context)
+    timings, queries = [], []
+    for _run in range(repeat):
+        env.invalidate_all()
+        thread.query_count = thread.query_time = 0
+        start = time.perf_counter()
+        func(env, context)
+        timings.append(time.perf_counter() - start)
+        queries.append(thread.query_count)
+    return {
+        'runs': timings,
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'max': max(timings),
+        'queries': max(queries),
+    }
+
+
+def _dataset(env):
+    """
+    Count the rows of the main tables.
+
+    Returns:
+        dict: Number of records per model
+    """
+    return {
+        model: env[model].sudo().with_context(active_test=False).search_count([])
+        for model in ('university.university', 'university.department', 'university.professor',
+                      'university.subject', 'university.student', 'university.enrollment',
+                      'university.grade')
+    }
+
+
+def run(env, output=None, repeat=5, only=None):
+    """
+    Run the benchmarks and write the results.
+
+    A benchmark that cannot run (e.g. wkhtmltopdf missing for the PDF) is
+    recorded as skipped with the reason.
+
+    Args:
+        env (Environment): Odoo environment, with an administrator user
+        output (str): Path of the JSON results, None to only return them
+        repeat (int): Measured runs per benchmark
+        only (list): Names of the benchmarks to run, None for all
+
+    Returns:
+        dict: Results
+    """
+    context = _prepare(env)
+    results = {}
+    for name, func in BENCHMARKS:
+        if only and name not in only:
+            continue
+        try:
+            results[name] = _measure(env, func, context, repeat)
+        except Exception as e:
+            env.cr.rollback()
+            _logger.warning("Benchmark %s skipped: %s", name, e)
+            results[name] = {'skipped': str(e)}
+            continue
+        _logger.info("Benchmark %s: median %.3fs, %s queries",
+                     name, results[name]['median'], results[name]['queries'])
+    report = {
+        'module_version': get_manifest('Universidad').get('version'),
+        'odoo_version': release.version,
+        'database': env.cr.dbname,
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'repeat': repeat,
+        'dataset': _dataset(env),
+        'results': results,
+    }
+    if output:
+        with open(output, 'w') as file:
+            json.dump(report, file, indent=2, sort_keys=True)
+    return report
+
+
+def compare(old_path, new_path, threshold=0.2):
+    """
+    Compare two benchmark results and list the regressions.
+
+    A benchmark regresses when its median time grows by more than the
+    threshold, or when it runs more queries.
+
+    Args:
+        old_path (str): Results of the reference version
+        new_path (str): Results of the version to check
+        threshold (float): Accepted relative slowdown
+
+    Returns:
+        list: (name, old median, new median, old queries, new queries) of the regressions
+    """
+    with open(old_path) as file:
+        old = json.load(file)['results']
+    with open(new_path) as file:
+        new = json.load(file)['results']
+    regressions = []
+    for name, result in sorted(new.items()):
+        reference = old.get(name)
+        if not reference or 'skipped' in reference or 'skipped' in result:
+            continue
+        if (result['median'] > reference['median'] * (1 + threshold)
+                or result['queries'] > reference['queries']):
+            regressions.append((name, reference['median'], result['median'],
+                                reference['queries'], result['queries']))
+            _logger.warning("Regression in %s: %.3fs -> %.3fs, %s -> %s queries",
+                            name, reference['median'], result['median'],
+                            reference['queries'], result['queries'])
+    return regressions
@@ -0,0 +1,273 @@
+"""
+Synthetic data generator for the University module.
+
+Fills a database with universities, departments, professors, subjects,
+students, enrollments and grades in a few set-based statements, so that
+hundreds of thousands of rows are created in seconds. Sizes are skewed like
+real data: some universities are much bigger than others, some subjects are
+much more popular and some students take many more subjects.
+
+The data is reproducible: the same seed and sizes give the same rows on an
+empty database.
+
+Usage, from an Odoo shell (``odoo-bin shell -d <db>``)::
+
+    from odoo.addons.Universidad.tools import datagen
+    datagen.generate(env, students=20000, seed=42)
+    env.cr.commit()
+"""
+
+import logging
+import time
+from datetime import date
+
+_logger = logging.getLogger(__name__)
+
+# Prefix of the generated names, used to tell benchmark data apart
+PREFIX = 'Bench'
+
+# Default sizes: totals for universities and students, per parent otherwise
+DEFAULT_SIZES = {
+    'universities': 3,
+    'departments': 5,       # per university
+    'professors': 6,        # per department
+    'subjects': 8,          # per department
+    'students': 5000,       # in total, spread unevenly over the universities
+    'max_enrollments': 10,  # per student and term
+    'max_grades': 3,        # per enrollment
+}
+
+def _execute(env, query, params=None):
+    """
+    Run a statement and log its duration and row count.
+
+    Returns:
+        list: Fetched rows if the statement returns rows, else []
+    """
+    start = time.perf_counter()
+    env.cr.execute(query, params or {})
+    rows = env.cr.fetchall() if env.cr.description else []
+    _logger.info("datagen: %s rows in %.2fs", env.cr.rowcount, time.perf_counter() - start)
+    return rows
+
+def _ensure_terms(env, year):
+    """
+    Get a previous and a current term for the academic year, creating them
+    when missing.
+
+    Returns:
+        list: (term, enrollment date) pairs, oldest first
+    """
+    Term = env['university.term'].sudo()
+    dates = [date(year, 10, 1), date(year + 1, 3, 1)]
+    bounds = [(date(year, 9, 1), date(year + 1, 1, 31)), (date(year + 1, 2, 1), date(year + 1, 6, 30))]
+    terms = []
+    for index, (enrollment_date, (start, end)) in enumerate(zip(dates, bounds), start=1):
+        term = Term._find_term(enrollment_date) or Term.create({
+            'name': '%s %s/%s - %s' % (PREFIX, year, year + 1, index),
+            'date_start': start,
+            'date_end': end,
+        })
+        terms.append((term, enrollment_date))
+    if not Term._get_current():
+        terms[-1][0].action_set_current()
+    return terms
+
+def generate(env, seed=42, year=None, **sizes):
+    """
+    Generate a benchmark dataset.
+
+    Args:
+        env (Environment): Odoo environment, usually the shell one
+        seed (int): Seed of the PostgreSQL random generator
+        year (int): Academic year of the subjects and terms, current by default
+        **sizes: Overrides of DEFAULT_SIZES
+
+    Returns:
+        dict: Number of rows created per model
+    """
+    sizes = {**DEFAULT_SIZES, **sizes}
+    year = year or date.today().year
+    cr = env.cr
+    env.flush_all()
+    # Same seed, same rows: no parallel scans reordering the random() calls
+    cr.execute("SET LOCAL max_parallel_workers_per_gather = 0")
+    cr.execute("SELECT setseed(%s)", [(seed % 1000) / 1000.0])
+    params = {**sizes, 'prefix': PREFIX, 'year': year, 'uid': env.uid}
+    counts = {}
+
+    university_ids = [row[0] for row in _execute(env, """
+        INSERT INTO university_university (name, lang, create_uid, create_date, write_uid, write_date)
+        SELECT %(prefix)s || ' University ' || i, 'es_ES',
+               %(uid)s, NOW() AT TIME ZONE 'UTC', %(uid)s, NOW() AT TIME ZONE 'UTC'
+          FROM generate_series(1, %(universities)s) i
+      ORDER BY i
+     RETURNING id
+    """, params)]
+    params['university_ids'] = university_ids
+    counts['university.university'] = len(university_ids)
+
+    department_ids = [row[0] for row in _execute(env, """
+        INSERT INTO university_department (name, university_id, create_uid, create_date, write_uid, write_date)
+        SELECT %(prefix)s || ' Department ' || u.id || '-' || i, u.id,
+               %(uid)s, NOW() AT TIME ZONE 'UTC', %(uid)s, NOW() AT TIME ZONE 'UTC'
+          FROM unnest(%(university_ids)s::int[]) u(id)
+         CROSS JOIN generate_series(1, %(departments)s) i
+      ORDER BY u.id, i
+     RETURNING id
+    """, params)]
+    params['department_ids'] = department_ids
+    counts['university.department'] = len(department_ids)
+
+    professor_ids = [row[0] for row in _execute(env, """
+        INSERT INTO university_professor
+            (name, university_id, department_id, professor_email,
+             create_uid, create_date, write_uid, write_date)
+        SELECT %(prefix)s || ' Professor ' || d.id || '-' || i, d.university_id, d.id,
+               'bench.professor.' || d.id || '.' || i || '@example.com',
+               %(uid)s, NOW() AT TIME ZONE 'UTC', %(uid)s, NOW() AT TIME ZONE 'UTC'
+          FROM university_department d
+         CROSS JOIN generate_series(1, %(professors)s) i
+         WHERE d.id = ANY(%(department_ids)s)
+      ORDER BY d.id, i
+     RETURNING id
+    """, params)]
+    counts['university.professor'] = len(professor_ids)
+
+    # Popularity of a subject: a few are taken by most students
+    subject_ids = [row[0] for row in _execute(env, """
+        INSERT INTO university_subject
+            (name, university_id, department_id, credits, academic_year,
+             create_uid, create_date, write_uid, write_date)
+        SELECT %(prefix)s || ' Subject ' || d.id || '-' || i, d.university_id, d.id,
+               (ARRAY[3, 4.5, 6, 6, 6, 9])[1 + floor(random() * 6)::int], %(year)s,
+               %(uid)s, NOW() AT TIME ZONE 'UTC', %(uid)s, NOW() AT TIME ZONE 'UTC'
+          FROM university_department d
+         CROSS JOIN generate_series(1, %(subjects)s) i
+         WHERE d.id = ANY(%(department_ids)s)
+      ORDER BY d.id, i
+     RETURNING id
+    """, params)]
+    params['subject_ids'] = subject_ids
+    counts['university.subject'] = len(subject_ids)
+    cr.execute("UPDATE university_subject SET lineage_id = id WHERE id = ANY(%(subject_ids)s)", params)
+
+    # One or two professors of the department per subject
+    professors = env['university.subject']._fields['professor_ids']
+    _execute(env, f"""
+        INSERT INTO "{professors.relation}" ("{professors.column1}", "{professors.column2}")
+        SELECT s.id, p.id
+          FROM university_subject s
+          JOIN LATERAL (
+                SELECT p.id
+                  FROM university_professor p
+                 WHERE p.department_id = s.department_id
+              ORDER BY (p.id + s.id) %% %(professors)s, p.id
+                 LIMIT 1 + (s.id %% 2)
+          ) p ON TRUE
+         WHERE s.id = ANY(%(subject_ids)s)
+        ON CONFLICT DO NOTHING
+    """, params)
+
+    # University sizes follow a power law: the first one is the biggest
+    student_ids = [row[0] for row in _execute(env, """
+        WITH weights AS (
+            SELECT u.id, 1.0 / u.n AS weight
+              FROM unnest(%(university_ids)s::int[]) WITH ORDINALITY u(id, n)
+        ),
+        shares AS (
+            SELECT id, GREATEST(1, round(%(students)s * weight / SUM(weight) OVER ())::int) AS total
+              FROM weights
+        )
+        INSERT INTO university_student
+            (name, university_id, email_student, tutor_id, active,
+             create_uid, create_date, write_uid, write_date)
+        SELECT %(prefix)s || ' Student ' || sh.id || '-' || i, sh.id,
+               'bench.student.' || sh.id || '.' || i || '@example.com',
+               (SELECT p.id FROM university_professor p
+                 WHERE p.university_id = sh.id
+              ORDER BY p.id OFFSET i %% GREATEST(1, %(departments)s * %(professors)s) LIMIT 1),
+               TRUE,
+               %(uid)s, NOW() AT TIME ZONE 'UTC', %(uid)s, NOW() AT TIME ZONE 'UTC'
+          FROM shares sh
+         CROSS JOIN LATERAL generate_series(1, sh.total) i
+      ORDER BY sh.id, i
+     RETURNING id
+    """, params)]
+    params['student_ids'] = student_ids
+    counts['university.student'] = len(student_ids)
+
+    # Weighted sampling without replacement (key = random ^ (1 / weight)):
+    # popular subjects are picked first, the number of subjects is skewed
+    cr.execute("DROP TABLE IF EXISTS bench_subject_weight")
+    cr.execute("""
+        CREATE TEMP TABLE bench_subject_weight ON COMMIT DROP AS
+        SELECT id, university_id, 0.05 + power(random(), 3) AS weight
+          FROM university_subject
+         WHERE id = ANY(%(subject_ids)s)
+      ORDER BY id
+    """, params)
+    Enrollment = env['university.enrollment']
+    enrollment_ids = []
+    for term_index, (term, enrollment_date) in enumerate(_ensure_terms(env, year)):
+        enrollment_ids += Enrollment._insert_enrollment_pairs("""
+            SELECT picked.student_id, picked.subject_id
+              FROM (
+                SELECT st.id AS student_id, w.id AS subject_id,
+                       ROW_NUMBER() OVER (PARTITION BY st.id
+                                          ORDER BY power(random(), 1.0 / w.weight) DESC, w.id) AS rn,
+                       1 + floor(%(max_enrollments)s * power(random(), 2))::int AS wanted
+                  FROM university_student st
+                  JOIN bench_subject_weight w ON w.university_id = st.university_id
+                 WHERE st.id = ANY(%(student_ids)s)
+                   AND w.id %% 2 = %(term_index)s
+              ) picked
+             WHERE picked.rn <= picked.wanted
+        """, {**params, 'term_index': term_index}, enrollment_date, check_prerequisites=False)
+    counts['university.enrollment'] = len(enrollment_ids)
+    params['enrollment_ids'] = enrollment_ids
+
+    # Grade = subject difficulty + student ability + noise, bounded to 0-10
+    _execute(env, """
+        WITH ability AS (
+            SELECT id, (random() + random() + random()) * 2 - 3 AS value
+              FROM university_student
+             WHERE id = ANY(%(student_ids)s)
+          ORDER BY id
+        ),
+        difficulty AS (
+            SELECT id, 4 + random() * 3 AS value
+              FROM university_subject
+             WHERE id = ANY(%(subject_ids)s)
+          ORDER BY id
+        )
+        INSERT INTO university_grade
+            (student_id, enrollment_id, university_id, subject_id, term_id, grade, date,
+             display_name, create_uid, create_date, write_uid, write_date)
+        SELECT e.student_id, e.id, e.university_id, e.subject_id, e.term_id, g.grade,
+               e.date + (7 * i),
+               sub.name || ' / ' || g.grade,
+               %(uid)s, NOW() AT TIME ZONE 'UTC', %(uid)s, NOW() AT TIME ZONE 'UTC'
+          FROM university_enrollment e
+          JOIN university_subject sub ON sub.id = e.subject_id
+          JOIN ability a ON a.id = e.student_id
+          JOIN difficulty d ON d.id = e.subject_id
+         CROSS JOIN LATERAL generate_series(1, 1 + floor(random() * %(max_grades)s)::int) i
+         CROSS JOIN LATERAL (
+                SELECT round(LEAST(10, GREATEST(0, d.value + a.value + (random() - 0.5) * 3))::numeric, 1)::float
+                       AS grade
+         ) g
+         WHERE e.id = ANY(%(enrollment_ids)s)
+      ORDER BY e.id, i
+    """, params)
+    counts['university.grade'] = env.cr.rowcount
+
+    # Derived tables, normally kept up to date by the grade hook
+    env.invalidate_all()
+    subjects = env['university.subject'].browse(subject_ids)
+    env['university.grade.policy'].sudo()._apply(subjects)
+    env['university.grade.ranking'].sudo()._refresh(
+        subjects, subjects.department_id, subjects.university_id)
+    env['university.degree.audit'].sudo()._refresh(students=env['university.student'].browse(student_ids))
+    _logger.info("datagen: generated %s", counts)
+    return counts
@@ -1,2 +1,3 @@
 from . import mail_compose_message
-from . import professor_welcome_wizard
\ No newline at end of file
+from . import professor_welcome_wizard
+from . import cohort_enrollment_wizard
@@ -0,0 +1,82 @@
+from odoo import models, fields, _
+from odoo.exceptions import UserError
+
+class CohortEnrollmentWizard(models.TransientModel):
+    _name = 'cohort.enrollment.wizard'
+    _description = 'Bulk Cohort Enrollment Wizard'
+
+    university_id = fields.Many2one(
+        'university.university',
+        string='University',
+        required=True
+    )
+    tutor_id = fields.Many2one(
+        'university.professor',
+        string='Tutor',
+        domain="[('university_id', '=', university_id)]",
+        help="Only enroll the students of this tutor"
+    )
+    student_ids = fields.Many2many(
+        'university.student',
+        string='Students',
+        domain="[('university_id', '=', university_id)]",
+        help="Students to enroll. Leave empty to enroll every student of the university (and tutor)"
+    )
+    subject_ids = fields.Many2many(
+        'university.subject',
+        string='Subjects',
+        domain="[('university_id', '=', university_id)]",
+        required=True
+    )
+    date = fields.Date(
+        string='Enrollment Date',
+        default=fields.Date.context_today,
+        required=True
+    )
+    check_prerequisites = fields.Boolean(
+        string='Check Prerequisites',
+        default=True,
+        help="Skip the students who have not passed every prerequisite of a subject"
+    )
+
+    def _get_students(self):
+        """Students of the cohort: the selected ones or the university (and tutor) filter"""
+        self.ensure_one()
+        if self.student_ids:
+            return self.student_ids
+        domain = [('university_id', '=', self.university_id.id)]
+        if self.tutor_id:
+            domain.append(('tutor_id', '=', self.tutor_id.id))
+        return self.env['university.student'].search(domain)
+
+    def action_enroll(self):
+        self.ensure_one()
+        students = self._get_students()
+        if not students:
+            raise UserError(_('No student matches the selected cohort.'))
+
+        # Producto cartesiano estudiantes x asignaturas, insertado en una sola sentencia
+        enrollment_ids = self.env['university.enrollment']._insert_enrollment_pairs("""
+            SELECT st.id AS student_id, sub.id AS subject_id
+              FROM unnest(%(student_ids)s) AS st(id)
+             CROSS JOIN unnest(%(subject_ids)s) AS sub(id)
+        """, {
+            'student_ids': students.ids,
+            'subject_ids': self.subject_ids.ids,
+        }, self.date, check_prerequisites=self.check_prerequisites)
+
+        requested = len(students) * len(self.subject_ids)
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Cohort Enrolled'),
+                'message': _(
+                    '%(created)s enrollments created, %(skipped)s skipped (already enrolled this year, from another university or missing prerequisites).',
+                    created=len(enrollment_ids), skipped=requested - len(enrollment_ids),
+                ),
+                'type': 'success',
+                'sticky': False,
+                'next': {'type': 'ir.actions.act_window_close'},
+            }
+        }